@@ -0,0 +1,174 @@
+"""
+Benchmark full site builds on a synthetic corpus.
+
+Generates a corpus with benchmarks/corpus.py and measures:
+
+- a clean build through src/main.py's main(), serially and with --jobs,
+  without the render cache so every page is rendered in every run
+- a rebuild of the unchanged site, where every page is skipped
+- markdown_to_html_node(...).to_html() alone over every page
+
+Each measurement runs in its own process so that peak RSS belongs to that
+measurement only. Results are reported as pages/sec, MB/sec of markdown and
+peak memory, and with --output they are written as JSON together with the
+git revision and corpus options, so runs can be compared across commits.
+
+Usage:
+    python3 benchmarks/bench_build.py [--pages N] [--jobs N] [--output FILE] [corpus options]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import corpus
+
+ROOT = corpus.ROOT
+SRC = os.path.join(ROOT, "src")
+
+def peak_rss_mib():
+    """Peak RSS of this process and any worker processes it waited for."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+def measure_build(site, jobs):
+    """Run main() once in site, without the render cache, and time it."""
+    sys.path.insert(0, SRC)
+    import main
+
+    os.chdir(site)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.main(["/", "--jobs", str(jobs), "--no-cache"])
+    return {"seconds": time.perf_counter() - start, "peak_rss_mib": peak_rss_mib()}
+
+def measure_parse(site, repeat):
+    """Time markdown_to_html_node(...).to_html() over every page of the corpus."""
+    sys.path.insert(0, SRC)
+    from markdown_to_html_node import markdown_to_html_node
+
+    documents = []
+    for dirpath, _, filenames in os.walk(os.path.join(site, "content")):
+        for filename in sorted(filenames):
+            with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
+                documents.append(f.read())
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            markdown_to_html_node(document).to_html()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak_rss = peak_rss_mib()
+
+    # Peak traced allocation for the largest page, on a separate pass so the
+    # tracing overhead does not skew the timings
+    largest = max(documents, key=len)
+    tracemalloc.start()
+    markdown_to_html_node(largest).to_html()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": best,
+        "peak_rss_mib": peak_rss,
+        "largest_page_bytes": len(largest.encode("utf-8")),
+        "largest_page_traced_peak_mib": traced_peak / (1024 * 1024),
+    }
+
+def run_child(*args):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *args],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+def clean_outputs(site):
+    """Remove everything an earlier build of site left behind, so the next build starts cold."""
+    for name in ("docs", "docs.staging", "docs.previous", ".build-manifest.json", ".render-cache"):
+        path = os.path.join(site, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "-C", ROOT, "rev-parse", "--short", "HEAD"],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def with_rates(result, pages, markdown_bytes):
+    """Add pages/sec and MB/sec to a timing result."""
+    result["pages_per_sec"] = pages / result["seconds"]
+    result["mb_per_sec"] = markdown_bytes / result["seconds"] / 1e6
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    corpus.add_arguments(parser)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for the parallel build (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats of the parse benchmark")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, site, value = args.child
+        if kind == "build":
+            result = measure_build(site, int(value))
+        else:
+            result = measure_parse(site, int(value))
+        print(json.dumps(result))
+        return
+
+    options = corpus.options_from_args(args)
+    results = {}
+    with tempfile.TemporaryDirectory() as site:
+        markdown_bytes = corpus.generate_corpus(site, options)
+        print(f"{options.pages} pages, {markdown_bytes / 1e6:.1f} MB markdown")
+
+        builds = [("build, 1 job", 1)]
+        if args.jobs > 1:
+            builds.append((f"build, {args.jobs} jobs", args.jobs))
+        for label, jobs in builds:
+            clean_outputs(site)
+            results[label] = run_child("build", site, str(jobs))
+        # The site is now fully built, so this only checks and skips every page
+        results["rebuild, unchanged"] = run_child("build", site, "1")
+        results["markdown_to_html_node"] = run_child("parse", site, str(args.repeat))
+
+    for result in results.values():
+        with_rates(result, options.pages, markdown_bytes)
+
+    print(f"{'':>24} {'seconds':>9} {'pages/s':>9} {'MB/s':>7} {'peak RSS':>10}")
+    for label, result in results.items():
+        print(f"{label:>24} {result['seconds']:>9.3f} {result['pages_per_sec']:>9.0f} "
+              f"{result['mb_per_sec']:>7.2f} {result['peak_rss_mib']:>8.1f}MB")
+
+    if args.output:
+        report = {
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "corpus": dict(options.to_dict(), markdown_bytes=markdown_bytes),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark block classification on a realistic mix of blocks.
+
+Compares classify_block, which picks the only possible type from a block's
+first character and scans its lines once, against the multi-pass
+block_to_block_type it replaced, on the same synthetic blocks.
+
+Usage:
+    python3 benchmarks/bench_classify.py [--blocks N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from block_to_block_type import BlockType, classify_block
+from corpus import CorpusOptions, make_block
+
+def multi_pass(block):
+    """The block_to_block_type that tested every type in turn."""
+    lines = block.split('\n')
+    if len(lines) == 1 and re.match(r'^#{1,6} ', block):
+        return BlockType.HEADING
+    if block.startswith('```') and block.endswith('```') and len(block) > 6:
+        return BlockType.CODE
+    if all(line.startswith('>') for line in lines):
+        return BlockType.QUOTE
+    if all(line.startswith('- ') for line in lines):
+        return BlockType.UNORDERED_LIST
+    for i, line in enumerate(lines):
+        if not line.startswith(f"{i + 1}. "):
+            return BlockType.PARAGRAPH
+    return BlockType.ORDERED_LIST
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    options = CorpusOptions()
+    rnd = random.Random(options.seed)
+    kinds = list(options.mix)
+    weights = [options.mix[kind] for kind in kinds]
+    blocks = [make_block(rnd, kind, options) for kind in rnd.choices(kinds, weights, k=args.blocks)]
+    for block in blocks:
+        assert classify_block(block)[0] == multi_pass(block)
+
+    size = sum(len(b) for b in blocks)
+    print(f"{len(blocks)} blocks, {size / 1024:.0f} KiB")
+    results = {}
+    for name, function in (("multi pass", multi_pass), ("single scan", classify_block)):
+        seconds = min(timeit.repeat(lambda: [function(b) for b in blocks], number=1, repeat=args.repeat))
+        results[name] = seconds
+        print(f"{name:>14}: {seconds * 1000:8.1f} ms  {len(blocks) / seconds / 1e6:6.2f} Mblocks/s")
+    print(f"{'speedup':>14}: {results['multi pass'] / results['single scan']:8.2f}x")
+
+if __name__ == "__main__":
+    main()
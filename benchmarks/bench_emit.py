@@ -0,0 +1,61 @@
+"""
+Benchmark the direct HTML emitter against building and rendering a node tree.
+
+Converts one large synthetic document with markdown_to_html and with
+markdown_to_html_node(...).to_html(), checks that both give the same HTML,
+and reports the time and the peak memory allocated during conversion (from
+tracemalloc), so the savings from skipping the TextNode, LeafNode and
+ParentNode objects show up directly.
+
+Usage:
+    python3 benchmarks/bench_emit.py [--blocks N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusOptions, make_page
+from markdown_to_html_node import markdown_to_html, markdown_to_html_node
+
+def node_tree(markdown):
+    """The tree path: build every node, then walk the tree to write it."""
+    return markdown_to_html_node(markdown).to_html()
+
+def peak_allocated(function, markdown):
+    """Peak bytes allocated while function converts markdown, excluding the input."""
+    tracemalloc.start()
+    function(markdown)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    options = CorpusOptions(blocks=args.blocks)
+    markdown = make_page(random.Random(options.seed), "Synthetic document", options)
+    assert markdown_to_html(markdown) == node_tree(markdown)
+
+    size = len(markdown.encode("utf-8"))
+    print(f"{args.blocks} blocks, {size / 1024:.0f} KiB markdown")
+    results = {}
+    for name, function in (("node tree", node_tree), ("direct", markdown_to_html)):
+        seconds = min(timeit.repeat(lambda: function(markdown), number=1, repeat=args.repeat))
+        peak = peak_allocated(function, markdown)
+        results[name] = (seconds, peak)
+        print(f"{name:>10}: {seconds * 1000:8.1f} ms  {size / seconds / 1e6:6.1f} MB/s  "
+              f"peak {peak / 1e6:7.1f} MB")
+    (tree_seconds, tree_peak), (direct_seconds, direct_peak) = results.values()
+    print(f"{'speedup':>10}: {tree_seconds / direct_seconds:8.2f}x  "
+          f"{'':>14}  peak {tree_peak / direct_peak:7.1f}x smaller")
+
+if __name__ == "__main__":
+    main()
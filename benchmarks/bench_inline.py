@@ -0,0 +1,76 @@
+"""
+Benchmark inline parsing on paragraph-heavy text.
+
+Compares the single-pass text_to_textnodes tokenizer against the chain of
+split_nodes_image, split_nodes_link and split_nodes_delimiter passes it
+replaced, on the same synthetic paragraphs.
+
+Usage:
+    python3 benchmarks/bench_inline.py [--paragraphs N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from split_nodes_delimiter import split_nodes_delimiter
+from split_nodes_image_link import split_nodes_image, split_nodes_link
+from text_to_textnodes import text_to_textnodes
+
+WORDS = ["the", "elves", "of", "rivendell", "sang", "under", "stars", "and", "a", "hobbit", "listened"]
+
+def split_passes(text):
+    """The chained split passes text_to_textnodes used to run."""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+
+def make_paragraph(rnd, words=80):
+    """Build one paragraph of prose with a realistic sprinkle of inline syntax."""
+    parts = []
+    for _ in range(words):
+        word = rnd.choice(WORDS)
+        roll = rnd.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.09:
+            word = f"_{word}_"
+        elif roll < 0.11:
+            word = f"`{word}`"
+        elif roll < 0.13:
+            word = f"[{word}](https://example.com/{word})"
+        elif roll < 0.14:
+            word = f"![{word}](/images/{word}.png)"
+        parts.append(word)
+    return " ".join(parts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    paragraphs = [make_paragraph(rnd) for _ in range(args.paragraphs)]
+    for paragraph in paragraphs:
+        assert text_to_textnodes(paragraph) == split_passes(paragraph)
+
+    size = sum(len(p) for p in paragraphs)
+    print(f"{len(paragraphs)} paragraphs, {size / 1024:.0f} KiB")
+    results = {}
+    for name, function in (("split passes", split_passes), ("single pass", text_to_textnodes)):
+        seconds = min(timeit.repeat(lambda: [function(p) for p in paragraphs], number=1, repeat=args.repeat))
+        results[name] = seconds
+        print(f"{name:>14}: {seconds * 1000:8.1f} ms  {size / seconds / 1e6:6.1f} MB/s")
+    print(f"{'speedup':>14}: {results['split passes'] / results['single pass']:8.2f}x")
+
+if __name__ == "__main__":
+    main()
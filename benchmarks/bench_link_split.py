@@ -0,0 +1,69 @@
+"""
+Benchmark link splitting on link-dense paragraphs.
+
+Times split_nodes_link on a single paragraph holding 10 to 10,000 links and
+compares it with the previous implementation, which rebuilt each link's
+markdown and called str.split on the remaining text once per link. Time per
+link should stay flat for the span-based version as the paragraph grows.
+
+Usage:
+    python3 benchmarks/bench_link_split.py [--max-links N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from extract_markdown import extract_markdown_links
+from split_nodes_image_link import split_nodes_link
+
+def split_nodes_link_str_split(old_nodes):
+    """The previous split_nodes_link, kept here as the baseline."""
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        links = extract_markdown_links(node.text)
+        if not links:
+            new_nodes.append(node)
+            continue
+        current_text = node.text
+        for anchor_text, url in links:
+            parts = current_text.split(f"[{anchor_text}]({url})", 1)
+            if len(parts) == 2:
+                if parts[0]:
+                    new_nodes.append(TextNode(parts[0], TextType.TEXT))
+                new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
+                current_text = parts[1]
+        if current_text:
+            new_nodes.append(TextNode(current_text, TextType.TEXT))
+    return new_nodes
+
+def make_paragraph(links):
+    """A nav-list style paragraph: one link after another with short separators."""
+    return " · ".join(f"[Post number {i}](/blog/post-{i})" for i in range(links))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-links", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'links':>7} {'str.split ms':>12} {'us/link':>8} {'finditer ms':>12} {'us/link':>8}")
+    links = 10
+    while links <= args.max_links:
+        nodes = [TextNode(make_paragraph(links), TextType.TEXT)]
+        assert split_nodes_link(nodes) == split_nodes_link_str_split(nodes)
+        row = [f"{links:>7}"]
+        for function in (split_nodes_link_str_split, split_nodes_link):
+            seconds = min(timeit.repeat(lambda: function(nodes), number=1, repeat=args.repeat))
+            row.append(f"{seconds * 1000:>12.2f} {seconds / links * 1e6:>8.2f}")
+        print(" ".join(row))
+        links *= 10
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Measure the memory used by the node objects of a large rendered document.
+
+Builds a synthetic document, keeps its HTMLNode tree and the TextNodes of
+every paragraph alive, renders it, and reports bytes per node (from
+tracemalloc and sys.getsizeof) and the process's peak RSS.
+
+With --baseline REV the same measurement is also run against the src/ tree
+of a git revision (e.g. the commit before the node classes gained
+__slots__), each in its own process so peak RSS is comparable.
+
+Usage:
+    python3 benchmarks/bench_node_memory.py [--paragraphs N] [--baseline REV]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+WORDS = ["the", "elves", "of", "rivendell", "sang", "under", "stars", "and", "a", "hobbit", "listened"]
+
+def make_document(paragraphs, seed=7):
+    """A paragraph-heavy document with headings, lists and inline markup."""
+    rnd = random.Random(seed)
+    blocks = ["# Synthetic document"]
+    for i in range(paragraphs):
+        words = []
+        for _ in range(60):
+            word = rnd.choice(WORDS)
+            roll = rnd.random()
+            if roll < 0.06:
+                word = f"**{word}**"
+            elif roll < 0.10:
+                word = f"_{word}_"
+            elif roll < 0.12:
+                word = f"[{word}](/blog/{word})"
+            words.append(word)
+        blocks.append(" ".join(words))
+        if i % 10 == 0:
+            blocks.append(f"## Section {i}")
+            blocks.append("\n".join(f"- item {rnd.choice(WORDS)}" for _ in range(5)))
+    return "\n\n".join(blocks)
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+def object_size(node):
+    """Bytes used by the node object itself, including any instance __dict__."""
+    size = sys.getsizeof(node)
+    if hasattr(node, "__dict__"):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+def measure(src_dir, paragraphs):
+    """Run the measurement in this process with the modules from src_dir."""
+    sys.path.insert(0, src_dir)
+    from markdown_to_html_node import markdown_to_html_node
+    from markdown_to_blocks import markdown_to_blocks
+    from text_to_textnodes import text_to_textnodes
+    from textnode import TextNode
+
+    markdown = make_document(paragraphs)
+    texts = [block for block in markdown_to_blocks(markdown) if block[0].isalpha()]
+
+    # Peak RSS first, before tracemalloc adds its own bookkeeping
+    tree = markdown_to_html_node(markdown)
+    text_nodes = [text_to_textnodes(text) for text in texts]
+    html = tree.to_html()
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    del tree, text_nodes, html
+
+    tracemalloc.start()
+    tree = markdown_to_html_node(markdown)
+    text_nodes = [text_to_textnodes(text) for text in texts]
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    html_nodes = count_nodes(tree)
+    flat_text_nodes = [node for nodes in text_nodes for node in nodes]
+    sample_leaf = tree.children[1].children[0]
+    return {
+        "src": src_dir,
+        "markdown_bytes": len(markdown.encode("utf-8")),
+        "html_nodes": html_nodes,
+        "text_nodes": len(flat_text_nodes),
+        "traced_bytes_per_node": traced / (html_nodes + len(flat_text_nodes)),
+        "text_node_object_bytes": object_size(TextNode("x", flat_text_nodes[0].text_type)),
+        "leaf_node_object_bytes": object_size(sample_leaf),
+        "parent_node_object_bytes": object_size(tree),
+        "peak_rss_mib": peak_rss_kib / 1024,
+    }
+
+def run_child(src_dir, paragraphs):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", src_dir, "--paragraphs", str(paragraphs)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+def export_revision(revision, dest):
+    """Extract src/ at a git revision into dest and return its path."""
+    archive = subprocess.run(
+        ["git", "-C", ROOT, "archive", "--format=tar", revision, "src"],
+        check=True, capture_output=True,
+    ).stdout
+    archive_path = os.path.join(dest, "src.tar")
+    with open(archive_path, "wb") as f:
+        f.write(archive)
+    with tarfile.open(archive_path) as tar:
+        tar.extractall(dest)
+    return os.path.join(dest, "src")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--baseline", help="git revision to compare against, e.g. HEAD~1")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.paragraphs)))
+        return
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.baseline:
+            runs.append((args.baseline, run_child(export_revision(args.baseline, tmp), args.paragraphs)))
+        runs.append(("working tree", run_child(os.path.join(ROOT, "src"), args.paragraphs)))
+
+    if args.json:
+        print(json.dumps({label: result for label, result in runs}, indent=2))
+        return
+
+    first = runs[0][1]
+    print(f"{first['markdown_bytes'] / 1e6:.1f} MB markdown, "
+          f"{first['html_nodes']} HTML nodes, {first['text_nodes']} TextNodes")
+    print(f"{'':>14} {'bytes/node':>10} {'TextNode':>9} {'LeafNode':>9} {'ParentNode':>11} {'peak RSS':>10}")
+    for label, result in runs:
+        print(f"{label:>14} {result['traced_bytes_per_node']:>10.0f} "
+              f"{result['text_node_object_bytes']:>9} {result['leaf_node_object_bytes']:>9} "
+              f"{result['parent_node_object_bytes']:>11} {result['peak_rss_mib']:>8.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Generate a reproducible synthetic site to benchmark builds against.
+
+Writes content/, static/ and template.html under a root directory, laid out
+like the real site so src/main.py can build it from there. The same options
+and seed always produce byte-identical files.
+
+Usage:
+    python3 benchmarks/corpus.py ROOT [--pages N] [--blocks N] [--depth N]
+        [--mix heading=1,paragraph=6,...] [--link-density F] [--emphasis-density F]
+"""
+import argparse
+import os
+import random
+import shutil
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+WORDS = [
+    "the", "elves", "of", "rivendell", "sang", "under", "stars", "and", "a",
+    "hobbit", "listened", "while", "glorfindel", "rode", "through", "misty",
+    "mountains", "toward", "ancient", "halls", "lost", "songs", "river", "road",
+]
+
+# Relative weight of each block type in a page, after its h1
+DEFAULT_MIX = {
+    "heading": 1,
+    "paragraph": 6,
+    "code": 1,
+    "quote": 1,
+    "unordered_list": 1,
+    "ordered_list": 1,
+}
+
+class CorpusOptions():
+    """
+    Shape of a synthetic corpus.
+
+    Args:
+        pages (int): Number of markdown pages
+        blocks (int): Blocks per page, not counting the h1
+        depth (int): Directory depth pages are spread across; 0 puts every
+            page directly in content/
+        mix (dict): Relative weight of each block type, see DEFAULT_MIX
+        link_density (float): Chance that a word becomes a link or image
+        emphasis_density (float): Chance that a word gets bold, italic or code
+        words (int): Words per paragraph
+        seed (int): Random seed
+    """
+
+    def __init__(self, pages=200, blocks=30, depth=2, mix=None, link_density=0.03,
+                 emphasis_density=0.1, words=60, seed=42):
+        self.pages = pages
+        self.blocks = blocks
+        self.depth = depth
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.link_density = link_density
+        self.emphasis_density = emphasis_density
+        self.words = words
+        self.seed = seed
+
+        unknown = set(self.mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown block type(s): {', '.join(sorted(unknown))}")
+
+    def to_dict(self):
+        return {
+            "pages": self.pages,
+            "blocks": self.blocks,
+            "depth": self.depth,
+            "mix": self.mix,
+            "link_density": self.link_density,
+            "emphasis_density": self.emphasis_density,
+            "words": self.words,
+            "seed": self.seed,
+        }
+
+def parse_mix(text):
+    """Parse a block mix such as "paragraph=6,code=1" into a weight dict."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def make_words(rnd, count, options, links=True):
+    """A run of prose with inline syntax sprinkled in at the configured densities."""
+    words = []
+    for _ in range(count):
+        word = rnd.choice(WORDS)
+        roll = rnd.random()
+        if roll < options.emphasis_density:
+            # Bold is the most common emphasis, then italic, then code
+            kind = rnd.random()
+            if kind < 0.5:
+                word = f"**{word}**"
+            elif kind < 0.8:
+                word = f"_{word}_"
+            else:
+                word = f"`{word}`"
+        elif links and roll < options.emphasis_density + options.link_density:
+            if rnd.random() < 0.8:
+                word = f"[{word}](/blog/{word})"
+            else:
+                word = f"![{word}](/images/{word}.png)"
+        words.append(word)
+    return " ".join(words)
+
+def make_block(rnd, kind, options):
+    """One markdown block of the given kind."""
+    if kind == "heading":
+        level = rnd.randint(2, 4)
+        return "#" * level + " " + make_words(rnd, 4, options, links=False)
+    if kind == "paragraph":
+        return make_words(rnd, options.words, options)
+    if kind == "code":
+        lines = [f"{rnd.choice(WORDS)} = {rnd.randint(0, 999)}" for _ in range(rnd.randint(2, 8))]
+        return "```\n" + "\n".join(lines) + "\n```"
+    if kind == "quote":
+        return "\n".join(f"> {make_words(rnd, 12, options)}" for _ in range(rnd.randint(1, 4)))
+    if kind == "unordered_list":
+        return "\n".join(f"- {make_words(rnd, 8, options)}" for _ in range(rnd.randint(2, 6)))
+    # ordered_list
+    return "\n".join(f"{i}. {make_words(rnd, 8, options)}" for i in range(1, rnd.randint(2, 6) + 1))
+
+def make_page(rnd, title, options):
+    """A complete page: an h1 followed by options.blocks blocks drawn from the mix."""
+    kinds = list(options.mix)
+    weights = [options.mix[kind] for kind in kinds]
+    blocks = [f"# {title}"]
+    for kind in rnd.choices(kinds, weights, k=options.blocks):
+        blocks.append(make_block(rnd, kind, options))
+    return "\n\n".join(blocks) + "\n"
+
+def page_path(index, depth):
+    """Relative path of page number index, spread over depth levels of directories."""
+    parts = []
+    value = index
+    for level in range(depth):
+        parts.append(f"d{level}-{value % 8}")
+        value //= 8
+    parts.append(f"page-{index}")
+    return os.path.join(*parts, "index.md")
+
+def generate_corpus(root, options=None):
+    """
+    Write a synthetic site under root.
+
+    Any content/, static/ and template.html already under root are replaced.
+
+    Args:
+        root (str): Directory to write the site into
+        options (CorpusOptions): Shape of the corpus, defaults to CorpusOptions()
+
+    Returns:
+        int: Total size of the generated markdown in bytes
+    """
+    options = options or CorpusOptions()
+    rnd = random.Random(options.seed)
+
+    content_dir = os.path.join(root, "content")
+    static_dir = os.path.join(root, "static")
+    for path in (content_dir, static_dir):
+        if os.path.exists(path):
+            shutil.rmtree(path)
+
+    # The real template and static files, so pages render exactly like the site
+    shutil.copy(os.path.join(ROOT, "template.html"), os.path.join(root, "template.html"))
+    shutil.copytree(os.path.join(ROOT, "static"), static_dir)
+
+    total = 0
+    for index in range(options.pages):
+        path = os.path.join(content_dir, page_path(index, options.depth))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = make_page(rnd, f"Page {index}", options).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+def add_arguments(parser):
+    """Add the corpus shape options to an argument parser."""
+    defaults = CorpusOptions()
+    parser.add_argument("--pages", type=int, default=defaults.pages)
+    parser.add_argument("--blocks", type=int, default=defaults.blocks, help="blocks per page")
+    parser.add_argument("--depth", type=int, default=defaults.depth, help="directory depth")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help="block weights, e.g. heading=1,paragraph=6,code=1 (default: %s)"
+                             % ",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--link-density", type=float, default=defaults.link_density)
+    parser.add_argument("--emphasis-density", type=float, default=defaults.emphasis_density)
+    parser.add_argument("--words", type=int, default=defaults.words, help="words per paragraph")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+def options_from_args(args):
+    return CorpusOptions(args.pages, args.blocks, args.depth, args.mix, args.link_density,
+                         args.emphasis_density, args.words, args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", help="directory to write the site into")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    options = options_from_args(args)
+    total = generate_corpus(args.root, options)
+    print(f"{options.pages} pages, {total / 1e6:.1f} MB markdown written to {args.root}")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 #!/bin/bash
 python3 src/main.py
-cd docs && python3 -m http.server 8888
+# Serve by path rather than from inside docs/, so every build swapped into place is picked up
+python3 -m http.server 8888 --directory docs
@@ -0,0 +1,136 @@
+import os
+
+from url_rewrite import is_root_relative, rewrite_html_urls, rewrite_node_urls
+
+# Static files that get a content hash in their name. Anything else, e.g.
+# robots.txt or favicon.ico, is fetched by a fixed name and keeps it.
+FINGERPRINT_EXTENSIONS = frozenset((
+    ".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg",
+    ".woff", ".woff2", ".ttf", ".otf",
+))
+
+# Number of hex digits of the SHA-256 that go into a fingerprinted name
+FINGERPRINT_LENGTH = 8
+
+def is_fingerprinted(relative_path):
+    """Check whether a static file is published under a fingerprinted name."""
+    return os.path.splitext(relative_path)[1].lower() in FINGERPRINT_EXTENSIONS
+
+def fingerprint_path(relative_path, sha256):
+    """
+    Insert a content hash into a file name, e.g. index.css -> index.3f2a9c1b.css.
+
+    Args:
+        relative_path (str): Path of the static file
+        sha256 (str): Hex SHA-256 of the file's contents
+
+    Returns:
+        str: The fingerprinted path
+    """
+    root, extension = os.path.splitext(relative_path)
+    return f"{root}.{sha256[:FINGERPRINT_LENGTH]}{extension}"
+
+class AssetMap():
+    """
+    Maps static files to the fingerprinted names they are published under.
+
+    Every entry is keyed by the file's path relative to the static directory,
+    with '/' separators, and holds the published path ("output") plus the
+    source's size and mtime, so the next build can tell an unchanged file
+    without hashing it again (see static_sync.sync_static_fingerprinted).
+
+    Pages and the template refer to assets by their plain root-relative URL,
+    e.g. /images/tom.png. The rewrite methods swap such URLs for the
+    fingerprinted ones and return the references they looked at, mapped to
+    what they resolved to (None for a URL that is not an asset). Those
+    references are a page's asset dependencies: the page is only out of date
+    when one of them resolves differently (see still_resolves).
+
+    Args:
+        files (dict): Entries of a previous build's map, if any
+    """
+
+    def __init__(self, files=None):
+        self.files = files if files is not None else {}
+
+    def add(self, relative_path, output_path, size, mtime_ns):
+        """Record the published name of one static file."""
+        self.files[relative_path.replace(os.sep, '/')] = {
+            "output": output_path.replace(os.sep, '/'),
+            "size": size,
+            "mtime_ns": mtime_ns,
+        }
+
+    def url_for(self, url):
+        """
+        Return the fingerprinted URL of a root-relative asset URL.
+
+        A query string or fragment is kept.
+
+        Args:
+            url (str): URL as written in a page or the template
+
+        Returns:
+            str: The fingerprinted URL, or None if url is not a static asset
+        """
+        if not is_root_relative(url):
+            return None
+        path = url
+        suffix = ""
+        for separator in "?#":
+            index = path.find(separator)
+            if index != -1:
+                path, suffix = path[:index], path[index:] + suffix
+        entry = self.files.get(path[1:])
+        if entry is None:
+            return None
+        return f"/{entry['output']}{suffix}"
+
+    def rewrite_node(self, node):
+        """
+        Point the img and a nodes of a tree at fingerprinted assets.
+
+        Args:
+            node (HTMLNode): Root of the tree, changed in place
+
+        Returns:
+            dict: The root-relative URLs found, mapped to their fingerprinted
+                URL or None
+        """
+        references = {}
+        rewrite_node_urls(node, self._recorder(references))
+        return references
+
+    def rewrite_html(self, html):
+        """
+        Point the href and src attributes in raw HTML at fingerprinted assets.
+
+        Args:
+            html (str): HTML text, e.g. a literal part of the page template
+
+        Returns:
+            tuple: (rewritten_html, references) as for rewrite_node
+        """
+        references = {}
+        return rewrite_html_urls(html, self._recorder(references)), references
+
+    def still_resolves(self, references):
+        """
+        Check whether recorded asset references still resolve the same way.
+
+        Args:
+            references (dict): References returned by rewrite_node or rewrite_html
+
+        Returns:
+            bool: True if no referenced asset was added, changed or removed
+        """
+        return all(self.url_for(url) == resolved for url, resolved in references.items())
+
+    def _recorder(self, references):
+        """Return a rewrite function that also records each root-relative URL in references."""
+        def rewrite(url):
+            if not url.startswith("/"):
+                return None
+            references[url] = self.url_for(url)
+            return references[url]
+        return rewrite
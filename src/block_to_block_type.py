@@ -9,6 +9,9 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
+# 1-6 # characters followed by a space
+_HEADING_PATTERN = re.compile(r'#{1,6} ')
+
 def block_to_block_type(block):
     """
     Determine the type of a markdown block.
@@ -30,46 +33,76 @@ def block_to_block_type(block):
     - Ordered lists: Every line must start with number. followed by space, incrementing from 1
     - Paragraph: If none of the above conditions are met
     """
-    lines = block.split('\n')
+    return classify_block(block)[0]
+
+def classify_block(block):
+    """
+    Determine the type of a markdown block in a single scan of its lines.
+    
+    The first character already rules out all but one type: '#' can only
+    start a heading, '`' a code block, '>' a quote, '-' an unordered list and
+    a digit an ordered list. Anything else is a paragraph without looking
+    further. Only quotes and lists are split into lines, and their lines are
+    checked until the first one that does not match.
+    
+    Args:
+        block (str): A single block of markdown text (whitespace already stripped)
+        
+    Returns:
+        tuple: (block_type, lines), where lines is the block split on
+            newlines for quotes and lists, so block_to_html_node does not
+            split it again, and None for the other types
+    """
+    first = block[:1]
     
-    # Check for heading (1-6 # followed by space, single line only)
-    if len(lines) == 1 and re.match(r'^#{1,6} ', block):
-        return BlockType.HEADING
+    if first == '#':
+        # A heading is a single line
+        if _HEADING_PATTERN.match(block) and '\n' not in block:
+            return BlockType.HEADING, None
+        return BlockType.PARAGRAPH, None
     
-    # Check for code block (starts and ends with ```)
-    if block.startswith('```') and block.endswith('```') and len(block) > 6:
-        return BlockType.CODE
+    if first == '`':
+        if block.startswith('```') and block.endswith('```') and len(block) > 6:
+            return BlockType.CODE, None
+        return BlockType.PARAGRAPH, None
     
-    # Check for quote block (every line starts with >)
-    if all(line.startswith('>') for line in lines):
-        return BlockType.QUOTE
+    if first == '>':
+        lines = block.split('\n')
+        for line in lines:
+            if not line.startswith('>'):
+                return BlockType.PARAGRAPH, None
+        return BlockType.QUOTE, lines
     
-    # Check for unordered list (every line starts with "- ")
-    if all(line.startswith('- ') for line in lines):
-        return BlockType.UNORDERED_LIST
+    if first == '-':
+        lines = block.split('\n')
+        for line in lines:
+            if not line.startswith('- '):
+                return BlockType.PARAGRAPH, None
+        return BlockType.UNORDERED_LIST, lines
     
-    # Check for ordered list (every line starts with number. followed by space, incrementing from 1)
-    if _is_ordered_list(lines):
-        return BlockType.ORDERED_LIST
+    if first.isdigit():
+        lines = block.split('\n')
+        if _is_ordered_list(lines):
+            return BlockType.ORDERED_LIST, lines
+        return BlockType.PARAGRAPH, None
     
-    # Default to paragraph
-    return BlockType.PARAGRAPH
+    return BlockType.PARAGRAPH, None
 
 def _is_ordered_list(lines):
     """
     Helper function to check if lines form a valid ordered list.
     
+    Each line must start with its 1-based number followed by '. '.
+    
     Args:
         lines (list): List of lines to check
         
     Returns:
         bool: True if lines form a valid ordered list, False otherwise
     """
-    for i, line in enumerate(lines):
-        expected_number = i + 1
-        expected_start = f"{expected_number}. "
-        
-        if not line.startswith(expected_start):
+    for i, line in enumerate(lines, 1):
+        number = str(i)
+        if not (line.startswith(number) and line.startswith('. ', len(number))):
             return False
     
     return True
@@ -0,0 +1,105 @@
+from build_profiler import NULL_PROFILER
+from output_writer import OutputWriter
+from page_template import Template
+
+# Placeholders a page template may use
+PAGE_SLOTS = ("Title", "Content")
+
+class BuildContext():
+    """
+    The settings and shared state of one build.
+
+    Every page of a build is generated with the same template, basepath and
+    options. They are gathered here, and the context is passed down the
+    pipeline (build_site, generate_pages_recursive, generate_page) instead
+    of one more parameter per option.
+
+    The first group of arguments are the build's options. The rest is state
+    that build_site fills in for each build, and that tests or watch mode
+    may pass in directly.
+
+    Args:
+        template_path (str): Path to the HTML template file
+        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+        jobs (int): Number of worker processes; 1 builds the pages serially
+        profiler (BuildProfiler): Optional profiler. Profiled builds always
+            run serially so that every phase of every page can be timed.
+        cache (RenderCache): Optional cache of rendered page bodies
+        compressor (Precompressor): Optional precompressor that writes .gz
+            copies of pages and text assets
+        fingerprint (bool): Publish static assets under content-hashed names
+            and point pages and the template at them
+        minifier (HTMLMinifier): Optional minifier. Pages are minified as they
+            are rendered, and the bytes it saves are added to it.
+        manifest (BuildManifest): Optional build manifest. A page is skipped
+            if its inputs match the recorded ones, and recorded after it has
+            been generated.
+        writer (OutputWriter): Writer that counts written and unchanged
+            outputs; one using the compressor is created when omitted
+        assets (AssetMap): Optional map of fingerprinted static files. Links
+            and images pointing at them are rewritten, and a page is only
+            rebuilt when an asset it refers to changes.
+        template (Template): The compiled template, loaded from template_path
+            by load_template when omitted
+    """
+
+    def __init__(self, template_path, basepath="/", jobs=1, profiler=None, cache=None, compressor=None,
+                 fingerprint=False, minifier=None, manifest=None, writer=None, assets=None, template=None):
+        self.template_path = template_path
+        self.basepath = basepath
+        self.jobs = jobs
+        self.profiler = profiler
+        self.cache = cache
+        self.compressor = compressor
+        self.fingerprint = fingerprint
+        self.minifier = minifier
+        self.manifest = manifest
+        self.writer = writer if writer is not None else OutputWriter(compressor)
+        self.assets = assets
+        self.template = template
+
+    @property
+    def timer(self):
+        """The profiler, or a no-op one so phases can be timed unconditionally."""
+        return self.profiler or NULL_PROFILER
+
+    @property
+    def minify(self):
+        """Whether pages are minified."""
+        return self.minifier is not None
+
+    def load_template(self):
+        """
+        Return the compiled template, compiling it on first use.
+
+        Returns:
+            Template: The template, compiled for the basepath, the asset map
+                and minifying
+
+        Raises:
+            ValueError: If the template uses a placeholder other than PAGE_SLOTS
+        """
+        if self.template is None:
+            self.template = load_page_template(self.template_path, self.basepath, self.assets, self.minify)
+        return self.template
+
+def load_page_template(template_path, basepath="/", assets=None, minify=False):
+    """
+    Read and compile the page template, failing on unknown placeholders.
+
+    Args:
+        template_path (str): Path to the HTML template file
+        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+        assets (AssetMap): Optional map of fingerprinted static files the
+            template's links are pointed at
+        minify (bool): Minify the template's HTML
+
+    Returns:
+        Template: The compiled template
+
+    Raises:
+        ValueError: If the template uses a placeholder other than PAGE_SLOTS
+    """
+    template = Template.from_file(template_path, basepath, assets, minify)
+    template.check_slots(PAGE_SLOTS)
+    return template
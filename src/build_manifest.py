@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+
+# Bump this whenever a change to the parser or renderer alters the generated
+# HTML, so that pages recorded by an older build are regenerated.
+RENDERER_VERSION = "5"
+
+def hash_bytes(data):
+    """
+    Return the hex SHA-256 digest of a bytes object.
+
+    Args:
+        data (bytes): The bytes to hash
+
+    Returns:
+        str: Hex digest of the data
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """
+    Return the hex SHA-256 digest of a file, reading it in chunks.
+
+    Args:
+        path (str): Path to the file to hash
+        chunk_size (int): Number of bytes to read at a time
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Suffixes of the precompressed copies that may sit next to an output file
+# (see precompress.Precompressor)
+PRECOMPRESSED_SUFFIXES = (".gz",)
+
+def remove_output(path, root):
+    """
+    Delete an output file, its precompressed copies and any directories left empty.
+
+    Args:
+        path (str): Path of the output file
+        root (str): The output directory, which is never removed itself
+    """
+    os.remove(path)
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+    remove_empty_parents(path, root)
+
+def remove_empty_parents(path, root):
+    """
+    Remove directories left empty by deleting path, stopping at root.
+
+    Args:
+        path (str): Path of the file that was removed
+        root (str): Directory that is never removed itself
+    """
+    root = os.path.abspath(root)
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent.startswith(root + os.sep) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+class BuildManifest():
+    """
+    Persistent record of the inputs each generated page was built from.
+
+    Every page is stored under its source path together with the hash of the
+    markdown, the hash of the template, the basepath, the renderer version and
+    the output path (relative to the output directory). A page whose recorded
+    inputs all match the current ones, and whose output file still exists,
+    does not need to be generated again.
+
+    In a build with fingerprinted assets, a page also records the asset URLs
+    it and the template refer to and what they resolved to, and is rebuilt
+    only when one of those resolves differently.
+
+    The manifest also remembers which files in the output directory were copied
+    from the static directory, so the static sync knows what it may delete,
+    the asset map of the last fingerprinted sync, and the settings the .gz
+    copies were made with, along with which outputs got one.
+    """
+
+    def __init__(self, path, output_dir, entries=None, static_files=None, asset_files=None, gzip_settings=None,
+                 gzip_outputs=None):
+        self.path = path
+        self.output_dir = output_dir
+        self.entries = entries if entries is not None else {}
+        self.static_files = set(static_files or ())
+        # AssetMap.files of the last fingerprinted static sync
+        self.asset_files = asset_files if asset_files is not None else {}
+        # Precompressor.settings() of the last build, or None if it had no .gz copies
+        self.gzip_settings = gzip_settings
+        # Whether each compressible output got a .gz copy (False: too little
+        # saving), keyed by its path relative to output_dir
+        self.gzip_outputs = gzip_outputs if gzip_outputs is not None else {}
+        self.skipped = 0
+        self.rebuilt = 0
+        self._seen = set()
+        self._template_hashes = {}
+
+    @classmethod
+    def load(cls, path, output_dir):
+        """
+        Load a manifest from disk, starting empty if it is missing or unreadable.
+
+        Args:
+            path (str): Path to the manifest JSON file
+            output_dir (str): Directory the recorded output paths are relative to
+
+        Returns:
+            BuildManifest: The loaded manifest
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path, output_dir)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable build manifest {path}: {e}")
+            return cls(path, output_dir)
+
+        if not isinstance(data, dict):
+            return cls(path, output_dir)
+
+        # Pages written by a different renderer are of no use to us, but the
+        # list of synced static files does not depend on the renderer
+        pages = data.get("pages", {})
+        if data.get("renderer_version") != RENDERER_VERSION:
+            pages = {}
+
+        return cls(path, output_dir, pages, data.get("static", []), data.get("assets") or {}, data.get("gzip"),
+                   data.get("gzip_outputs") or {})
+
+    def template_hash(self, template_path):
+        """Return the hash of a template file, hashing it at most once per build."""
+        if template_path not in self._template_hashes:
+            self._template_hashes[template_path] = hash_file(template_path)
+        return self._template_hashes[template_path]
+
+    def forget_template_hash(self, template_path):
+        """Drop the cached hash of a template file after it has been edited."""
+        self._template_hashes.pop(template_path, None)
+
+    def is_up_to_date(self, source_path, dest_path, content_hash, template_hash, basepath, assets=None, minified=False):
+        """
+        Check whether a page can be skipped because none of its inputs changed.
+
+        Args:
+            source_path (str): Path to the markdown file
+            dest_path (str): Path the HTML page is written to
+            content_hash (str): Hash of the current markdown bytes
+            template_hash (str): Hash of the current template
+            basepath (str): Base path the page is being built for
+            assets (AssetMap): The build's map of fingerprinted assets, or
+                None if assets are not fingerprinted
+            minified (bool): Whether the page is being built minified
+
+        Returns:
+            bool: True if the recorded output matches the current inputs
+        """
+        entry = self.entries.get(source_path)
+        if entry is None:
+            return False
+
+        return (
+            entry.get("content_hash") == content_hash and
+            entry.get("template_hash") == template_hash and
+            entry.get("basepath") == basepath and
+            entry.get("minified", False) == minified and
+            entry.get("renderer_version") == RENDERER_VERSION and
+            entry.get("output") == self._relative_output(dest_path) and
+            _assets_match(entry.get("assets"), assets) and
+            os.path.isfile(dest_path)
+        )
+
+    def gzip_outcomes(self):
+        """Return gzip_outputs keyed by full output path, for Precompressor.previous_outcomes."""
+        return {
+            os.path.normpath(os.path.join(self.output_dir, output)): has_copy
+            for output, has_copy in self.gzip_outputs.items()
+        }
+
+    def record_gzip_outcomes(self, outcomes):
+        """Record Precompressor outcomes, which are keyed by full output path."""
+        self.gzip_outputs.update((self._relative_output(path), has_copy) for path, has_copy in outcomes.items())
+
+    def skip(self, source_path):
+        """Count a page as skipped and keep its entry alive for this build."""
+        self._seen.add(source_path)
+        self.skipped += 1
+
+    def record(self, source_path, dest_path, content_hash, template_hash, basepath, asset_references=None,
+               minified=False):
+        """
+        Record the inputs a page was just generated from.
+
+        asset_references are the asset URLs of the page and its template, as
+        returned by AssetMap.rewrite_node, in a fingerprinted build only.
+        minified is whether the page was minified.
+        """
+        self._seen.add(source_path)
+        self.rebuilt += 1
+        entry = {
+            "content_hash": content_hash,
+            "template_hash": template_hash,
+            "basepath": basepath,
+            "renderer_version": RENDERER_VERSION,
+            "output": self._relative_output(dest_path),
+        }
+        if asset_references is not None:
+            entry["assets"] = asset_references
+        if minified:
+            entry["minified"] = True
+        self.entries[source_path] = entry
+
+    def remove_stale(self):
+        """
+        Delete outputs of pages whose source was not seen during this build.
+
+        Only call this after a full walk of the content directory, otherwise
+        pages that were simply not visited would be removed.
+
+        Returns:
+            list: Output paths that were removed
+        """
+        removed = []
+        for source_path in list(self.entries):
+            if source_path in self._seen:
+                continue
+            output_path = self.remove_page(source_path)
+            if output_path is not None:
+                removed.append(output_path)
+        return removed
+
+    def remove_page(self, source_path):
+        """
+        Forget a page and delete its output, e.g. after its source was deleted.
+
+        Args:
+            source_path (str): Path to the markdown file
+
+        Returns:
+            str: The output path that was removed, or None if there was none
+        """
+        entry = self.entries.pop(source_path, None)
+        self._seen.discard(source_path)
+        if entry is None:
+            return None
+        output_path = os.path.join(self.output_dir, entry["output"])
+        if not os.path.isfile(output_path):
+            return None
+        print(f"Removing stale page: {output_path}")
+        remove_output(output_path, self.output_dir)
+        return output_path
+
+    def save(self):
+        """Write the manifest to disk, replacing the previous one atomically."""
+        data = {
+            "renderer_version": RENDERER_VERSION,
+            "pages": self.entries,
+            "static": sorted(self.static_files),
+            "assets": self.asset_files,
+            "gzip": self.gzip_settings,
+            "gzip_outputs": self.gzip_outputs,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _relative_output(self, dest_path):
+        return os.path.relpath(dest_path, self.output_dir)
+
+def _assets_match(references, assets):
+    """Check a page's recorded asset references against the current asset map."""
+    # A page built with fingerprinting on must be rebuilt when it is turned
+    # off, and the other way round
+    if references is None or assets is None:
+        return references is None and assets is None
+    return assets.still_resolves(references)
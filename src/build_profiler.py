@@ -0,0 +1,150 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Page phases in pipeline order, used to order the report
+PAGE_PHASES = (
+    "read",
+    "manifest",
+    "cache",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "inline",
+    "to_html",
+    "extract_title",
+    "template",
+    "write",
+)
+
+class BuildProfiler():
+    """
+    Collects per-page, per-phase timings for a build.
+
+    generate_page opens a page record with start_page, the pipeline adds the
+    time spent in each phase to it, and finish_page closes it. Work that is
+    not tied to a page, such as walking the content directory or syncing
+    static files, is timed with build_phase.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.build_phases = {}
+        self._current = None
+        self._started = time.perf_counter()
+
+    def start_page(self, source_path, dest_path):
+        """Start timing a page; later phases are added to it."""
+        self._current = {
+            "source": source_path,
+            "dest": dest_path,
+            "skipped": False,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "phases": {},
+            "_started": time.perf_counter(),
+        }
+        self.pages.append(self._current)
+        return self._current
+
+    def finish_page(self, bytes_in, final_html=None):
+        """
+        Close the current page record.
+
+        Args:
+            bytes_in (int): Size of the markdown source
+            final_html (str): The generated page, or None if it was skipped
+        """
+        page = self._current
+        page["seconds"] = time.perf_counter() - page.pop("_started")
+        page["bytes_in"] = bytes_in
+        if final_html is None:
+            page["skipped"] = True
+        else:
+            page["bytes_out"] = len(final_html.encode('utf-8'))
+        self._current = None
+
+    def add(self, phase, seconds):
+        """Add time spent in a phase to the current page."""
+        phases = self._current["phases"]
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, phase):
+        """Time a block of code as a phase of the current page."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    @contextmanager
+    def build_phase(self, phase):
+        """Time a block of code that is not part of any single page."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.build_phases[phase] = self.build_phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def report(self, top=10):
+        """
+        Build the timing report.
+
+        Args:
+            top (int): Number of slowest pages to list
+
+        Returns:
+            dict: Aggregate timings, the slowest pages and every page record
+        """
+        totals = {}
+        for page in self.pages:
+            for phase, seconds in page["phases"].items():
+                totals[phase] = totals.get(phase, 0.0) + seconds
+        ordered = {phase: totals[phase] for phase in PAGE_PHASES if phase in totals}
+        ordered.update({phase: seconds for phase, seconds in totals.items() if phase not in ordered})
+
+        built = [page for page in self.pages if not page["skipped"]]
+        slowest = sorted(built, key=lambda page: page["seconds"], reverse=True)[:top]
+        return {
+            "total_seconds": time.perf_counter() - self._started,
+            "build_phases": self.build_phases,
+            "aggregate": {
+                "pages": len(self.pages),
+                "pages_built": len(built),
+                "pages_skipped": len(self.pages) - len(built),
+                "bytes_in": sum(page["bytes_in"] for page in self.pages),
+                "bytes_out": sum(page["bytes_out"] for page in self.pages),
+                "page_seconds": sum(page["seconds"] for page in self.pages),
+                "phases": ordered,
+            },
+            "slowest_pages": [
+                {"source": page["source"], "seconds": page["seconds"]} for page in slowest
+            ],
+            "pages": self.pages,
+        }
+
+    def write_report(self, path, top=10):
+        """Write the timing report as JSON and return it."""
+        report = self.report(top)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+class _NullProfiler():
+    """Stand-in used when profiling is off; every call is close to free."""
+
+    def start_page(self, source_path, dest_path):
+        pass
+
+    def finish_page(self, bytes_in, final_html=None):
+        pass
+
+    def add(self, phase, seconds):
+        pass
+
+    def phase(self, phase):
+        return nullcontext()
+
+    build_phase = phase
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,186 @@
+import os
+
+from build_manifest import BuildManifest
+from static_sync import sync_static, sync_static_fingerprinted
+from asset_map import AssetMap
+from staged_output import StagedOutput
+from output_writer import OutputWriter
+from deploy_manifest import DEPLOY_MANIFEST_NAME, DeployManifest, build_deploy_manifest
+from generate_pages import generate_pages_recursive
+
+MANIFEST_PATH = ".build-manifest.json"
+RENDER_CACHE_DIR = ".render-cache"
+
+# Source and destination directories (relative to project root)
+STATIC_DIR = "static"
+DEST_DIR = "docs"  # Changed from "public" to "docs" for GitHub Pages
+CONTENT_DIR = "content"
+TEMPLATE_PATH = "template.html"
+
+def copy_static_to_public(source_dir, dest_dir, manifest=None, compressor=None, fingerprint=False):
+    """
+    Sync all contents from source directory into the destination directory.
+    
+    Only new or changed files are copied, and only files whose source has been
+    deleted are removed, so pages generated by earlier builds are kept.
+    
+    Args:
+        source_dir (str): Path to the source directory (e.g., 'static')
+        dest_dir (str): Path to the destination directory (e.g., 'docs')
+        manifest (BuildManifest): Optional build manifest that remembers which
+            files were synced last time, so deleted sources can be cleaned up
+        compressor (Precompressor): Optional precompressor for .gz copies of text assets
+        fingerprint (bool): Publish assets under fingerprinted names, see
+            static_sync.sync_static_fingerprinted
+            
+    Returns:
+        StaticSyncResult: What was synced, see static_sync.sync_static. For a
+            fingerprinted sync, its assets map holds the published names.
+    """
+    previous_files = manifest.static_files if manifest is not None else ()
+    if fingerprint:
+        previous_assets = AssetMap(manifest.asset_files) if manifest is not None else None
+        result = sync_static_fingerprinted(source_dir, dest_dir, previous_files, previous_assets, compressor)
+    else:
+        result = sync_static(source_dir, dest_dir, previous_files, compressor)
+    if manifest is not None:
+        manifest.static_files = result.files
+        manifest.asset_files = result.assets.files if fingerprint else {}
+    
+    print(f"Static files copied: {result.copied}, unchanged: {result.unchanged}, removed: {result.removed}")
+    return result
+
+def build_site(context, staged=True):
+    """
+    Build the whole site from content/, static/ and template.html into docs/.
+    
+    By default the site is built in a staging copy of docs/ that replaces it
+    only once every page has been generated, so docs/ never holds a partial
+    build, and a failed build leaves it exactly as it was.
+    
+    Args:
+        context (BuildContext): The build's options. Its manifest, asset map,
+            writer and template are filled in for this build. Its render
+            cache, if any, is pruned back to its size limit at the end.
+        staged (bool): Build in a staging directory and swap it into place.
+            When False, docs/ is updated in place.
+    """
+    timer = context.timer
+    compressor = context.compressor
+    cache = context.cache
+    
+    output = StagedOutput(DEST_DIR) if staged else None
+    build_dir = DEST_DIR
+    if output is not None:
+        with timer.build_phase("stage"):
+            build_dir = output.prepare()
+    
+    # Load the manifest of the previous build so unchanged pages can be skipped
+    manifest = BuildManifest.load(MANIFEST_PATH, build_dir)
+    gzip_settings = compressor.settings() if compressor is not None else None
+    if compressor is not None and manifest.gzip_settings != gzip_settings:
+        # A different level or minimum saving: the existing .gz copies of
+        # unchanged outputs are redone, or dropped if they now save too little
+        compressor.recompress_unchanged = True
+    elif compressor is not None:
+        # Unchanged outputs that saved too little last time are not retried
+        compressor.previous_outcomes = manifest.gzip_outcomes()
+    
+    # Sync static files into the destination directory, keeping pages from the last build
+    with timer.build_phase("static"):
+        static_result = copy_static_to_public(STATIC_DIR, build_dir, manifest, compressor, context.fingerprint)
+    
+    # Generate all pages recursively from content directory
+    writer = OutputWriter(compressor)
+    context.manifest = manifest
+    context.writer = writer
+    context.assets = static_result.assets
+    # The template is compiled for this build's asset map
+    context.template = None
+    succeeded = False
+    try:
+        generate_pages_recursive(CONTENT_DIR, build_dir, context)
+        
+        # Drop pages whose markdown source has been deleted
+        manifest.remove_stale()
+        
+        if compressor is not None:
+            with timer.build_phase("precompress"):
+                compressor.wait()
+            compressor.recompress_unchanged = False
+        # Every compressible output went through the compressor, so its
+        # outcomes replace the last build's
+        manifest.gzip_outputs = {}
+        if compressor is not None:
+            manifest.record_gzip_outcomes(compressor.take_outcomes())
+        manifest.gzip_settings = gzip_settings
+        
+        with timer.build_phase("deploy_manifest"):
+            write_deploy_manifest(build_dir, manifest, writer, static_result)
+        
+        if output is not None:
+            with timer.build_phase("swap"):
+                output.commit()
+        succeeded = True
+    finally:
+        # An in-place build saves the manifest even if some pages failed, so
+        # the ones that did build are not redone. A failed staged build is
+        # thrown away, so its manifest must be too; the render cache still
+        # saves the pages that did build from being parsed again.
+        if succeeded or output is None:
+            manifest.save()
+        if cache is not None:
+            cache.prune()
+    print(f"Pages rebuilt: {manifest.rebuilt}, skipped (unchanged): {manifest.skipped}")
+    print(f"Pages written: {writer.written}, identical output kept: {writer.unchanged}")
+    if context.minifier is not None:
+        # Bodies taken from the render cache count the saving stored with them
+        print(f"Minified pages generated in this build: {context.minifier.bytes_saved} bytes saved")
+    if compressor is not None:
+        print(f"Gzip copies written or checked: {compressor.compressed}, kept (source unchanged): "
+              f"{compressor.unchanged}, skipped (too little saving): {compressor.skipped}, "
+              f"bytes saved: {compressor.bytes_saved}")
+    if cache is not None:
+        print(f"Render cache hits: {cache.hits}, misses: {cache.misses}, evicted: {cache.evicted}")
+
+def write_deploy_manifest(output_dir, manifest, writer, static_result=None):
+    """
+    Write the deploy manifest listing every page and static file of the build.
+    
+    Pages, static files and .gz copies handled in this build are hashed from
+    the bytes the build already had in memory; the rest reuse the previous
+    manifest's hashes (see deploy_manifest.build_deploy_manifest).
+    
+    Args:
+        output_dir (str): The directory the site was built into
+        manifest (BuildManifest): The build manifest listing pages and static files
+        writer (OutputWriter): The writer the pages went through
+        static_result (StaticSyncResult): The result of the static sync, or
+            None after a watch rebuild, which syncs single files; changed
+            static files are then hashed from disk
+        
+    Returns:
+        DeployManifest: The manifest that was written
+    """
+    path = os.path.join(output_dir, DEPLOY_MANIFEST_NAME)
+    
+    known_hashes = {
+        os.path.relpath(dest_path, output_dir): hashes
+        for dest_path, hashes in writer.hashes.items()
+    }
+    if static_result is not None:
+        known_hashes.update(static_result.hashes)
+    if writer.compressor is not None:
+        known_hashes.update(
+            (os.path.relpath(gz_path, output_dir), hashes)
+            for gz_path, hashes in writer.compressor.hashes.items()
+        )
+    outputs = [entry["output"] for entry in manifest.entries.values()]
+    outputs.extend(manifest.static_files)
+    # Precompressed copies are listed when they exist
+    outputs.extend([output + ".gz" for output in outputs])
+    
+    deploy = build_deploy_manifest(output_dir, outputs, known_hashes, DeployManifest.load(path))
+    OutputWriter().write(path, deploy.to_json())
+    print(f"Deploy manifest written to {path}: {len(deploy.files)} files")
+    return deploy
@@ -0,0 +1,121 @@
+import json
+import os
+
+from build_manifest import hash_file
+
+# Written inside the output directory, next to the files it lists
+DEPLOY_MANIFEST_NAME = ".deploy-manifest.json"
+
+class DeployManifest():
+    """
+    List of every file a build produced, with its size and SHA-256.
+
+    Paths are relative to the output directory and always use '/', so two
+    manifests can be compared (see diff_manifests) to upload only the files
+    that changed. Each entry also keeps the file's mtime, which lets the next
+    build reuse the hash of a file it did not touch without reading it.
+    """
+
+    def __init__(self, files=None):
+        self.files = files if files is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a deploy manifest, starting empty if it is missing or unreadable.
+
+        Args:
+            path (str): Path to the manifest JSON file
+
+        Returns:
+            DeployManifest: The loaded manifest
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable deploy manifest {path}: {e}")
+            return cls()
+
+        if not isinstance(data, dict) or not isinstance(data.get("files"), dict):
+            return cls()
+        return cls(data["files"])
+
+    def add(self, relative_path, size, sha256, mtime_ns):
+        """Record one output file."""
+        self.files[relative_path] = {"size": size, "sha256": sha256, "mtime_ns": mtime_ns}
+
+    def to_json(self):
+        """Return the manifest as JSON bytes, with paths sorted."""
+        data = {"files": self.files}
+        return json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+
+def build_deploy_manifest(output_dir, relative_paths, known_hashes, previous=None):
+    """
+    Describe the given output files without re-reading the ones already hashed.
+
+    A file's hash comes from known_hashes when the build had its bytes in
+    memory. Otherwise it is carried over from the previous manifest, as long
+    as the file's size and mtime still match the recorded ones. Only files
+    that are neither known nor verifiably unchanged are read and hashed.
+
+    Args:
+        output_dir (str): The directory the files were written to
+        relative_paths (iterable): Output files, relative to output_dir
+        known_hashes (dict): Maps relative paths to (size, sha256) computed
+            while the files were written
+        previous (DeployManifest): The manifest of the previous build, if any
+
+    Returns:
+        DeployManifest: A manifest of the files that exist
+    """
+    previous_files = previous.files if previous is not None else {}
+    manifest = DeployManifest()
+
+    for relative_path in sorted(relative_paths):
+        path = os.path.join(output_dir, relative_path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        key = relative_path.replace(os.sep, '/')
+
+        known = known_hashes.get(relative_path)
+        old = previous_files.get(key)
+        if known is not None:
+            size, sha256 = known
+        elif old is not None and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            size, sha256 = old["size"], old["sha256"]
+        else:
+            size, sha256 = stat.st_size, hash_file(path)
+
+        manifest.add(key, size, sha256, stat.st_mtime_ns)
+
+    return manifest
+
+def diff_manifests(old, new):
+    """
+    Compare two deploy manifests.
+
+    Files are compared by size and hash; a different mtime alone does not
+    count as a change.
+
+    Args:
+        old (DeployManifest): The manifest of the deployed build
+        new (DeployManifest): The manifest of the new build
+
+    Returns:
+        tuple: (added, changed, removed) sorted lists of relative paths
+    """
+    added = []
+    changed = []
+    for path, entry in new.files.items():
+        old_entry = old.files.get(path)
+        if old_entry is None:
+            added.append(path)
+        elif (old_entry.get("size"), old_entry.get("sha256")) != (entry.get("size"), entry.get("sha256")):
+            changed.append(path)
+    removed = [path for path in old.files if path not in new.files]
+    return sorted(added), sorted(changed), sorted(removed)
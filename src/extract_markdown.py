@@ -1,5 +1,26 @@
 import re
 
+# Regex pattern for markdown images: ![alt text](url)
+# !\[([^\[\]]*)\]\(([^\(\)]*)\)
+# !           - literal exclamation mark
+# \[          - literal opening bracket
+# ([^\[\]]*)  - capture group 1: any characters except [ and ] (alt text)
+# \]          - literal closing bracket
+# \(          - literal opening parenthesis
+# ([^\(\)]*)  - capture group 2: any characters except ( and ) (URL)
+# \)          - literal closing parenthesis
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+# Regex pattern for markdown links (but not images): [text](url)
+# (?<!\!)     - negative lookbehind: not preceded by !
+# \[          - literal opening bracket
+# ([^\[\]]*)  - capture group 1: any characters except [ and ] (anchor text)
+# \]          - literal closing bracket
+# \(          - literal opening parenthesis
+# ([^\(\)]*)  - capture group 2: any characters except ( and ) (URL)
+# \)          - literal closing parenthesis
+LINK_PATTERN = re.compile(r"(?<!\!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 def extract_markdown_images(text):
     """
     Extract markdown images from text and return a list of tuples.
@@ -15,18 +36,7 @@ def extract_markdown_images(text):
         extract_markdown_images(text)
         # Returns: [("rick roll", "https://i.imgur.com/aKaOqIh.gif")]
     """
-    # Regex pattern for markdown images: ![alt text](url)
-    # !\[([^\[\]]*)\]\(([^\(\)]*)\)
-    # !           - literal exclamation mark
-    # \[          - literal opening bracket
-    # ([^\[\]]*)  - capture group 1: any characters except [ and ] (alt text)
-    # \]          - literal closing bracket
-    # \(          - literal opening parenthesis
-    # ([^\(\)]*)  - capture group 2: any characters except ( and ) (URL)
-    # \)          - literal closing parenthesis
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
     """
@@ -43,14 +53,4 @@ def extract_markdown_links(text):
         extract_markdown_links(text)
         # Returns: [("to boot dev", "https://www.boot.dev")]
     """
-    # Regex pattern for markdown links (but not images): [text](url)
-    # (?<!\!)     - negative lookbehind: not preceded by !
-    # \[          - literal opening bracket
-    # ([^\[\]]*)  - capture group 1: any characters except [ and ] (anchor text)
-    # \]          - literal closing bracket
-    # \(          - literal opening parenthesis
-    # ([^\(\)]*)  - capture group 2: any characters except ( and ) (URL)
-    # \)          - literal closing parenthesis
-    pattern = r"(?<!\!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
@@ -0,0 +1,156 @@
+import re
+
+# The line that opens and closes a front matter block
+FENCE = "---"
+
+# read_metadata reads the header through a buffer of this size, so a typical
+# header costs a single read
+HEADER_READ_SIZE = 4096
+
+# A header larger than this is an error rather than a reason to read on
+MAX_FRONT_MATTER_BYTES = 64 * 1024
+
+# A UTF-8 byte order mark, which may come before the opening fence
+_BOM = "\ufeff"
+
+# 'key: value', where the key has no leading whitespace
+_KEY_PATTERN = re.compile(r"([^\s:#-][^:]*):(?:\s+(.*))?$")
+
+def split_front_matter(text):
+    """
+    Split a content file into its front matter and its markdown body.
+
+    Front matter is an optional block at the very start of a file between two
+    '---' lines, e.g.:
+
+        ---
+        title: Why Glorfindel is More Impressive than Legolas
+        date: 2024-03-01
+        tags: [tolkien, elves]
+        ---
+
+    An opening '---' with no closing one is not front matter: the page is
+    all body, as before front matter was supported, e.g. a page that starts
+    with a '---' rule.
+
+    Args:
+        text (str): Contents of a content file
+
+    Returns:
+        tuple: (metadata, body), where metadata is the parsed front matter
+            (empty if there is none) and body the markdown after it
+
+    Raises:
+        ValueError: If a line of the front matter is invalid
+    """
+    start = 1 if text.startswith(_BOM) else 0
+    end = text.find("\n", start)
+    if end == -1 or text[start:end].rstrip() != FENCE:
+        return {}, text
+
+    header_start = end + 1
+    position = header_start
+    while position < len(text):
+        end = text.find("\n", position)
+        if end == -1:
+            end = len(text)
+        if text[position:end].rstrip() == FENCE:
+            return parse_front_matter(text[header_start:position]), text[end + 1:]
+        position = end + 1
+    # Never closed, so the fence is part of the markdown
+    return {}, text
+
+def parse_front_matter(text):
+    """
+    Parse the lines between the front matter fences.
+
+    A small YAML-like subset: one 'key: value' per line, a value in single or
+    double quotes for text with special characters, '[a, b]' or following
+    '- item' lines for a list, and '#' for a comment line. Values stay
+    strings; a date such as 2024-03-01 is not converted.
+
+    Args:
+        text (str): The front matter, without its fences
+
+    Returns:
+        dict: The metadata, in the order the keys appear
+
+    Raises:
+        ValueError: If a line is neither a key, a list item nor a comment
+    """
+    metadata = {}
+    # The key whose value is empty, so '- item' lines can follow it
+    list_key = None
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if stripped.startswith("- ") or stripped == "-":
+            if list_key is None:
+                raise ValueError(f"Front matter line {number} is a list item without a key: {line!r}")
+            if metadata[list_key] == "":
+                metadata[list_key] = []
+            metadata[list_key].append(_parse_scalar(stripped[1:]))
+            continue
+
+        match = _KEY_PATTERN.match(line.rstrip())
+        if match is None:
+            raise ValueError(f"Invalid front matter line {number}: {line!r}")
+        key = match.group(1).strip()
+        metadata[key] = _parse_value(match.group(2) or "")
+        list_key = key if metadata[key] == "" else None
+    return metadata
+
+def read_metadata(path):
+    """
+    Read only the front matter of a content file.
+
+    The file is read line by line through a HEADER_READ_SIZE buffer and
+    closed at the closing fence, so the body is never read or parsed. A
+    file without front matter costs one read of its first bytes.
+
+    Args:
+        path (str): Path of the content file
+
+    Returns:
+        dict: The metadata, as for split_front_matter, so empty if the
+            opening fence is never closed
+
+    Raises:
+        ValueError: If the front matter is not closed within
+            MAX_FRONT_MATTER_BYTES, or a line is invalid
+    """
+    with open(path, "rb", buffering=HEADER_READ_SIZE) as f:
+        first = f.readline(MAX_FRONT_MATTER_BYTES).decode("utf-8").removeprefix(_BOM)
+        if first.rstrip() != FENCE or not first.endswith("\n"):
+            return {}
+
+        lines = []
+        size = len(first)
+        while size < MAX_FRONT_MATTER_BYTES:
+            line = f.readline(MAX_FRONT_MATTER_BYTES)
+            if not line:
+                return {}
+            if line.rstrip() == FENCE.encode():
+                return parse_front_matter(b"".join(lines).decode("utf-8"))
+            lines.append(line)
+            size += len(line)
+    raise ValueError(f"Front matter in {path} is larger than {MAX_FRONT_MATTER_BYTES} bytes")
+
+def _parse_value(raw):
+    """Parse the text after 'key:' into a string or a list of strings."""
+    raw = raw.strip()
+    if raw.startswith("[") and raw.endswith("]"):
+        items = raw[1:-1].strip()
+        if not items:
+            return []
+        return [_parse_scalar(item) for item in items.split(",")]
+    return _parse_scalar(raw)
+
+def _parse_scalar(raw):
+    """Strip whitespace, then the quotes around a quoted value."""
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "\"'":
+        return raw[1:-1]
+    return raw
@@ -0,0 +1,414 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from front_matter import split_front_matter
+from markdown_to_html_node import DocumentOutline, markdown_to_html, markdown_to_html_node
+from build_manifest import hash_bytes
+from url_rewrite import basepath_rewriter, rewrite_node_urls
+from html_minify import HTMLMinifier
+from build_profiler import NULL_PROFILER
+
+
+def generate_page(from_path, dest_path, context):
+    """
+    Generate an HTML page from markdown using a template.
+    
+    A page is built in two stages: the content stage (render_content) parses
+    the markdown into the page title and body, and the wrap stage (wrap_page)
+    puts them into the template. Only the content stage is expensive, and its
+    result is cached by markdown hash, so when only the template changed each
+    page just goes through the wrap stage again.
+    
+    Args:
+        from_path (str): Path to the markdown file
+        dest_path (str): Path where the generated HTML should be written
+        context (BuildContext): The build's template, basepath and options.
+            With a manifest, the page is skipped if its inputs match the
+            recorded ones. With a render cache, the page's title and body are
+            taken from it when the same markdown was rendered before. An
+            identical page is never rewritten.
+    """
+    timer = context.timer
+    timer.start_page(from_path, dest_path)
+    manifest = context.manifest
+    cache = context.cache
+    minifier = context.minifier
+    
+    # Read the markdown file
+    with timer.phase("read"):
+        with open(from_path, 'rb') as f:
+            markdown_bytes = f.read()
+    
+    with timer.phase("manifest"):
+        hashes = _check_manifest(context, from_path, dest_path, markdown_bytes)
+    if hashes is None:
+        context.writer.keep(dest_path)
+        timer.finish_page(len(markdown_bytes))
+        return
+    
+    print(f"Generating page from {from_path} to {dest_path} using {context.template_path}")
+    
+    template = context.load_template()
+    
+    content = None
+    if cache is not None:
+        with timer.phase("cache"):
+            cache_key = cache.key(hashes[0] or hash_bytes(markdown_bytes), context.basepath,
+                                  context.assets is not None, context.minify)
+            content = cache.get(cache_key, context.assets)
+        if content is not None and minifier is not None:
+            minifier.bytes_saved += content[3]
+    
+    if content is None:
+        saved_before = minifier.bytes_saved if minifier is not None else 0
+        content = render_content(decode_text(markdown_bytes), context.profiler, context.assets, minifier,
+                                 context.basepath, from_path)
+        if cache is not None:
+            with timer.phase("cache"):
+                bytes_saved = minifier.bytes_saved - saved_before if minifier is not None else 0
+                cache.put(cache_key, *content, bytes_saved=bytes_saved)
+    
+    final_html = wrap_page(content[0], content[1], template, context.profiler)
+    if minifier is not None:
+        minifier.bytes_saved += template.bytes_saved
+    with timer.phase("write"):
+        context.writer.write(dest_path, final_html.encode('utf-8'))
+    
+    if manifest is not None:
+        manifest.record(from_path, dest_path, hashes[0], hashes[1], context.basepath,
+                        _asset_references(template, content, context.assets), context.minify)
+    
+    timer.finish_page(len(markdown_bytes), final_html)
+    print(f"Page generated at {dest_path}")
+
+def render_content(markdown_content, profiler=None, assets=None, minifier=None, basepath="/", source_path=None):
+    """
+    Render a markdown document into its title and inner HTML.
+    
+    This is the expensive part of building a page, and what the render cache
+    stores. It depends on nothing but the markdown and the render options:
+    the basepath, the asset map when assets are fingerprinted, and minifying.
+    
+    Links and images are pointed at the basepath on the node tree, so only
+    real href/src props are changed, never text such as code samples. A
+    plain build, with no asset map or minifier, skips the tree and writes
+    the HTML directly with markdown_to_html, profiled or not, so a profile
+    times the pipeline the build really runs.
+    
+    Front matter is split off first and not rendered. The title is its
+    'title' if it has one, otherwise the first h1 heading block, recorded
+    by the same parse. Only a page with neither is scanned again by
+    extract_title, which also accepts a '#Title' line without the space.
+    
+    Args:
+        markdown_content (str): The markdown document, with optional front matter
+        profiler (BuildProfiler): Optional profiler that times each step
+        assets (AssetMap): Optional map of fingerprinted static files. The
+            src of images and href of links are rewritten in the node tree.
+        minifier (HTMLMinifier): Optional minifier the body is written with
+        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+        source_path (str): Path of the markdown file, for error messages
+        
+    Returns:
+        tuple: (page_title, html_content, asset_references), where
+            asset_references maps the page's root-relative URLs to their
+            fingerprinted URL or None (empty without an asset map)
+        
+    Raises:
+        ValueError: If the markdown or its front matter is invalid, the
+            front matter title is not a single line of text, or the page
+            has no title
+    """
+    timer = profiler or NULL_PROFILER
+    metadata, markdown_content = split_front_matter(markdown_content)
+    rewrite = basepath_rewriter(basepath)
+    outline = DocumentOutline()
+    asset_references = {}
+    
+    if assets is None and minifier is None:
+        # Nothing needs the node tree
+        html_content = markdown_to_html(markdown_content, rewrite, outline, profiler)
+    else:
+        # Convert markdown to HTML
+        html_node = markdown_to_html_node(markdown_content, profiler, outline)
+        with timer.phase("to_html"):
+            if assets is not None:
+                asset_references = assets.rewrite_node(html_node)
+            if rewrite is not None:
+                rewrite_node_urls(html_node, rewrite)
+            html_content = html_node.to_html(minifier)
+    
+    # The title was found while parsing, unless the page has no h1 block
+    with timer.phase("extract_title"):
+        page_title = _front_matter_title(metadata, source_path) or outline.title
+        if page_title is None:
+            page_title = extract_title(markdown_content)
+    
+    return page_title, html_content, asset_references
+
+def _front_matter_title(metadata, source_path):
+    """Return the 'title' of a page's front matter, or None if it has none."""
+    title = metadata.get("title")
+    if title is None:
+        return None
+    if not isinstance(title, str) or not title:
+        raise ValueError(f"Front matter title of {source_path or 'the page'} must be a non-empty "
+                         f"string, not {title!r}")
+    return title
+
+def wrap_page(page_title, html_content, template, profiler=None):
+    """
+    Place a rendered page body into the page template.
+    
+    Args:
+        page_title (str): The page title
+        html_content (str): The page's inner HTML, rendered for the template's basepath
+        template (Template): The page template, compiled for the site basepath
+        profiler (BuildProfiler): Optional profiler that times each step
+        
+    Returns:
+        str: The final HTML page
+    """
+    timer = profiler or NULL_PROFILER
+    
+    # Both the template's links and the body's already point at the basepath
+    with timer.phase("template"):
+        return template.render(Title=page_title, Content=html_content)
+
+def _check_manifest(context, from_path, dest_path, markdown_bytes):
+    """
+    Consult the build manifest for a page.
+    
+    Returns:
+        tuple: (content_hash, template_hash) to record once the page is built,
+            or None if the page is up to date and should be skipped
+    """
+    manifest = context.manifest
+    if manifest is None:
+        return (None, None)
+    
+    content_hash = hash_bytes(markdown_bytes)
+    template_hash = manifest.template_hash(context.template_path)
+    if manifest.is_up_to_date(from_path, dest_path, content_hash, template_hash, context.basepath, context.assets,
+                              context.minify):
+        print(f"Skipping unchanged page {from_path}")
+        manifest.skip(from_path)
+        return None
+    return (content_hash, template_hash)
+
+def _asset_references(template, content, assets):
+    """Return the asset URLs a page and its template refer to, for the manifest."""
+    if assets is None:
+        return None
+    return {**template.asset_references, **content[2]}
+
+def decode_text(data):
+    """
+    Decode UTF-8 file contents the way open(..., 'r') would.
+    
+    Pages are read as bytes so they can be hashed, so universal newline
+    translation has to be applied by hand to keep the output unchanged.
+    
+    Args:
+        data (bytes): Raw file contents
+        
+    Returns:
+        str: Decoded text with '\r\n' and '\r' normalised to '\n'
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def collect_pages(dir_path_content, dest_dir_path):
+    """
+    Recursively collect the markdown files to build and their destinations.
+    
+    Args:
+        dir_path_content (str): Path to the content directory containing markdown files
+        dest_dir_path (str): Path to the destination directory for generated HTML files
+        
+    Returns:
+        list: (markdown_path, html_dest_path) tuples, in directory walk order
+    """
+    pages = []
+    
+    # Get all items in the content directory
+    for item in os.listdir(dir_path_content):
+        content_item_path = os.path.join(dir_path_content, item)
+        dest_item_path = os.path.join(dest_dir_path, item)
+        
+        if os.path.isfile(content_item_path):
+            # If it's a markdown file, it becomes an HTML page
+            if content_item_path.endswith('.md'):
+                # Convert .md extension to .html for destination
+                html_dest_path = dest_item_path.replace('.md', '.html')
+                pages.append((content_item_path, html_dest_path))
+        elif os.path.isdir(content_item_path):
+            # If it's a directory, the pages keep the same structure in dest
+            pages.extend(collect_pages(content_item_path, dest_item_path))
+    
+    return pages
+
+def generate_pages_recursive(dir_path_content, dest_dir_path, context):
+    """
+    Recursively generate HTML pages from markdown files in a directory structure.
+    
+    Crawls every entry in the content directory and generates HTML files for each
+    markdown file found, maintaining the same directory structure in the destination.
+    
+    Args:
+        dir_path_content (str): Path to the content directory containing markdown files
+        dest_dir_path (str): Path to the destination directory for generated HTML files
+        context (BuildContext): The build's template, basepath and options. With
+            more than one job the pages are rendered by generate_pages_parallel,
+            unless the build is profiled.
+    """
+    timer = context.timer
+    
+    # Ensure the destination directory exists
+    if not os.path.exists(dest_dir_path):
+        os.makedirs(dest_dir_path)
+    
+    with timer.build_phase("walk"):
+        pages = collect_pages(dir_path_content, dest_dir_path)
+    
+    # Compile the template once for the whole build
+    with timer.build_phase("load_template"):
+        context.load_template()
+    
+    if context.jobs > 1 and len(pages) > 1 and context.profiler is None:
+        generate_pages_parallel(pages, context)
+        return
+    
+    for from_path, dest_path in pages:
+        generate_page(from_path, dest_path, context)
+
+def generate_pages_parallel(pages, context):
+    """
+    Generate pages using a pool of worker processes.
+    
+    The markdown files are read and checked against the manifest and the
+    render cache here. Only the parse step (render_content) of cache misses
+    runs in the workers, in chunks. The bodies are wrapped in the template
+    and written by this process, so the output is identical to a serial build.
+    
+    Args:
+        pages (list): (markdown_path, html_dest_path) tuples from collect_pages
+        context (BuildContext): The build's template, basepath and options.
+            Its jobs sets the number of worker processes. The asset map is
+            sent to the workers with each chunk of pages, and with a minifier
+            the workers minify with their own and report the bytes they saved.
+        
+    Raises:
+        RuntimeError: If any page failed to render. Every failure is reported
+            and all other pages are still written.
+    """
+    jobs = context.jobs or os.cpu_count() or 1
+    manifest = context.manifest
+    cache = context.cache
+    assets = context.assets
+    minifier = context.minifier
+    minify = context.minify
+    template = context.load_template()
+    
+    def finish(from_path, dest_path, hashes, content):
+        context.writer.write(dest_path, wrap_page(content[0], content[1], template).encode('utf-8'))
+        if minify:
+            minifier.bytes_saved += template.bytes_saved
+        if manifest is not None:
+            manifest.record(from_path, dest_path, hashes[0], hashes[1], context.basepath,
+                            _asset_references(template, content, assets), minify)
+        print(f"Page generated at {dest_path}")
+    
+    # Work out which pages actually need rendering. Cached pages only need
+    # wrapping, which is cheap enough to do here.
+    pending = []
+    for from_path, dest_path in pages:
+        with open(from_path, 'rb') as f:
+            markdown_bytes = f.read()
+        hashes = _check_manifest(context, from_path, dest_path, markdown_bytes)
+        if hashes is None:
+            context.writer.keep(dest_path)
+            continue
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(hashes[0] or hash_bytes(markdown_bytes), context.basepath, assets is not None,
+                                  minify)
+            content = cache.get(cache_key, assets)
+            if content is not None:
+                if minify:
+                    minifier.bytes_saved += content[3]
+                finish(from_path, dest_path, hashes, content)
+                continue
+        pending.append((from_path, dest_path, decode_text(markdown_bytes), hashes, cache_key))
+    
+    if not pending:
+        return
+    
+    print(f"Rendering {len(pending)} pages with {jobs} worker processes")
+    chunksize = max(1, len(pending) // (jobs * 4))
+    failures = []
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        markdown_contents = (markdown_content for _, _, markdown_content, _, _ in pending)
+        source_paths = (from_path for from_path, _, _, _, _ in pending)
+        worker = partial(_render_worker, assets=assets, minify=minify, basepath=context.basepath)
+        results = executor.map(worker, markdown_contents, source_paths, chunksize=chunksize)
+        
+        for (from_path, dest_path, _, hashes, cache_key), (content, error, bytes_saved) in zip(pending, results):
+            if minify:
+                minifier.bytes_saved += bytes_saved
+            if error is not None:
+                print(f"Error generating page from {from_path}: {error}")
+                failures.append(from_path)
+                continue
+            if cache is not None:
+                cache.put(cache_key, *content, bytes_saved=bytes_saved)
+            finish(from_path, dest_path, hashes, content)
+    
+    if failures:
+        raise RuntimeError(f"{len(failures)} page(s) failed to build: {', '.join(failures)}")
+
+def _render_worker(markdown_content, source_path=None, assets=None, minify=False, basepath="/"):
+    """Render one page body in a worker, returning (render_content result, error_message, bytes_saved)."""
+    minifier = HTMLMinifier() if minify else None
+    try:
+        content = render_content(markdown_content, assets=assets, minifier=minifier, basepath=basepath,
+                                 source_path=source_path)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", 0
+    return content, None, minifier.bytes_saved if minify else 0
+
+def extract_title(markdown):
+    """
+    Extract the h1 header from a markdown string.
+    
+    Args:
+        markdown (str): The markdown content to extract title from
+        
+    Returns:
+        str: The title text without the # and stripped of whitespace
+        
+    Raises:
+        ValueError: If no h1 header is found
+    """
+    lines = markdown.split('\n')
+    
+    for line in lines:
+        # Check if line starts with a single # (h1 header)
+        if line.startswith('# '):
+            # Remove the '# ' and strip whitespace
+            title = line[2:].strip()
+            if title:  # Make sure there's actual content after the #
+                return title
+        # Also handle the case where there's just '#' with no space
+        elif line.startswith('#') and not line.startswith('##'):
+            # Remove the '#' and strip whitespace
+            title = line[1:].strip()
+            if title:  # Make sure there's actual content after the #
+                return title
+    
+    # If no h1 header found, raise an exception
+    raise ValueError("No h1 header found in markdown content")
@@ -0,0 +1,145 @@
+import re
+
+# Elements whose text is shown or run exactly as written
+PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "code", "textarea", "script", "style"))
+
+# Elements that never sit in a line of text, so whitespace next to their tags
+# is never rendered
+BLOCK_TAGS = frozenset((
+    "!doctype", "html", "head", "body", "title", "meta", "link", "script", "style", "base",
+    "article", "section", "nav", "header", "footer", "main", "aside", "div", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd", "blockquote", "pre",
+    "table", "thead", "tbody", "tfoot", "tr", "td", "th", "hr", "br", "figure", "figcaption", "form",
+))
+
+# HTML's whitespace characters; \s would also match a non-breaking space
+_WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+
+# An attribute value that is still valid without its quotes
+_UNQUOTED_VALUE_PATTERN = re.compile(r"[^ \t\n\r\f\"'=<>`]+")
+
+# A tag or comment, or a whole element whose contents must be kept as they are
+_MARKUP_PATTERN = re.compile(
+    r"<(pre|textarea|script|style)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# The name of a tag, e.g. 'p' in '</p>' or '!doctype' in '<!doctype html>'
+_TAG_NAME_PATTERN = re.compile(r"</?\s*([^\s/>]+)")
+
+# A double-quoted attribute inside a tag, and the character after the quote
+_QUOTED_ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)="([^"]*)"(?=(.?))', re.DOTALL)
+
+class HTMLMinifier():
+    """
+    Drops whitespace and attribute quotes that make no difference to a page.
+
+    Runs of whitespace in text are collapsed to a single space, except inside
+    the elements in PRESERVE_WHITESPACE_TAGS, and attribute values that do not
+    need quotes lose them. Node trees are minified while they are written
+    (see HTMLNode.write_html), where it is known which text is inside a
+    pre or code element; raw HTML such as the page template goes through
+    minify_document.
+
+    Attributes:
+        bytes_saved (int): Bytes removed so far
+    """
+
+    def __init__(self):
+        self.bytes_saved = 0
+
+    def text(self, value):
+        """Collapse the whitespace runs in a text value."""
+        collapsed = _WHITESPACE_PATTERN.sub(" ", value)
+        self.bytes_saved += len(value) - len(collapsed)
+        return collapsed
+
+    def attributes(self, props):
+        """Return props as attribute text, quoting only the values that need it."""
+        parts = []
+        for key, value in props.items():
+            if _UNQUOTED_VALUE_PATTERN.fullmatch(str(value)):
+                parts.append(f"{key}={value}")
+                self.bytes_saved += 2
+            else:
+                parts.append(f'{key}="{value}"')
+        return " ".join(parts)
+
+    def minify_document(self, html):
+        """
+        Collapse the whitespace of a raw HTML document.
+
+        Whitespace between two tags is removed if either of them is a block
+        element and collapsed to one space otherwise. Comments and preserved
+        elements are kept exactly. Attribute quotes are left to
+        unquote_attributes, so links can still be rewritten in between.
+
+        Args:
+            html (str): The HTML text
+
+        Returns:
+            str: The minified HTML
+        """
+        parts = []
+        previous_tag = None
+        position = 0
+        for match in _MARKUP_PATTERN.finditer(html):
+            self._append_text(parts, html[position:match.start()], previous_tag, _tag_name(match.group(0)))
+            parts.append(match.group(0))
+            previous_tag = _tag_name(match.group(0))
+            position = match.end()
+        self._append_text(parts, html[position:], previous_tag, None)
+        return "".join(parts)
+
+    def unquote_attributes(self, html):
+        """
+        Remove the quotes around attribute values in raw HTML that do not need them.
+
+        Args:
+            html (str): The HTML text
+
+        Returns:
+            str: The HTML with unquoted attributes where possible
+        """
+        def unquote_tag(match):
+            tag = match.group(0)
+            if tag.startswith("<!") or not tag[1:2].isalpha():
+                return tag
+            return _QUOTED_ATTRIBUTE_PATTERN.sub(self._unquote_attribute, tag)
+
+        parts = []
+        position = 0
+        for match in _MARKUP_PATTERN.finditer(html):
+            parts.append(html[position:match.start()])
+            if match.group(1):
+                # A preserved element: only its opening tag has attributes
+                start_tag = re.match(r"<[^>]*>", match.group(0))
+                parts.append(unquote_tag(start_tag) + match.group(0)[start_tag.end():])
+            else:
+                parts.append(unquote_tag(match))
+            position = match.end()
+        parts.append(html[position:])
+        return "".join(parts)
+
+    def _unquote_attribute(self, match):
+        key, value, following = match.groups()
+        # A '/' right after an unquoted value would become part of it
+        if following == "/" or not _UNQUOTED_VALUE_PATTERN.fullmatch(value):
+            return match.group(0)
+        self.bytes_saved += 2
+        return f"{key}={value}"
+
+    def _append_text(self, parts, text, previous_tag, next_tag):
+        if not text:
+            return
+        if not text.strip(" \t\n\r\f") and (previous_tag in BLOCK_TAGS or next_tag in BLOCK_TAGS):
+            self.bytes_saved += len(text)
+            return
+        parts.append(self.text(text))
+
+def _tag_name(markup):
+    """Return the lower-case tag name of a tag, or None for a comment."""
+    if markup.startswith("<!--"):
+        return None
+    match = _TAG_NAME_PATTERN.match(markup)
+    return match.group(1).lower() if match else None
@@ -1,22 +1,52 @@
 class HTMLNode():
+    # Slots instead of a per-instance __dict__ keep large trees, and parallel
+    # build workers holding them, small. Subclasses declare empty __slots__.
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minifier=None):
+        """Render the node to an HTML string by joining the fragments from write_html."""
+        fragments = []
+        self.write_html(fragments, minifier)
+        return ''.join(fragments)
+
+    def write_html(self, out, minifier=None):
+        """
+        Write the node's HTML to out as a series of string fragments.
+
+        Args:
+            out: A list to append the fragments to, or a writer with a
+                write() method such as io.StringIO or a text file
+            minifier (HTMLMinifier): Optional minifier for text and
+                attributes. Nodes inside a pre or code element are written
+                without it, so their whitespace is kept.
+        """
         raise NotImplementedError
 
     def props_to_html(self):
         if not self.props:
             return ''
         return ' '.join(f'{key}="{value}"' for key, value in self.props.items())
-        
 
+    def opening_tag(self, minifier=None):
+        """Return the opening tag with the node's properties, e.g. '<a href="/">'."""
+        if not self.props:
+            return f"<{self.tag}>"
+        if minifier is not None:
+            return f"<{self.tag} {minifier.attributes(self.props)}>"
+        return f"<{self.tag} {self.props_to_html()}>"
 
-    
     def __repr__(self):
         return self.tag
 
-    
+def fragment_writer(out):
+    """Return the function that adds one fragment to out (list.append or write)."""
+    write = getattr(out, "write", None)
+    if write is not None:
+        return write
+    return out.append
@@ -1,26 +1,25 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, fragment_writer
+from html_minify import PRESERVE_WHITESPACE_TAGS
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, value=None, props=None):
         super().__init__(tag=tag, value=value, props=props)
 
-    def to_html(self):
+    def write_html(self, out, minifier=None):
         if self.value is None:
             raise ValueError("All leaf nodes must have a value")
-        if self.tag is None:
-            return self.value
-        
-        # Generate the opening tag with properties
-        opening_tag = f"<{self.tag}"
-
-        if self.props:
-            for key, value in self.props.items():
-                opening_tag += f' {key}="{value}"'
-
-        opening_tag += ">"
 
+        write = fragment_writer(out)
+        value = self.value
+        if minifier is not None and self.tag not in PRESERVE_WHITESPACE_TAGS:
+            value = minifier.text(value)
+        if self.tag is None:
+            write(value)
+            return
 
-        closing_tag = f"</{self.tag}>"
-
-        return f"{opening_tag}{self.value}{closing_tag}"
-
+        # Opening tag with properties, the value, then the closing tag
+        write(self.opening_tag(minifier))
+        write(value)
+        write(f"</{self.tag}>")
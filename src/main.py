@@ -1,192 +1,164 @@
+import argparse
+import cProfile
 import os
-import shutil
 import sys
 
-from markdown_to_html_node import markdown_to_html_node
+from html_minify import HTMLMinifier
+from build_profiler import BuildProfiler
+from render_cache import RenderCache
+from precompress import Precompressor
+from deploy_manifest import DEPLOY_MANIFEST_NAME, DeployManifest, diff_manifests
+from build_context import BuildContext
+from build_site import RENDER_CACHE_DIR, TEMPLATE_PATH, build_site
+from watch_site import watch_site
+# extract_title used to live here; keep it importable from main
+from generate_pages import extract_title
 
-def copy_static_to_public(source_dir, dest_dir):
+def parse_args(argv=None):
     """
-    Recursively copy all contents from source directory to destination directory.
+    Parse the command line.
     
     Args:
-        source_dir (str): Path to the source directory (e.g., 'static')
-        dest_dir (str): Path to the destination directory (e.g., 'docs')
-    """
-    # First, clean the destination directory
-    if os.path.exists(dest_dir):
-        print(f"Deleting existing directory: {dest_dir}")
-        shutil.rmtree(dest_dir)
-    
-    # Create the destination directory
-    print(f"Creating directory: {dest_dir}")
-    os.mkdir(dest_dir)
-    
-    # Copy contents recursively
-    _copy_directory_contents(source_dir, dest_dir)
-
-def _copy_directory_contents(source_dir, dest_dir):
-    """
-    Helper function to recursively copy directory contents.
-    
-    Args:
-        source_dir (str): Source directory path
-        dest_dir (str): Destination directory path
-    """
-    # Check if source directory exists
-    if not os.path.exists(source_dir):
-        print(f"Source directory does not exist: {source_dir}")
-        return
-    
-    # List all items in the source directory
-    items = os.listdir(source_dir)
-    
-    for item in items:
-        source_path = os.path.join(source_dir, item)
-        dest_path = os.path.join(dest_dir, item)
+        argv (list): Arguments to parse, defaults to sys.argv[1:]
         
-        if os.path.isfile(source_path):
-            # Copy file
-            print(f"Copying file: {source_path} -> {dest_path}")
-            shutil.copy(source_path, dest_path)
-        else:
-            # It's a directory, create it and copy contents recursively
-            print(f"Creating directory: {dest_path}")
-            os.mkdir(dest_path)
-            _copy_directory_contents(source_path, dest_path)
-
-def generate_page(from_path, template_path, dest_path, basepath="/"):
-    """
-    Generate an HTML page from markdown using a template.
-    
-    Args:
-        from_path (str): Path to the markdown file
-        template_path (str): Path to the HTML template file
-        dest_path (str): Path where the generated HTML should be written
-        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+    Returns:
+        argparse.Namespace: The parsed options
     """
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    
-    # Read the markdown file
-    with open(from_path, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
-    
-    # Read the template file
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    
-    # Extract title from markdown
-    page_title = extract_title(markdown_content)
-    
-    # Replace placeholders in template
-    final_html = template_content.replace("{{ Title }}", page_title).replace("{{ Content }}", html_content)
-    
-    # Fix paths for GitHub Pages deployment
-    final_html = final_html.replace('href="/', f'href="{basepath}')
-    final_html = final_html.replace('src="/', f'src="{basepath}')
-    
-    # Create destination directory if it doesn't exist
-    dest_dir = os.path.dirname(dest_path)
-    if dest_dir and not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
-    
-    # Write the final HTML to the destination file
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
-    
-    print(f"Page generated at {dest_path}")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    
+    # "watch" is an optional leading command; without it the site is built once
+    command = "build"
+    if argv and argv[0] == "watch":
+        command = argv.pop(0)
+    
+    parser = argparse.ArgumentParser(
+        description="Build the static site into docs/. "
+                    "Run as 'main.py watch [options]' to rebuild on every change.")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help='base path for the site, e.g. "/" or "/repo-name/" (default: "/")')
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes used to render pages (default: CPU count)")
+    parser.add_argument("--profile", nargs="?", const="build-profile.json", metavar="REPORT",
+                        help="time every build phase per page and write a JSON report "
+                             "(default: build-profile.json); implies --jobs 1")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="number of slowest pages listed in the profile report (default: 10)")
+    parser.add_argument("--pstats", metavar="FILE",
+                        help="run the whole build under cProfile and dump the stats to FILE")
+    parser.add_argument("--cache-dir", default=RENDER_CACHE_DIR, metavar="DIR",
+                        help=f"directory of the render cache (default: {RENDER_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=float, default=256, metavar="MB",
+                        help="size the render cache is pruned back to after a build (default: 256)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="render every page without the render cache")
+    parser.add_argument("--in-place", action="store_true",
+                        help="update docs/ directly instead of building in docs.staging/ "
+                             "and swapping it into place")
+    parser.add_argument("--gzip", nargs="?", type=int, const=9, choices=range(1, 10), metavar="LEVEL",
+                        help="also write a .gz copy of every page and text asset, "
+                             "at this compression level (default when given: 9)")
+    parser.add_argument("--gzip-min-saving", type=float, default=0.1, metavar="FRACTION",
+                        help="only keep a .gz copy that is at least this much smaller (default: 0.1)")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="publish stylesheets, scripts, images and fonts under content-hashed "
+                             "names (e.g. index.3f2a9c1b.css) and rewrite the links to them")
+    parser.add_argument("--minify", action="store_true",
+                        help="collapse whitespace outside pre/code and drop unneeded attribute quotes")
+    parser.add_argument("--interval", type=float, default=0.5, metavar="SECONDS",
+                        help="watch mode: seconds between polls for changes (default: 0.5)")
+    args = parser.parse_args(argv)
+    args.command = command
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if command == "watch" and (args.profile or args.pstats):
+        parser.error("--profile and --pstats cannot be used in watch mode")
+    if command == "watch" and (args.fingerprint or args.minify):
+        parser.error("--fingerprint and --minify cannot be used in watch mode")
+    return args
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+def diff_manifest_command(argv):
     """
-    Recursively generate HTML pages from markdown files in a directory structure.
+    Print the files added, changed and removed between two deploy manifests.
     
-    Crawls every entry in the content directory and generates HTML files for each
-    markdown file found, maintaining the same directory structure in the destination.
+    Each line is '+', '~' or '-' followed by the path, so an upload job can
+    read the delta straight from the output.
     
     Args:
-        dir_path_content (str): Path to the content directory containing markdown files
-        template_path (str): Path to the HTML template file
-        dest_dir_path (str): Path to the destination directory for generated HTML files
-        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+        argv (list): The command's arguments: OLD and NEW manifest paths
     """
-    # Ensure the destination directory exists
-    if not os.path.exists(dest_dir_path):
-        os.makedirs(dest_dir_path)
-    
-    # Get all items in the content directory
-    for item in os.listdir(dir_path_content):
-        content_item_path = os.path.join(dir_path_content, item)
-        dest_item_path = os.path.join(dest_dir_path, item)
-        
-        if os.path.isfile(content_item_path):
-            # If it's a markdown file, generate HTML
-            if content_item_path.endswith('.md'):
-                # Convert .md extension to .html for destination
-                html_dest_path = dest_item_path.replace('.md', '.html')
-                generate_page(content_item_path, template_path, html_dest_path, basepath)
-        elif os.path.isdir(content_item_path):
-            # If it's a directory, create the corresponding directory in dest and recurse
-            generate_pages_recursive(content_item_path, template_path, dest_item_path, basepath)
+    parser = argparse.ArgumentParser(
+        prog="main.py diff-manifest",
+        description="List the files that differ between two deploy manifests.")
+    parser.add_argument("old", help=f"manifest of the deployed build, e.g. docs.previous/{DEPLOY_MANIFEST_NAME}")
+    parser.add_argument("new", help=f"manifest of the new build, e.g. docs/{DEPLOY_MANIFEST_NAME}")
+    args = parser.parse_args(argv)
+    
+    added, changed, removed = diff_manifests(DeployManifest.load(args.old), DeployManifest.load(args.new))
+    for marker, paths in (("+", added), ("~", changed), ("-", removed)):
+        for path in paths:
+            print(f"{marker} {path}")
+    print(f"{len(added)} added, {len(changed)} changed, {len(removed)} removed", file=sys.stderr)
 
-def extract_title(markdown):
+def main(argv=None):
     """
-    Extract the h1 header from a markdown string.
+    Main function for the static site generator.
     
     Args:
-        markdown (str): The markdown content to extract title from
-        
-    Returns:
-        str: The title text without the # and stripped of whitespace
-        
-    Raises:
-        ValueError: If no h1 header is found
-    """
-    lines = markdown.split('\n')
-    
-    for line in lines:
-        # Check if line starts with a single # (h1 header)
-        if line.startswith('# '):
-            # Remove the '# ' and strip whitespace
-            title = line[2:].strip()
-            if title:  # Make sure there's actual content after the #
-                return title
-        # Also handle the case where there's just '#' with no space
-        elif line.startswith('#') and not line.startswith('##'):
-            # Remove the '#' and strip whitespace
-            title = line[1:].strip()
-            if title:  # Make sure there's actual content after the #
-                return title
-    
-    # If no h1 header found, raise an exception
-    raise ValueError("No h1 header found in markdown content")
-
-def main():
-    """
-    Main function for the static site generator.
+        argv (list): Command line arguments, defaults to sys.argv[1:]
     """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "diff-manifest":
+        diff_manifest_command(argv[1:])
+        return
+    
     print("Starting static site generator...")
     
-    # Get basepath from command line argument, default to "/"
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    # Get basepath and options from the command line, basepath defaults to "/"
+    args = parse_args(argv)
+    basepath = args.basepath
     
     print(f"Using basepath: {basepath}")
     
-    # Define source and destination directories (relative to project root)
-    static_dir = "static"
-    dest_dir = "docs"  # Changed from "public" to "docs" for GitHub Pages
-    content_dir = "content"
-    template_path = "template.html"
-    
-    # Copy static files to destination directory
-    copy_static_to_public(static_dir, dest_dir)
+    cache = None
+    if not args.no_cache:
+        cache = RenderCache(args.cache_dir, int(args.cache_size * 1024 * 1024))
+    
+    compressor = None
+    if args.gzip is not None:
+        compressor = Precompressor(args.gzip, args.gzip_min_saving)
+    
+    if args.command == "watch":
+        context = BuildContext(TEMPLATE_PATH, basepath, args.jobs, cache=cache, compressor=compressor)
+        try:
+            watch_site(context, args.interval, not args.in_place)
+        finally:
+            if compressor is not None:
+                compressor.close()
+        return
     
-    # Generate all pages recursively from content directory
-    generate_pages_recursive(content_dir, template_path, dest_dir, basepath)
+    profiler = BuildProfiler() if args.profile else None
+    cprofile = cProfile.Profile() if args.pstats else None
+    minifier = HTMLMinifier() if args.minify else None
+    context = BuildContext(TEMPLATE_PATH, basepath, args.jobs, profiler, cache, compressor, args.fingerprint,
+                           minifier)
+    
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        build_site(context, not args.in_place)
+    finally:
+        if compressor is not None:
+            compressor.close()
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.pstats)
+            print(f"cProfile stats written to {args.pstats}")
+    
+    if profiler is not None:
+        report = profiler.write_report(args.profile, args.profile_top)
+        print(f"Profile report written to {args.profile}")
+        for phase, seconds in report["aggregate"]["phases"].items():
+            print(f"  {phase:<20} {seconds * 1000:10.1f} ms")
     
     print("Static site generation complete!")
 
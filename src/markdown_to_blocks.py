@@ -1,9 +1,16 @@
+# Number of characters read from a file object at a time
+CHUNK_SIZE = 64 * 1024
+
+# Opens and closes a fenced code block
+FENCE = '```'
+
 def markdown_to_blocks(markdown):
     """
     Split markdown text into blocks based on blank lines.
     
     Takes a raw markdown string representing a full document and returns
-    a list of block strings. Blocks are separated by blank lines (double newlines).
+    a list of block strings. Blocks are separated by blank lines (double newlines),
+    except inside a fenced code block. See iter_blocks.
     
     Args:
         markdown (str): Raw markdown text to split into blocks
@@ -17,17 +24,88 @@ def markdown_to_blocks(markdown):
         blocks = markdown_to_blocks(markdown)
         # Returns: ["# Heading", "Paragraph text", "- List item"]
     """
-    # Split on double newlines to separate blocks
-    raw_blocks = markdown.split('\n\n')
-    
-    # Process each block: strip whitespace and filter out empty blocks
-    blocks = []
-    for block in raw_blocks:
-        # Strip leading and trailing whitespace from the block
-        stripped_block = block.strip()
+    return list(iter_blocks(markdown))
+
+def iter_blocks(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield the blocks of a markdown document one at a time.
+    
+    The document is scanned line by line, so only the current block is held
+    in memory, never a list of every block. An empty line ends a block,
+    except inside a fenced code block: a block whose first line starts with
+    ``` runs until a line ending with ```, blank lines included. A fence that
+    is never closed runs to the end of the document.
+    
+    Args:
+        source: The markdown, as a string or a text file object that is read
+            chunk_size characters at a time
+        chunk_size (int): Characters to read from a file object per read
+        
+    Yields:
+        str: Each block, with leading/trailing whitespace stripped; empty
+            blocks are skipped
+    """
+    block_lines = []
+    has_content = False
+    in_fence = False
+    
+    for line in iter_lines(source, chunk_size):
+        if in_fence:
+            block_lines.append(line)
+            if line.rstrip().endswith(FENCE):
+                in_fence = False
+            continue
+        
+        if not line:
+            # A blank line ends the current block
+            if has_content:
+                yield '\n'.join(block_lines).strip()
+            block_lines = []
+            has_content = False
+            continue
         
-        # Only add non-empty blocks
-        if stripped_block:
-            blocks.append(stripped_block)
+        block_lines.append(line)
+        stripped = line.strip()
+        if not has_content and stripped:
+            has_content = True
+            # An opening fence, unless it is closed on the same line
+            if stripped.startswith(FENCE):
+                in_fence = not (len(stripped) > 2 * len(FENCE) and stripped.endswith(FENCE))
+    
+    if has_content:
+        yield '\n'.join(block_lines).strip()
+
+def iter_lines(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield the lines of a string or text file object, without their newlines.
+    
+    A string is scanned in place rather than split, and a file object is
+    read in chunks, so neither is ever copied as a whole.
+    
+    Args:
+        source: A string or a text file object
+        chunk_size (int): Characters to read from a file object per read
+        
+    Yields:
+        str: Each line; a trailing newline yields a final empty line
+    """
+    if isinstance(source, str):
+        start = 0
+        while True:
+            end = source.find('\n', start)
+            if end == -1:
+                yield source[start:]
+                return
+            yield source[start:end]
+            start = end + 1
     
-    return blocks
+    pending = ''
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split('\n')
+        # The last piece may continue in the next chunk
+        pending = lines.pop()
+        yield from lines
+    yield pending
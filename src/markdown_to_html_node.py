@@ -1,41 +1,284 @@
+import time
+
 from parentnode import ParentNode
 from leafnode import LeafNode
 from textnode import TextNode, TextType
 from text_node_to_html import text_node_to_html_node
-from text_to_textnodes import text_to_textnodes
-from markdown_to_blocks import markdown_to_blocks
-from block_to_block_type import block_to_block_type, BlockType
+from text_to_textnodes import text_to_textnodes, iter_inline_tokens
+from markdown_to_blocks import iter_blocks
+from htmlnode import fragment_writer
+from block_to_block_type import classify_block, BlockType
+
+class DocumentOutline():
+    """
+    The headings of a markdown document, recorded while its blocks are classified.
+    
+    Pass one to markdown_to_html_node or markdown_to_html to get the page
+    title and outline from the same parse that renders the page, instead of
+    scanning the markdown's lines again.
+    
+    Attributes:
+        title (str): Text of the first h1, or None if the document has none
+        headings (list): (level, text) of every heading, in document order.
+            The text is the raw markdown, inline syntax included.
+    """
+    
+    def __init__(self):
+        self.title = None
+        self.headings = []
+    
+    def add_heading(self, block):
+        """Record a heading block, e.g. '## Usage' as (2, 'Usage')."""
+        level = len(block) - len(block.lstrip('#'))
+        text = block[level + 1:].strip()
+        self.headings.append((level, text))
+        if level == 1 and self.title is None:
+            self.title = text
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, profiler=None, outline=None):
     """
     Convert a full markdown document into a single parent HTMLNode.
     
     Args:
-        markdown (str): Full markdown document as string
+        markdown: Full markdown document as a string, or a text file object
+            that is read in chunks
+        profiler (BuildProfiler): Optional profiler to add the time spent in
+            block splitting, block classification and inline parsing to
+        outline (DocumentOutline): Optional outline to record the headings in
         
     Returns:
         ParentNode: A div containing all the converted markdown blocks as children
     """
-    # Split markdown into blocks
-    blocks = markdown_to_blocks(markdown)
+    if profiler is not None:
+        return _markdown_to_html_node_profiled(markdown, profiler, outline)
     
-    # Convert each block to an HTMLNode
+    # Convert each block to an HTMLNode as the scanner yields it
     block_nodes = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        block_node = block_to_html_node(block, block_type)
+    for block in iter_blocks(markdown):
+        block_type, lines = classify_block(block)
+        if block_type == BlockType.HEADING and outline is not None:
+            outline.add_heading(block)
+        block_node = block_to_html_node(block, block_type, lines)
         block_nodes.append(block_node)
     
     # Wrap all blocks in a div
     return ParentNode("div", block_nodes)
 
-def block_to_html_node(block, block_type):
+def write_markdown_html(markdown, out, minifier=None):
+    """
+    Write the HTML of a markdown document to out, one block at a time.
+    
+    Produces the same HTML as markdown_to_html_node(markdown).to_html(), but
+    each block's nodes are dropped as soon as they are written, so a
+    document read from a file is converted in memory bounded by its largest
+    block rather than its size.
+    
+    Args:
+        markdown: Full markdown document as a string, or a text file object
+        out: A list to append the fragments to, or a writer with a write()
+            method such as a text file
+        minifier (HTMLMinifier): Optional minifier, see HTMLNode.write_html
+    """
+    write = fragment_writer(out)
+    write("<div>")
+    for block in iter_blocks(markdown):
+        block_to_html_node(block, *classify_block(block)).write_html(out, minifier)
+    write("</div>")
+
+def markdown_to_html(markdown, rewrite=None, outline=None, profiler=None):
+    """
+    Convert a markdown document straight to its HTML string.
+    
+    The fast path for plain page builds: the same HTML as
+    markdown_to_html_node(markdown).to_html(), byte for byte, but written
+    while each block is parsed, without creating any TextNode, LeafNode or
+    ParentNode objects or walking a tree afterwards. Anything that needs the
+    tree, such as asset fingerprinting or minifying, uses
+    markdown_to_html_node instead.
+    
+    Args:
+        markdown: Full markdown document as a string, or a text file object
+            that is read in chunks
+        rewrite (callable): Optional URL rewrite for the src of images and
+            the href of links, as for url_rewrite.rewrite_node_urls
+        outline (DocumentOutline): Optional outline to record the headings in
+        profiler (BuildProfiler): Optional profiler to add the time spent in
+            block splitting, block classification and inline parsing to
+        
+    Returns:
+        str: The document's HTML, wrapped in a div
+        
+    Raises:
+        ValueError: If the markdown is invalid, as for markdown_to_html_node
+    """
+    fragments = ["<div>"]
+    write = fragments.append
+    
+    if profiler is not None:
+        _write_markdown_html_profiled(markdown, write, rewrite, outline, profiler)
+    else:
+        for block in iter_blocks(markdown):
+            block_type, lines = classify_block(block)
+            if block_type == BlockType.HEADING and outline is not None:
+                outline.add_heading(block)
+            _write_block_html(block, block_type, lines, write, rewrite)
+    
+    write("</div>")
+    if profiler is not None:
+        with profiler.phase("to_html"):
+            return ''.join(fragments)
+    return ''.join(fragments)
+
+def _write_block_html(block, block_type, lines, write, rewrite):
+    """Write the HTML of one classified block, as block_to_html_node(...).write_html would."""
+    if block_type == BlockType.PARAGRAPH:
+        write("<p>")
+        _write_inline_html(block.replace('\n', ' '), write, rewrite)
+        write("</p>")
+    elif block_type == BlockType.HEADING:
+        level = len(block) - len(block.lstrip('#'))
+        write(f"<h{level}>")
+        _write_inline_html(block[level + 1:].replace('\n', ' '), write, rewrite)
+        write(f"</h{level}>")
+    elif block_type == BlockType.CODE:
+        code_content = block[3:-3]
+        if code_content.startswith('\n'):
+            code_content = code_content[1:]
+        write("<pre><code>")
+        write(code_content)
+        write("</code></pre>")
+    elif block_type == BlockType.QUOTE:
+        # Newlines are kept in quotes, as in quote_to_html_node
+        quote_lines = []
+        for line in lines:
+            if line.startswith('> '):
+                quote_lines.append(line[2:])
+            elif line.startswith('>'):
+                quote_lines.append(line[1:])
+        write("<blockquote>")
+        _write_inline_html('\n'.join(quote_lines), write, rewrite)
+        write("</blockquote>")
+    elif block_type == BlockType.UNORDERED_LIST:
+        write("<ul>")
+        for line in lines:
+            write("<li>")
+            _write_inline_html(line[2:].strip().replace('\n', ' '), write, rewrite)
+            write("</li>")
+        write("</ul>")
+    elif block_type == BlockType.ORDERED_LIST:
+        write("<ol>")
+        for line in lines:
+            write("<li>")
+            _write_inline_html(line[line.find('. ') + 2:].strip().replace('\n', ' '), write, rewrite)
+            write("</li>")
+        write("</ol>")
+    else:
+        raise ValueError(f"Unsupported block type: {block_type}")
+
+def _write_markdown_html_profiled(markdown, write, rewrite, outline, profiler):
+    """
+    The block loop of markdown_to_html with a timer around every step.
+    
+    Times the same phases as _markdown_to_html_node_profiled. Inline parsing
+    and writing the HTML are one step here, so "inline" covers both and
+    only joining the fragments is left to "to_html".
+    """
+    clock = time.perf_counter
+    
+    start = clock()
+    blocks = list(iter_blocks(markdown))
+    profiler.add("markdown_to_blocks", clock() - start)
+    
+    classify_seconds = 0.0
+    inline_seconds = 0.0
+    for block in blocks:
+        start = clock()
+        block_type, lines = classify_block(block)
+        if block_type == BlockType.HEADING and outline is not None:
+            outline.add_heading(block)
+        classified = clock()
+        _write_block_html(block, block_type, lines, write, rewrite)
+        classify_seconds += classified - start
+        inline_seconds += clock() - classified
+    
+    profiler.add("block_to_block_type", classify_seconds)
+    profiler.add("inline", inline_seconds)
+
+# Tags of the inline tokens that are written as a simple element
+_INLINE_TAGS = {
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+}
+
+def _write_inline_html(text, write, rewrite):
+    """
+    Write the HTML of text with inline markdown, token by token.
+    
+    Mirrors text_to_children followed by LeafNode.write_html, including the
+    errors text_node_to_html_node raises for a link or image without a URL.
+    """
+    for value, text_type, url in iter_inline_tokens(text):
+        if text_type == TextType.TEXT:
+            write(value)
+            continue
+        tag = _INLINE_TAGS.get(text_type)
+        if tag is not None:
+            write(f"<{tag}>{value}</{tag}>")
+            continue
+        
+        if not url:
+            kind = "Link" if text_type == TextType.LINK else "Image"
+            raise ValueError(f"{kind} TextNode must have a URL")
+        if rewrite is not None:
+            rewritten = rewrite(url)
+            if rewritten is not None:
+                url = rewritten
+        if text_type == TextType.LINK:
+            write(f'<a href="{url}">{value}</a>')
+        else:
+            write(f'<img src="{url}" alt="{value}"></img>')
+
+def _markdown_to_html_node_profiled(markdown, profiler, outline=None):
+    """
+    markdown_to_html_node with a timer around every step.
+    
+    Kept separate so the normal path pays nothing for profiling; the two must
+    build the same tree.
+    """
+    clock = time.perf_counter
+    
+    # The blocks are collected first so that scanning is timed on its own
+    start = clock()
+    blocks = list(iter_blocks(markdown))
+    profiler.add("markdown_to_blocks", clock() - start)
+    
+    classify_seconds = 0.0
+    inline_seconds = 0.0
+    block_nodes = []
+    for block in blocks:
+        start = clock()
+        block_type, lines = classify_block(block)
+        if block_type == BlockType.HEADING and outline is not None:
+            outline.add_heading(block)
+        classified = clock()
+        block_nodes.append(block_to_html_node(block, block_type, lines))
+        classify_seconds += classified - start
+        inline_seconds += clock() - classified
+    
+    profiler.add("block_to_block_type", classify_seconds)
+    profiler.add("inline", inline_seconds)
+    return ParentNode("div", block_nodes)
+
+def block_to_html_node(block, block_type, lines=None):
     """
     Convert a single markdown block to an HTMLNode based on its type.
     
     Args:
         block (str): The markdown block text
         block_type (BlockType): The type of the block
+        lines (list): The block split on newlines, as returned by
+            classify_block; split here when not given
         
     Returns:
         HTMLNode: The converted block as an HTMLNode
@@ -47,11 +290,11 @@ def block_to_html_node(block, block_type):
     elif block_type == BlockType.CODE:
         return code_block_to_html_node(block)
     elif block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
+        return quote_to_html_node(block, lines)
     elif block_type == BlockType.UNORDERED_LIST:
-        return unordered_list_to_html_node(block)
+        return unordered_list_to_html_node(block, lines)
     elif block_type == BlockType.ORDERED_LIST:
-        return ordered_list_to_html_node(block)
+        return ordered_list_to_html_node(block, lines)
     else:
         raise ValueError(f"Unsupported block type: {block_type}")
 
@@ -127,9 +370,10 @@ def code_block_to_html_node(block):
     code_node = ParentNode("code", [code_leaf_node])
     return ParentNode("pre", [code_node])
 
-def quote_to_html_node(block):
+def quote_to_html_node(block, lines=None):
     """Convert a quote block to a <blockquote> HTMLNode."""
-    lines = block.split('\n')
+    if lines is None:
+        lines = block.split('\n')
     # Remove the '> ' from each line
     quote_lines = []
     for line in lines:
@@ -144,9 +388,10 @@ def quote_to_html_node(block):
     
     return ParentNode("blockquote", children)
 
-def unordered_list_to_html_node(block):
+def unordered_list_to_html_node(block, lines=None):
     """Convert an unordered list block to a <ul> HTMLNode."""
-    lines = block.split('\n')
+    if lines is None:
+        lines = block.split('\n')
     list_items = []
     
     for line in lines:
@@ -158,9 +403,10 @@ def unordered_list_to_html_node(block):
     
     return ParentNode("ul", list_items)
 
-def ordered_list_to_html_node(block):
+def ordered_list_to_html_node(block, lines=None):
     """Convert an ordered list block to an <ol> HTMLNode."""
-    lines = block.split('\n')
+    if lines is None:
+        lines = block.split('\n')
     list_items = []
     
     for line in lines:
@@ -0,0 +1,78 @@
+import os
+
+from build_manifest import hash_bytes
+from staged_output import has_contents, replace_file
+from precompress import remove_gzip_sibling
+
+class OutputWriter():
+    """
+    Writes output files only when their contents actually change.
+
+    An identical file is left alone, so it keeps its mtime (and, in a staged
+    build, its inode), and rsync or a CDN upload sees only the files whose
+    bytes differ. The existing file is compared by size first, and only read
+    back when the size matches.
+
+    Every file passed through the writer is also hashed while its bytes are
+    in memory, for the deploy manifest, and handed to the precompressor if
+    there is one. Without a precompressor, a file that is written loses any
+    .gz copy left by an earlier build, so no stale copy is ever served.
+
+    Args:
+        compressor (Precompressor): Optional precompressor for .gz copies
+
+    Attributes:
+        written (int): Number of files created or replaced
+        unchanged (int): Number of files that already had the new contents
+        hashes (dict): Maps each path to the (size, sha256) of its contents
+    """
+
+    def __init__(self, compressor=None):
+        self.compressor = compressor
+        self.written = 0
+        self.unchanged = 0
+        self.hashes = {}
+
+    def write(self, dest_path, data):
+        """
+        Write data to dest_path unless the file already holds exactly that.
+
+        Args:
+            dest_path (str): Path of the output file
+            data (bytes): The new contents
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged
+        """
+        self.hashes[dest_path] = (len(data), hash_bytes(data))
+        if has_contents(dest_path, data):
+            self.unchanged += 1
+            if self.compressor is not None:
+                self.compressor.source_unchanged(dest_path, data)
+            return False
+
+        # Create destination directory if it doesn't exist
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir and not os.path.exists(dest_dir):
+            os.makedirs(dest_dir)
+
+        replace_file(dest_path, data)
+        self.written += 1
+        if self.compressor is not None:
+            self.compressor.compress(dest_path, data)
+        else:
+            remove_gzip_sibling(dest_path)
+        return True
+
+    def keep(self, dest_path):
+        """
+        Note an output file that the build skipped because it is up to date.
+
+        The file is not read unless the precompressor still has to make its
+        first .gz copy.
+
+        Args:
+            dest_path (str): Path of the output file
+        """
+        if self.compressor is not None:
+            self.compressor.source_unchanged(dest_path)
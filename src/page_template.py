@@ -0,0 +1,131 @@
+import re
+
+from html_minify import HTMLMinifier
+from url_rewrite import basepath_rewriter, rewrite_html_urls
+
+# Matches a named placeholder such as {{ Title }} or {{Content}}
+_SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+def rewrite_basepath(html, basepath):
+    """
+    Prefix the root-relative href and src attributes of raw HTML with the site basepath.
+
+    Only attributes inside tags are rewritten, never text. Pages rendered
+    from markdown get the basepath on their node tree instead (see
+    url_rewrite.rewrite_node_urls).
+
+    Args:
+        html (str): HTML text to rewrite
+        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+
+    Returns:
+        str: The rewritten HTML, or the same string if basepath is "/"
+    """
+    rewrite = basepath_rewriter(basepath)
+    if rewrite is None:
+        return html
+    return rewrite_html_urls(html, rewrite)
+
+class Template():
+    """
+    An HTML template compiled into literal segments and named slots.
+
+    The template text is split once, when it is loaded, into the literal text
+    between placeholders and the placeholder names. Rendering fills the slots
+    and joins all the pieces in a single pass, instead of running one
+    str.replace over the whole page per placeholder.
+
+    The basepath is applied to the literal segments at compile time, so the
+    template's own href/src attributes are never rewritten again per page.
+    So are fingerprinted asset names, when an asset map is given; the asset
+    URLs the template refers to are kept in asset_references.
+
+    A minified template has its whitespace collapsed and unneeded attribute
+    quotes removed at compile time too; bytes_saved is what that saves in
+    every rendered page.
+    """
+
+    def __init__(self, source, basepath="/", assets=None, minify=False):
+        self.source = source
+        self.basepath = basepath
+        self.asset_references = {}
+        minifier = HTMLMinifier() if minify else None
+        if minifier is not None:
+            source = minifier.minify_document(source)
+
+        # split() with a capture group alternates literal, slot, literal, ...
+        pieces = _SLOT_PATTERN.split(source)
+        self._parts = []
+        self._slot_indexes = []
+        for i, piece in enumerate(pieces):
+            if i % 2 == 0:
+                if assets is not None:
+                    piece, references = assets.rewrite_html(piece)
+                    self.asset_references.update(references)
+                piece = rewrite_basepath(piece, basepath)
+                if minifier is not None:
+                    piece = minifier.unquote_attributes(piece)
+                self._parts.append(piece)
+            else:
+                self._slot_indexes.append((len(self._parts), piece))
+                self._parts.append(None)
+        self.slots = frozenset(name for _, name in self._slot_indexes)
+        self.bytes_saved = minifier.bytes_saved if minifier is not None else 0
+
+    @classmethod
+    def from_file(cls, path, basepath="/", assets=None, minify=False):
+        """
+        Read and compile a template file.
+
+        Args:
+            path (str): Path to the HTML template file
+            basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+            assets (AssetMap): Optional map of fingerprinted static files
+            minify (bool): Minify the template's own HTML
+
+        Returns:
+            Template: The compiled template
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), basepath, assets, minify)
+
+    def check_slots(self, available):
+        """
+        Make sure every placeholder in the template can be filled.
+
+        Call this once after loading so a typo in template.html fails the
+        build before any page is rendered.
+
+        Args:
+            available (iterable): Names of the values the build provides
+
+        Raises:
+            ValueError: If the template uses a placeholder not in available
+        """
+        unknown = self.slots.difference(available)
+        if unknown:
+            names = ", ".join(sorted(unknown))
+            raise ValueError(f"Unknown template slot(s): {names}")
+
+    def render(self, **values):
+        """
+        Fill the template's slots.
+
+        Values for names the template does not use are ignored, so a template
+        is free to leave out, say, the title.
+
+        Args:
+            **values: Text for each slot, keyed by placeholder name
+
+        Returns:
+            str: The rendered document
+
+        Raises:
+            ValueError: If a slot in the template has no value
+        """
+        parts = self._parts.copy()
+        for index, name in self._slot_indexes:
+            if name not in values:
+                raise ValueError(f"No value for template slot: {name}")
+            parts[index] = values[name]
+        return "".join(parts)
@@ -1,31 +1,53 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, fragment_writer
+from html_minify import PRESERVE_WHITESPACE_TAGS
+
+# Pushed after the closing tag of a preserved element, to turn the minifier
+# back on once its subtree has been written
+_RESUME_MINIFY = object()
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
-    def to_html(self):
-        if self.tag is None:
-            raise ValueError("Parent nodes must have a tag")
-        
-        if self.children is None:
-            raise ValueError("Parent nodes must have children")
-        
-        # Build opening tag
-        opening_tag = f"<{self.tag}"
-        
-        # Add properties if they exist
-        if self.props:
-            for key, val in self.props.items():
-                opening_tag += f' {key}="{val}"'
-        
-        opening_tag += ">"
-        
-        # Build closing tag
-        closing_tag = f"</{self.tag}>"
-        
-        # Convert children to HTML
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-        
-        return f"{opening_tag}{children_html}{closing_tag}"
+
+    def write_html(self, out, minifier=None):
+        """
+        Write the HTML of this node and all its descendants to out.
+
+        The tree is walked with an explicit stack instead of recursion, so
+        every fragment is written exactly once however deep the tree is, and
+        very deep trees cannot hit the recursion limit. Closing tags are
+        pushed as plain strings to be written once the children are done.
+
+        With a minifier, the subtree of a pre or code element is written
+        without it, apart from the element's own opening tag.
+        """
+        write = fragment_writer(out)
+        stack = [self]
+        # Number of preserved elements the walk is currently inside
+        preserving = 0
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, str):
+                # A pending closing tag
+                write(node)
+            elif node is _RESUME_MINIFY:
+                preserving -= 1
+            elif isinstance(node, ParentNode):
+                if node.tag is None:
+                    raise ValueError("Parent nodes must have a tag")
+                if node.children is None:
+                    raise ValueError("Parent nodes must have children")
+
+                write(node.opening_tag(None if preserving else minifier))
+                if minifier is not None and node.tag in PRESERVE_WHITESPACE_TAGS:
+                    preserving += 1
+                    stack.append(_RESUME_MINIFY)
+                stack.append(f"</{node.tag}>")
+                # Reversed so the first child is popped first
+                stack.extend(reversed(node.children))
+            else:
+                node.write_html(out, None if preserving else minifier)
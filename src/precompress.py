@@ -0,0 +1,153 @@
+import gzip
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from build_manifest import hash_bytes
+from staged_output import has_contents, replace_file
+
+# Outputs worth precompressing: HTML and text assets. Images and fonts are
+# already compressed.
+COMPRESSIBLE_EXTENSIONS = frozenset((
+    ".html", ".htm", ".css", ".js", ".mjs", ".json", ".svg", ".txt", ".xml", ".csv", ".md",
+))
+
+def is_compressible(path):
+    """Check whether an output file is a text asset that should get a .gz copy."""
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+def remove_gzip_sibling(path):
+    """Delete the .gz copy of an output file, if there is one."""
+    try:
+        os.remove(path + ".gz")
+        return True
+    except FileNotFoundError:
+        return False
+
+class Precompressor():
+    """
+    Writes a .gz copy next to output files, for servers with gzip_static.
+
+    Compression runs on a thread pool from bytes the build already has in
+    memory; zlib releases the GIL, so the threads compress in parallel while
+    the build carries on. The copies are made with a fixed gzip mtime, so the
+    same input always gives the same bytes and an unchanged .gz file is not
+    rewritten.
+
+    A file whose .gz copy would not be at least min_saving smaller than the
+    file itself gets no copy (and loses any old one), since serving it
+    compressed is not worth the client's decompression.
+
+    The .gz copy of an unchanged file is kept as it is, unless
+    recompress_unchanged is set because the copies on disk were made with
+    different settings (see settings()). Whether each file got a copy is
+    collected in outcomes, for the build manifest; given the last build's as
+    previous_outcomes, an unchanged file that was not worth a copy is not
+    compressed again either.
+
+    Call wait() once every output of a build has been passed in; it re-raises
+    the first error. close() also shuts the pool down.
+
+    Args:
+        level (int): gzip compression level, 1-9
+        min_saving (float): Fraction of the size a .gz copy must save
+        workers (int): Number of compression threads, defaults to the CPU count
+    """
+
+    def __init__(self, level=9, min_saving=0.1, workers=None):
+        self.level = level
+        self.min_saving = min_saving
+        self.compressed = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+        # Set when the existing .gz copies may have been made with other settings
+        self.recompress_unchanged = False
+        # Path -> whether it has a .gz copy, from this build and the last one
+        self.outcomes = {}
+        self.previous_outcomes = {}
+        # (size, sha256) of each .gz file, keyed by its path, for the deploy manifest
+        self.hashes = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def compress(self, path, data):
+        """
+        Queue a .gz copy of an output file that was just written.
+
+        Args:
+            path (str): Path of the output file
+            data (bytes): The contents that were written to it
+        """
+        if is_compressible(path):
+            self._futures.append(self._executor.submit(self._compress, path, data))
+
+    def settings(self):
+        """Return the settings that decide the bytes of a .gz copy, for the build manifest."""
+        return {"level": self.level, "min_saving": self.min_saving}
+
+    def source_unchanged(self, path, data=None):
+        """
+        Handle an output file whose contents did not change in this build.
+
+        Its .gz copy is still valid and is left alone, and so is a file that
+        previous_outcomes says saved too little to get one. Only a file with
+        no copy and no such record, e.g. on the first build with compression
+        turned on, is compressed, or every file when recompress_unchanged is
+        set.
+
+        Args:
+            path (str): Path of the output file
+            data (bytes): The file's contents, read from path if not given
+        """
+        if not is_compressible(path):
+            return
+        if not self.recompress_unchanged:
+            had_copy = self.previous_outcomes.get(os.path.normpath(path))
+            if had_copy is False or os.path.isfile(path + ".gz"):
+                with self._lock:
+                    self.unchanged += 1
+                    self.outcomes[path] = had_copy is not False
+                return
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        self.compress(path, data)
+
+    def take_outcomes(self):
+        """Return the outcomes collected so far and start collecting anew."""
+        with self._lock:
+            outcomes, self.outcomes = self.outcomes, {}
+        return outcomes
+
+    def wait(self):
+        """Wait until every queued file is done, re-raising the first error."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Wait for every queued file and shut the pool down."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+    def _compress(self, path, data):
+        compressed = gzip.compress(data, compresslevel=self.level, mtime=0)
+        if len(compressed) > len(data) * (1 - self.min_saving):
+            remove_gzip_sibling(path)
+            with self._lock:
+                self.skipped += 1
+                self.outcomes[path] = False
+            return
+
+        gz_path = path + ".gz"
+        if not has_contents(gz_path, compressed):
+            replace_file(gz_path, compressed)
+        with self._lock:
+            self.compressed += 1
+            self.outcomes[path] = True
+            self.bytes_saved += len(data) - len(compressed)
+            self.hashes[gz_path] = (len(compressed), hash_bytes(compressed))
@@ -0,0 +1,161 @@
+import json
+import os
+
+from build_manifest import RENDERER_VERSION, hash_bytes
+
+class RenderCache():
+    """
+    Content-addressed on-disk cache of rendered page bodies.
+
+    Each entry maps the hash of a page's markdown bytes, the basepath and the
+    renderer version to the page's title and inner HTML, i.e. the output of
+    the content stage of a build (render_content). Nothing about the template
+    or the output path goes into the key, so an entry is reused by a clean
+    checkout in CI, by a page that moved, and after a template edit.
+
+    A body rendered with fingerprinted asset URLs is stored under a separate
+    key, together with the asset references it was rendered with, and only
+    reused while those still resolve the same way. A minified body also
+    keeps the bytes minifying saved, so a build served from the cache still
+    reports the full saving.
+
+    Entries are small JSON files spread over 256 subdirectories. A hit
+    touches the entry's mtime, and prune evicts the least recently used
+    entries once the cache grows past max_bytes.
+
+    Args:
+        directory (str): Directory holding the cache, created on first write
+        max_bytes (int): Size the cache is pruned back to
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(content_hash, basepath="/", fingerprinted=False, minified=False):
+        """
+        Return the cache key for a page's markdown.
+
+        The key is derived from the same content hash the build manifest
+        records, so the markdown is hashed once per build, and a page
+        recorded in the manifest can be looked up without reading it.
+
+        Args:
+            content_hash (str): hash_bytes of the raw markdown file
+            basepath (str): Base path the body's links were rendered for
+            fingerprinted (bool): Whether the body links to fingerprinted assets
+            minified (bool): Whether the body is minified
+
+        Returns:
+            str: Hex SHA-256 of the renderer version and the content hash
+        """
+        key = f"{RENDERER_VERSION}\0{content_hash}\0{basepath}"
+        if fingerprinted:
+            key += "\0fingerprinted"
+        if minified:
+            key += "\0minified"
+        return hash_bytes(key.encode('utf-8'))
+
+    def get(self, key, assets=None):
+        """
+        Look up a rendered page body.
+
+        Args:
+            key (str): Key from RenderCache.key
+            assets (AssetMap): The current asset map, for a fingerprinted key
+
+        Returns:
+            tuple: (title, html, asset_references, bytes_saved) of the cached
+                page, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            content = (entry["title"], entry["html"], entry.get("assets") or {}, entry.get("bytes_saved", 0))
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, or left half-written or corrupt by an older run
+            self.misses += 1
+            return None
+
+        # Rendered when one of the page's assets had different contents
+        if assets is not None and not assets.still_resolves(content[2]):
+            self.misses += 1
+            return None
+
+        # Mark the entry as recently used for pruning
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return content
+
+    def put(self, key, title, html, asset_references=None, bytes_saved=0):
+        """
+        Store a rendered page body, replacing any existing entry atomically.
+
+        Args:
+            key (str): Key from RenderCache.key
+            title (str): The page title
+            html (str): The page's inner HTML
+            asset_references (dict): The asset URLs the body was rendered
+                with, see AssetMap.rewrite_node
+            bytes_saved (int): Bytes the minifier removed from the body
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        entry = {"title": title, "html": html}
+        if asset_references:
+            entry["assets"] = asset_references
+        if bytes_saved:
+            entry["bytes_saved"] = bytes_saved
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """
+        Evict the least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir():
+                    continue
+                with os.scandir(bucket.path) as files:
+                    for entry in files:
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        total += stat.st_size
+
+        evicted = 0
+        # Oldest first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        self.evicted += evicted
+        return evicted
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
@@ -1,114 +1,84 @@
 from textnode import TextNode, TextType
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from extract_markdown import IMAGE_PATTERN, LINK_PATTERN
 
 def split_nodes_image(old_nodes):
     """
     Split TextNodes based on markdown image syntax.
-    
+
     Takes a list of TextNodes and splits any TEXT type nodes that contain
     markdown images into multiple nodes with appropriate text types.
-    
+
     Args:
         old_nodes (list): List of TextNode objects to process
-        
+
     Returns:
         list: New list of TextNode objects with split nodes
     """
-    new_nodes = []
-    
-    for node in old_nodes:
-        # Only process TEXT type nodes, pass others through unchanged
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-        
-        # Extract all images from the node's text
-        images = extract_markdown_images(node.text)
-        
-        # If no images found, add the original node
-        if not images:
-            new_nodes.append(node)
-            continue
-        
-        # Split the text based on the images found
-        current_text = node.text
-        
-        for alt_text, url in images:
-            # Construct the full markdown image syntax to split on
-            image_markdown = f"![{alt_text}]({url})"
-            
-            # Split the current text on this image
-            parts = current_text.split(image_markdown, 1)  # Only split on first occurrence
-            
-            if len(parts) == 2:
-                # Add the text before the image (if not empty)
-                if parts[0]:
-                    new_nodes.append(TextNode(parts[0], TextType.TEXT))
-                
-                # Add the image node
-                new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-                
-                # Continue with the remaining text
-                current_text = parts[1]
-        
-        # Add any remaining text after the last image (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-    
-    return new_nodes
+    return _split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
     """
     Split TextNodes based on markdown link syntax.
-    
+
     Takes a list of TextNodes and splits any TEXT type nodes that contain
     markdown links into multiple nodes with appropriate text types.
-    
+
     Args:
         old_nodes (list): List of TextNode objects to process
-        
+
+    Returns:
+        list: New list of TextNode objects with split nodes
+    """
+    return _split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+def _split_nodes_pattern(old_nodes, pattern, text_type):
+    """
+    Split TEXT nodes around every match of an image or link pattern.
+
+    The text is scanned once with finditer, and the text between matches is
+    sliced out using the match spans, so each match costs a single slice no
+    matter how many links the text contains.
+
+    Args:
+        old_nodes (list): List of TextNode objects to process
+        pattern (re.Pattern): Compiled pattern whose groups are (text, url)
+        text_type (TextType): The TextType to give each match
+
     Returns:
         list: New list of TextNode objects with split nodes
     """
     new_nodes = []
-    
+
     for node in old_nodes:
         # Only process TEXT type nodes, pass others through unchanged
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        
-        # Extract all links from the node's text
-        links = extract_markdown_links(node.text)
-        
-        # If no links found, add the original node
-        if not links:
+
+        text = node.text
+        # End of the previous match, i.e. where the unconsumed text starts
+        cursor = 0
+        matched = False
+
+        for match in pattern.finditer(text):
+            matched = True
+            start = match.start()
+
+            # Add the text before the match (if not empty)
+            if start > cursor:
+                new_nodes.append(TextNode(text[cursor:start], TextType.TEXT))
+
+            # Add the image or link node
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            cursor = match.end()
+
+        # If nothing matched, add the original node
+        if not matched:
             new_nodes.append(node)
             continue
-        
-        # Split the text based on the links found
-        current_text = node.text
-        
-        for anchor_text, url in links:
-            # Construct the full markdown link syntax to split on
-            link_markdown = f"[{anchor_text}]({url})"
-            
-            # Split the current text on this link
-            parts = current_text.split(link_markdown, 1)  # Only split on first occurrence
-            
-            if len(parts) == 2:
-                # Add the text before the link (if not empty)
-                if parts[0]:
-                    new_nodes.append(TextNode(parts[0], TextType.TEXT))
-                
-                # Add the link node
-                new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
-                
-                # Continue with the remaining text
-                current_text = parts[1]
-        
-        # Add any remaining text after the last link (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-    
+
+        # Add any remaining text after the last match (if not empty)
+        if cursor < len(text):
+            new_nodes.append(TextNode(text[cursor:], TextType.TEXT))
+
     return new_nodes
@@ -0,0 +1,168 @@
+import ctypes
+import errno
+import os
+import shutil
+import sys
+
+def clone_tree(source_dir, dest_dir):
+    """
+    Recreate a directory tree by hardlinking every file into dest_dir.
+
+    Linking costs one metadata operation per file and no data I/O. Files
+    that cannot be linked, e.g. because the filesystem does not support it,
+    are copied instead.
+
+    Args:
+        source_dir (str): Directory to clone
+        dest_dir (str): Directory to create; must not exist yet
+
+    Returns:
+        tuple: (linked, copied) file counts
+    """
+    linked = 0
+    copied = 0
+    os.makedirs(dest_dir)
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            dest_path = os.path.join(dest_dir, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                sub_linked, sub_copied = clone_tree(entry.path, dest_path)
+                linked += sub_linked
+                copied += sub_copied
+                continue
+            try:
+                os.link(entry.path, dest_path, follow_symlinks=False)
+                linked += 1
+            except OSError:
+                shutil.copy2(entry.path, dest_path, follow_symlinks=False)
+                copied += 1
+    return linked, copied
+
+def replace_file(dest_path, data):
+    """
+    Write a file by writing a temporary file next to it and renaming it over.
+
+    Readers never see a half-written file. A destination that is hardlinked
+    to a file of a previous build gets a new inode, so the previous build's
+    copy is left as it was.
+
+    Args:
+        dest_path (str): Path of the file to write
+        data (bytes): The new contents
+    """
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, dest_path)
+
+def has_contents(path, data):
+    """
+    Check whether the file at path exists and holds exactly data.
+
+    The size is compared first, so the file is only read when it could match.
+    """
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        return False
+
+def exchange_directories(path_a, path_b):
+    """
+    Atomically swap two directories, if the platform can.
+
+    Uses renameat2(RENAME_EXCHANGE) on Linux, so there is no moment at
+    which either path is missing.
+
+    Returns:
+        bool: True if the directories were swapped, False if atomic exchange
+            is not available and nothing was done
+
+    Raises:
+        OSError: If the exchange is supported but failed
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+
+    at_fdcwd = -100
+    rename_exchange = 2
+    result = renameat2(at_fdcwd, os.fsencode(path_a), at_fdcwd, os.fsencode(path_b), rename_exchange)
+    if result == 0:
+        return True
+    error = ctypes.get_errno()
+    # Old kernel, or a filesystem without RENAME_EXCHANGE support
+    if error in (errno.ENOSYS, errno.EINVAL):
+        return False
+    raise OSError(error, os.strerror(error), path_a)
+
+class StagedOutput():
+    """
+    Builds go into a staging copy of the output directory that is swapped in
+    at the end, so the served directory always holds a complete build.
+
+    prepare() hardlinks the current output into the staging directory, so
+    unchanged files are already in place at no I/O cost and the build only
+    replaces what changed. commit() swaps the staging directory into place
+    and keeps the replaced build as the previous directory. If the build
+    fails, commit() is never called and the output directory is untouched.
+
+    Everything written into the staging directory must replace files (see
+    replace_file) rather than overwrite them in place, because an unchanged
+    file is shared with the live and previous builds.
+
+    Args:
+        dest_dir (str): The served output directory (e.g., 'docs')
+        staging_dir (str): Where to build, defaults to dest_dir + '.staging'
+        previous_dir (str): Where the replaced build is kept, defaults to
+            dest_dir + '.previous'
+    """
+
+    def __init__(self, dest_dir, staging_dir=None, previous_dir=None):
+        dest_dir = dest_dir.rstrip(os.sep) or dest_dir
+        self.dest_dir = dest_dir
+        self.staging_dir = staging_dir or f"{dest_dir}.staging"
+        self.previous_dir = previous_dir or f"{dest_dir}.previous"
+
+    def prepare(self):
+        """
+        Create the staging directory from the current output.
+
+        A staging directory left behind by a failed build is discarded.
+
+        Returns:
+            str: The staging directory to build into
+        """
+        if os.path.exists(self.staging_dir):
+            shutil.rmtree(self.staging_dir)
+
+        if os.path.isdir(self.dest_dir):
+            linked, copied = clone_tree(self.dest_dir, self.staging_dir)
+            print(f"Staging build in {self.staging_dir}: {linked} files linked, {copied} copied")
+        else:
+            os.makedirs(self.staging_dir)
+            print(f"Staging build in {self.staging_dir}")
+        return self.staging_dir
+
+    def commit(self):
+        """Swap the finished staging directory into place."""
+        if not os.path.isdir(self.dest_dir):
+            os.rename(self.staging_dir, self.dest_dir)
+            print(f"Published {self.dest_dir}")
+            return
+
+        if os.path.exists(self.previous_dir):
+            shutil.rmtree(self.previous_dir)
+
+        if exchange_directories(self.staging_dir, self.dest_dir):
+            # The staging path now holds the replaced build
+            os.rename(self.staging_dir, self.previous_dir)
+        else:
+            os.rename(self.dest_dir, self.previous_dir)
+            os.rename(self.staging_dir, self.dest_dir)
+        print(f"Published {self.dest_dir}, previous build kept in {self.previous_dir}")
@@ -0,0 +1,288 @@
+import hashlib
+import os
+import shutil
+
+from asset_map import AssetMap, fingerprint_path, is_fingerprinted
+from build_manifest import hash_bytes, hash_file, remove_output
+from precompress import is_compressible, remove_gzip_sibling
+from staged_output import replace_file
+
+class StaticSyncResult():
+    """Outcome of a sync_static run."""
+
+    def __init__(self):
+        self.files = set()
+        # (size, sha256) of every file whose contents were read during the
+        # sync, keyed by relative path, for the deploy manifest
+        self.hashes = {}
+        self.copied = 0
+        self.unchanged = 0
+        self.removed = 0
+        # Published names of the files, for a fingerprinted sync only
+        self.assets = None
+
+def sync_static(source_dir, dest_dir, previous_files=(), compressor=None):
+    """
+    Bring the static files in dest_dir in line with source_dir.
+
+    Only files that are new or changed are copied, and only outputs whose
+    source has disappeared are deleted, so unchanged files keep their mtime
+    and rsync/CDN change detection sees just the real changes. A file is
+    unchanged when its size and mtime match; if only the mtime differs the
+    contents are hashed, and identical files just get their mtime fixed, or
+    are replaced by a fresh copy if they are hardlinked to another build.
+
+    Copies keep the source's metadata (shutil.copystat), so the destination
+    has the source's mtime, which is what makes the size/mtime comparison
+    work next time. The copy goes to a temporary file that is renamed over
+    the destination, so a destination hardlinked to an earlier build is
+    replaced, not modified. Copied files are hashed on the way through.
+
+    Args:
+        source_dir (str): Path to the source directory (e.g., 'static')
+        dest_dir (str): Path to the destination directory (e.g., 'docs')
+        previous_files (iterable): Relative paths synced by the previous run.
+            Only these are candidates for deletion, so generated pages living
+            in the same directory are never touched.
+        compressor (Precompressor): Optional precompressor. Copied text
+            assets are read into memory once, for both the copy and the .gz
+            copy; unchanged files keep the .gz copy they already have.
+
+    Returns:
+        StaticSyncResult: The synced relative paths, copy/skip/remove counts
+            and the hashes of the copied files
+    """
+    result = StaticSyncResult()
+    if not os.path.isdir(source_dir):
+        print(f"Source directory does not exist: {source_dir}")
+    else:
+        _sync_directory(source_dir, dest_dir, "", result, compressor)
+
+    _remove_deleted(dest_dir, previous_files, result)
+    return result
+
+def sync_static_fingerprinted(source_dir, dest_dir, previous_files=(), previous_assets=None, compressor=None):
+    """
+    Sync the static files under names that carry a hash of their contents.
+
+    Assets such as stylesheets and images are published as e.g.
+    index.3f2a9c1b.css, so they can be served with long-lived immutable cache
+    headers; other files keep their names (see asset_map.is_fingerprinted).
+    The returned result's assets map tells pages and the template which name
+    to link to.
+
+    A file whose size and mtime match its entry in the previous asset map is
+    not read again. Any other file is hashed to find its name, and only
+    copied if no output by that name with the same contents exists. Outputs
+    of the previous sync that are no longer current, such as the old name of
+    a changed asset, are deleted.
+
+    Args:
+        source_dir (str): Path to the source directory (e.g., 'static')
+        dest_dir (str): Path to the destination directory (e.g., 'docs')
+        previous_files (iterable): Relative output paths synced by the
+            previous run, the only candidates for deletion
+        previous_assets (AssetMap): The previous run's asset map, if any
+        compressor (Precompressor): Optional precompressor for .gz copies
+
+    Returns:
+        StaticSyncResult: As for sync_static, with files holding the
+            published paths and assets the new AssetMap
+    """
+    result = StaticSyncResult()
+    result.assets = AssetMap()
+    if not os.path.isdir(source_dir):
+        print(f"Source directory does not exist: {source_dir}")
+    else:
+        for directory, _, names in os.walk(source_dir):
+            for name in sorted(names):
+                relative_path = os.path.relpath(os.path.join(directory, name), source_dir)
+                _sync_fingerprinted_file(source_dir, dest_dir, relative_path,
+                                         previous_assets or AssetMap(), result, compressor)
+
+    _remove_deleted(dest_dir, previous_files, result)
+    return result
+
+def _sync_fingerprinted_file(source_dir, dest_dir, relative_path, previous_assets, result, compressor=None):
+    """Publish one static file under its fingerprinted name, see sync_static_fingerprinted."""
+    source_path = os.path.join(source_dir, relative_path)
+    stat = os.stat(source_path)
+
+    output_path = _unchanged_output(previous_assets, relative_path, stat, dest_dir)
+    copied = False
+    if output_path is None:
+        sha256 = hash_file(source_path)
+        output_path = relative_path
+        if is_fingerprinted(relative_path):
+            output_path = fingerprint_path(relative_path, sha256)
+        result.hashes[output_path] = (stat.st_size, sha256)
+
+        # An output of the same name usually has the same contents, but a
+        # file that keeps its name may have been edited
+        dest_path = os.path.join(dest_dir, output_path)
+        if not (os.path.isfile(dest_path) and os.path.getsize(dest_path) == stat.st_size
+                and hash_file(dest_path) == sha256):
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            print(f"Copying file: {source_path} -> {dest_path}")
+            _copy_file(source_path, dest_path, compressor)
+            copied = True
+
+    if copied:
+        result.copied += 1
+    else:
+        result.unchanged += 1
+        if compressor is not None:
+            compressor.source_unchanged(os.path.join(dest_dir, output_path))
+    result.files.add(output_path)
+    result.assets.add(relative_path, output_path, stat.st_size, stat.st_mtime_ns)
+
+def _unchanged_output(previous_assets, relative_path, stat, dest_dir):
+    """Return the output path recorded for an unchanged file, or None."""
+    entry = previous_assets.files.get(relative_path.replace(os.sep, '/'))
+    if entry is None or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    output_path = entry["output"].replace('/', os.sep)
+    if not os.path.isfile(os.path.join(dest_dir, output_path)):
+        return None
+    return output_path
+
+def _remove_deleted(dest_dir, previous_files, result):
+    """Delete outputs of the previous sync that this sync did not produce."""
+    for relative_path in sorted(set(previous_files) - result.files):
+        dest_path = os.path.join(dest_dir, relative_path)
+        if os.path.isfile(dest_path):
+            print(f"Removing deleted static file: {dest_path}")
+            remove_output(dest_path, dest_dir)
+            result.removed += 1
+
+def _sync_directory(source_dir, dest_dir, relative_dir, result, compressor=None):
+    """
+    Sync one directory level and recurse into subdirectories.
+
+    Both directories are listed with os.scandir, whose entries already know
+    whether they are files or directories, so only files that might need
+    copying are stat'ed.
+    """
+    if not os.path.isdir(dest_dir):
+        print(f"Creating directory: {dest_dir}")
+        os.makedirs(dest_dir)
+
+    with os.scandir(dest_dir) as entries:
+        dest_entries = {entry.name: entry for entry in entries}
+
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            dest_path = os.path.join(dest_dir, entry.name)
+            relative_path = os.path.join(relative_dir, entry.name)
+
+            if entry.is_dir():
+                _sync_directory(entry.path, dest_path, relative_path, result, compressor)
+                continue
+
+            result.files.add(relative_path)
+            if _is_unchanged(entry, dest_entries.get(entry.name), relative_path, result):
+                result.unchanged += 1
+                if compressor is not None:
+                    compressor.source_unchanged(dest_path)
+                continue
+
+            dest_entry = dest_entries.get(entry.name)
+            if dest_entry is not None and dest_entry.is_dir():
+                shutil.rmtree(dest_path)
+
+            print(f"Copying file: {entry.path} -> {dest_path}")
+            result.hashes[relative_path] = _copy_file(entry.path, dest_path, compressor)
+            result.copied += 1
+
+def _copy_file(source_path, dest_path, compressor=None, chunk_size=1024 * 1024):
+    """
+    Copy a file with its metadata, replacing the destination atomically.
+
+    The contents are hashed as they are copied, so the copy never has to be
+    read again to be hashed. A text asset that gets a .gz copy is read whole
+    instead, so the same bytes can be handed to the precompressor.
+
+    Returns:
+        tuple: (size, sha256) of the copied contents
+    """
+    if compressor is not None and is_compressible(dest_path):
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        replace_file(dest_path, data)
+        shutil.copystat(source_path, dest_path)
+        compressor.compress(dest_path, data)
+        return len(data), hash_bytes(data)
+
+    if compressor is None:
+        remove_gzip_sibling(dest_path)
+
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    with open(source_path, 'rb') as source, open(tmp_path, 'wb') as dest:
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+            dest.write(chunk)
+            size += len(chunk)
+    shutil.copystat(source_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+    return size, digest.hexdigest()
+
+def _is_unchanged(source_entry, dest_entry, relative_path, result):
+    """Check whether the destination already holds the source file's contents."""
+    if dest_entry is None or not dest_entry.is_file():
+        return False
+
+    source_stat = source_entry.stat()
+    dest_stat = dest_entry.stat()
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+
+    # Same size but a different mtime, e.g. after a fresh checkout: compare the
+    # contents, and record the source mtime so the next check is a stat only
+    source_hash = hash_file(source_entry.path)
+    if source_hash != hash_file(dest_entry.path):
+        return False
+    if dest_stat.st_nlink > 1:
+        # Hardlinked to the live and previous builds by a staged build, so
+        # its mtime must not change before the commit: put a copy in its place
+        tmp_path = f"{dest_entry.path}.{os.getpid()}.tmp"
+        shutil.copy2(source_entry.path, tmp_path)
+        os.replace(tmp_path, dest_entry.path)
+    else:
+        shutil.copystat(source_entry.path, dest_entry.path)
+    result.hashes[relative_path] = (source_stat.st_size, source_hash)
+    return True
+
+def sync_static_file(source_dir, dest_dir, relative_path, compressor=None):
+    """
+    Bring a single static file in dest_dir in line with source_dir.
+
+    Used when it is already known which file changed, e.g. by watch mode,
+    so nothing else has to be listed or compared.
+
+    Args:
+        source_dir (str): Path to the source directory (e.g., 'static')
+        dest_dir (str): Path to the destination directory (e.g., 'docs')
+        relative_path (str): Path of the file relative to both directories
+        compressor (Precompressor): Optional precompressor for a .gz copy
+
+    Returns:
+        bool: True if the file was copied, False if its source is gone and
+            the copy was removed
+    """
+    source_path = os.path.join(source_dir, relative_path)
+    dest_path = os.path.join(dest_dir, relative_path)
+
+    if os.path.isfile(source_path):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        print(f"Copying file: {source_path} -> {dest_path}")
+        _copy_file(source_path, dest_path, compressor)
+        return True
+
+    if os.path.isfile(dest_path):
+        print(f"Removing deleted static file: {dest_path}")
+        remove_output(dest_path, dest_dir)
+    return False
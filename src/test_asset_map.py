@@ -0,0 +1,120 @@
+import os
+import unittest
+
+from asset_map import AssetMap, fingerprint_path
+from build_manifest import BuildManifest, hash_bytes
+from build_context import BuildContext
+from generate_pages import generate_pages_recursive
+from markdown_to_html_node import markdown_to_html_node
+from page_template import Template
+from static_sync import sync_static_fingerprinted
+from test_helpers import TempDirTestCase
+
+class TestAssetMap(unittest.TestCase):
+
+    def setUp(self):
+        self.assets = AssetMap()
+        self.assets.add("index.css", "index.11111111.css", 1, 1)
+        self.assets.add(os.path.join("images", "tom.png"), os.path.join("images", "tom.22222222.png"), 1, 1)
+
+    def test_fingerprint_path(self):
+        """Test that the hash goes between the name and the extension"""
+        self.assertEqual(fingerprint_path(os.path.join("images", "a.png"), "3f2a9c1b" * 8),
+                         os.path.join("images", "a.3f2a9c1b.png"))
+
+    def test_url_for(self):
+        """Test root-relative URLs, with and without query and fragment"""
+        self.assertEqual(self.assets.url_for("/index.css"), "/index.11111111.css")
+        self.assertEqual(self.assets.url_for("/images/tom.png?v=1#top"), "/images/tom.22222222.png?v=1#top")
+        self.assertIsNone(self.assets.url_for("/blog/tom"))
+        self.assertIsNone(self.assets.url_for("images/tom.png"))
+        self.assertIsNone(self.assets.url_for("//cdn.example.com/index.css"))
+
+    def test_rewrite_node(self):
+        """Test that img and a nodes are rewritten and their references returned"""
+        node = markdown_to_html_node("![tom](/images/tom.png) [home](/) [ext](https://example.com)")
+        references = self.assets.rewrite_node(node)
+        html = node.to_html()
+        self.assertIn('src="/images/tom.22222222.png"', html)
+        self.assertIn('href="https://example.com"', html)
+        self.assertEqual(references, {"/images/tom.png": "/images/tom.22222222.png", "/": None})
+
+    def test_template_links_are_rewritten(self):
+        """Test that the template's own links point at fingerprinted assets"""
+        template = Template('<link href="/index.css"><a href="/">{{ Content }}</a>', "/repo/", self.assets)
+        self.assertEqual(template.render(Content="c"), '<link href="/repo/index.11111111.css"><a href="/repo/">c</a>')
+        self.assertEqual(template.asset_references, {"/index.css": "/index.11111111.css", "/": None})
+
+    def test_still_resolves(self):
+        """Test that a changed or newly added asset invalidates references"""
+        references = {"/index.css": "/index.11111111.css", "/images/new.png": None}
+        self.assertTrue(self.assets.still_resolves(references))
+        self.assets.add(os.path.join("images", "new.png"), os.path.join("images", "new.33333333.png"), 1, 1)
+        self.assertFalse(self.assets.still_resolves(references))
+
+class TestFingerprintedBuild(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.content = os.path.join(self.root, "content")
+        self.out = os.path.join(self.root, "out")
+        self.template = os.path.join(self.root, "template.html")
+        self._write(os.path.join(self.static, "index.css"), b"body {}")
+        self._write(os.path.join(self.static, "images", "a.png"), b"png-a")
+        self._write(os.path.join(self.static, "robots.txt"), b"User-agent: *")
+        self._write(os.path.join(self.content, "index.md"), b"# Home\n\n![a](/images/a.png)")
+        self._write(os.path.join(self.content, "about", "index.md"), b"# About\n\n[home](/)")
+        self._write(self.template, b'<link href="/index.css">{{ Title }}{{ Content }}')
+        self.manifest = BuildManifest(os.path.join(self.root, "manifest.json"), self.out)
+
+    def _read_output(self, relative_path):
+        with open(os.path.join(self.out, relative_path), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _build(self):
+        result = sync_static_fingerprinted(self.static, self.out, self.manifest.static_files,
+                                           AssetMap(self.manifest.asset_files))
+        self.manifest.static_files = result.files
+        self.manifest.asset_files = result.assets.files
+        self.manifest.rebuilt = 0
+        generate_pages_recursive(self.content, self.out,
+                                 BuildContext(self.template, manifest=self.manifest, assets=result.assets))
+        return result
+
+    def test_assets_get_fingerprinted_names(self):
+        """Test the published names and the links pointing at them"""
+        result = self._build()
+        png = os.path.join("images", "a." + hash_bytes(b"png-a")[:8] + ".png")
+        self.assertEqual(result.files, {"index." + hash_bytes(b"body {}")[:8] + ".css", png, "robots.txt"})
+        self.assertIn(f'src="/{png}"', self._read_output("index.html"))
+        self.assertIn('href="/index.' + hash_bytes(b"body {}")[:8] + '.css"', self._read_output("index.html"))
+
+    def test_unchanged_assets_are_not_copied(self):
+        """Test that a second sync reuses the asset map"""
+        self._build()
+        result = self._build()
+        self.assertEqual((result.copied, result.unchanged, result.removed), (0, 3, 0))
+        self.assertEqual(self.manifest.rebuilt, 0)
+
+    def test_only_pages_using_a_changed_asset_are_rebuilt(self):
+        """Test that changing an image rebuilds just the page showing it"""
+        self._build()
+        old_png = os.path.join(self.out, "images", "a." + hash_bytes(b"png-a")[:8] + ".png")
+        self._write(os.path.join(self.static, "images", "a.png"), b"png-b")
+        result = self._build()
+        self.assertEqual((result.copied, result.removed), (1, 1))
+        self.assertFalse(os.path.exists(old_png))
+        self.assertEqual(self.manifest.rebuilt, 1)
+        self.assertIn("a." + hash_bytes(b"png-b")[:8] + ".png", self._read_output("index.html"))
+
+    def test_template_asset_change_rebuilds_every_page(self):
+        """Test that changing the stylesheet linked by the template rebuilds all pages"""
+        self._build()
+        self._write(os.path.join(self.static, "index.css"), b"body { margin: 0 }")
+        self._build()
+        self.assertEqual(self.manifest.rebuilt, 2)
+        self.assertIn(hash_bytes(b"body { margin: 0 }")[:8], self._read_output(os.path.join("about", "index.html")))
+
+if __name__ == "__main__":
+    unittest.main()
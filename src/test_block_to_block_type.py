@@ -1,5 +1,5 @@
 import unittest
-from block_to_block_type import block_to_block_type, BlockType
+from block_to_block_type import block_to_block_type, classify_block, BlockType
 
 class TestBlockToBlockType(unittest.TestCase):
     
@@ -279,6 +279,33 @@ def fibonacci(n):
         block = ">  This is a quote with extra space"
         result = block_to_block_type(block)
         self.assertEqual(result, BlockType.QUOTE)
+    
+    # Tests for classify_block
+    
+    def test_classify_block_returns_lines_for_lists_and_quotes(self):
+        """Test that quotes and lists come back with their lines"""
+        self.assertEqual(classify_block("> a\n> b"), (BlockType.QUOTE, ["> a", "> b"]))
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED_LIST, ["- a", "- b"]))
+        self.assertEqual(classify_block("1. a\n2. b"), (BlockType.ORDERED_LIST, ["1. a", "2. b"]))
+    
+    def test_classify_block_no_lines_for_other_types(self):
+        """Test that headings, code, paragraphs and near-misses have no lines"""
+        self.assertEqual(classify_block("## Title"), (BlockType.HEADING, None))
+        self.assertEqual(classify_block("```\ncode\n```"), (BlockType.CODE, None))
+        self.assertEqual(classify_block("Just text"), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_block("- a\nb"), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_block("1. a\n3. b"), (BlockType.PARAGRAPH, None))
+    
+    def test_classify_block_ordered_list_past_nine(self):
+        """Test that multi-digit numbers must still count up from 1"""
+        block = "\n".join(f"{i}. item" for i in range(1, 13))
+        self.assertEqual(classify_block(block)[0], BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type(block.replace("10. ", "1. ")), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. a\n2.b"), BlockType.PARAGRAPH)
+    
+    def test_classify_block_empty(self):
+        """Test that an empty block is a paragraph"""
+        self.assertEqual(classify_block(""), (BlockType.PARAGRAPH, None))
 
 if __name__ == "__main__":
     unittest.main()
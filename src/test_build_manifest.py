@@ -0,0 +1,112 @@
+import os
+import unittest
+
+from build_manifest import BuildManifest, RENDERER_VERSION, hash_bytes
+from build_context import BuildContext
+from generate_pages import generate_page
+from test_helpers import TempDirTestCase
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestBuildManifest(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.output_dir = os.path.join(self.root, "docs")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        self.source = os.path.join(self.root, "index.md")
+        self.template = os.path.join(self.root, "template.html")
+        self.dest = os.path.join(self.output_dir, "index.html")
+        self._write(self.source, "# Hello\n\nSome text")
+        self._write(self.template, TEMPLATE)
+
+    def _build(self, basepath="/"):
+        manifest = BuildManifest.load(self.manifest_path, self.output_dir)
+        generate_page(self.source, self.dest, BuildContext(self.template, basepath, manifest=manifest))
+        manifest.save()
+        return manifest
+
+    def test_first_build_rebuilds(self):
+        """Test that a page with no manifest entry is generated and recorded"""
+        manifest = self._build()
+        self.assertEqual((manifest.rebuilt, manifest.skipped), (1, 0))
+        entry = manifest.entries[self.source]
+        self.assertEqual(entry["output"], "index.html")
+        self.assertEqual(entry["renderer_version"], RENDERER_VERSION)
+        self.assertEqual(entry["content_hash"], hash_bytes(b"# Hello\n\nSome text"))
+
+    def test_unchanged_page_is_skipped(self):
+        """Test that a second build with identical inputs skips the page"""
+        self._build()
+        manifest = self._build()
+        self.assertEqual((manifest.rebuilt, manifest.skipped), (0, 1))
+
+    def test_content_change_rebuilds(self):
+        """Test that editing the markdown regenerates the page"""
+        self._build()
+        self._write(self.source, "# Hello\n\nOther text")
+        manifest = self._build()
+        self.assertEqual(manifest.rebuilt, 1)
+        with open(self.dest, encoding='utf-8') as f:
+            self.assertIn("Other text", f.read())
+
+    def test_template_change_rebuilds(self):
+        """Test that editing the template regenerates the page"""
+        self._build()
+        self._write(self.template, "<main>{{ Title }}{{ Content }}</main>")
+        self.assertEqual(self._build().rebuilt, 1)
+
+    def test_basepath_change_rebuilds(self):
+        """Test that building for a different basepath regenerates the page"""
+        self._build()
+        self.assertEqual(self._build("/repo/").rebuilt, 1)
+
+    def test_missing_output_rebuilds(self):
+        """Test that a deleted output file is regenerated"""
+        self._build()
+        os.remove(self.dest)
+        self.assertEqual(self._build().rebuilt, 1)
+        self.assertTrue(os.path.isfile(self.dest))
+
+    def test_other_renderer_version_is_discarded(self):
+        """Test that a manifest written by another renderer version is ignored"""
+        self._write(self.manifest_path, '{"renderer_version": "0", "pages": {"x.md": {}}}')
+        manifest = BuildManifest.load(self.manifest_path, self.output_dir)
+        self.assertEqual(manifest.entries, {})
+
+    def test_gzip_settings_are_saved(self):
+        """Test that the .gz settings survive a save and load"""
+        manifest = self._build()
+        self.assertIsNone(manifest.gzip_settings)
+        manifest.gzip_settings = {"level": 6, "min_saving": 0.2}
+        manifest.save()
+        loaded = BuildManifest.load(self.manifest_path, self.output_dir)
+        self.assertEqual(loaded.gzip_settings, {"level": 6, "min_saving": 0.2})
+
+    def test_gzip_outcomes_round_trip(self):
+        """Test that per-output .gz outcomes are stored relative to the output directory"""
+        manifest = self._build()
+        css = os.path.join(self.output_dir, "index.css")
+        manifest.record_gzip_outcomes({self.dest: True, css: False})
+        self.assertEqual(manifest.gzip_outputs, {"index.html": True, "index.css": False})
+        manifest.save()
+        loaded = BuildManifest.load(self.manifest_path, self.output_dir)
+        self.assertEqual(loaded.gzip_outcomes(), {self.dest: True, css: False})
+
+    def test_corrupt_manifest_is_discarded(self):
+        """Test that an unreadable manifest starts an empty one"""
+        self._write(self.manifest_path, "{not json")
+        manifest = BuildManifest.load(self.manifest_path, self.output_dir)
+        self.assertEqual(manifest.entries, {})
+
+    def test_remove_stale(self):
+        """Test that outputs of deleted sources are removed"""
+        self._build()
+        manifest = BuildManifest.load(self.manifest_path, self.output_dir)
+        removed = manifest.remove_stale()
+        self.assertEqual(removed, [self.dest])
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertEqual(manifest.entries, {})
+
+if __name__ == "__main__":
+    unittest.main()
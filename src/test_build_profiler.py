@@ -0,0 +1,61 @@
+import os
+import unittest
+
+from build_profiler import BuildProfiler, PAGE_PHASES
+from build_context import BuildContext
+from generate_pages import generate_page
+from markdown_to_html_node import markdown_to_html_node
+from test_helpers import TempDirTestCase
+
+MARKDOWN = "# Title\n\nSome **bold** text\n\n- a\n- b\n\n```\ncode\n```"
+
+class TestBuildProfiler(TempDirTestCase):
+
+    def test_profiled_parse_matches(self):
+        """Test that the profiled parse builds the same tree"""
+        profiler = BuildProfiler()
+        profiler.start_page("a.md", "a.html")
+        profiled = markdown_to_html_node(MARKDOWN, profiler).to_html()
+        self.assertEqual(profiled, markdown_to_html_node(MARKDOWN).to_html())
+        self.assertEqual(
+            set(profiler.pages[0]["phases"]),
+            {"markdown_to_blocks", "block_to_block_type", "inline"},
+        )
+
+    def test_generate_page_times_every_phase(self):
+        """Test that a profiled page records every phase and its sizes"""
+        source = self._write("index.md", MARKDOWN)
+        template_path = self._write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        dest = os.path.join(self.root, "out", "index.html")
+
+        profiler = BuildProfiler()
+        generate_page(source, dest, BuildContext(template_path, profiler=profiler))
+        output_size = os.path.getsize(dest)
+
+        page = profiler.pages[0]
+        # Every phase but the render cache lookup, as no cache was given
+        self.assertEqual(set(page["phases"]), set(PAGE_PHASES) - {"cache"})
+        self.assertEqual(page["bytes_in"], len(MARKDOWN))
+        self.assertEqual(page["bytes_out"], output_size)
+        self.assertFalse(page["skipped"])
+
+    def test_report(self):
+        """Test aggregate totals and the slowest page list"""
+        profiler = BuildProfiler()
+        for name, seconds in (("a", 0.1), ("b", 0.3), ("c", 0.2)):
+            profiler.start_page(f"{name}.md", f"{name}.html")
+            profiler.add("inline", seconds)
+            profiler.finish_page(10, "<p>x</p>")
+            profiler.pages[-1]["seconds"] = seconds
+        profiler.start_page("d.md", "d.html")
+        profiler.finish_page(5)
+
+        report = profiler.report(top=2)
+        aggregate = report["aggregate"]
+        self.assertEqual((aggregate["pages"], aggregate["pages_built"], aggregate["pages_skipped"]), (4, 3, 1))
+        self.assertEqual((aggregate["bytes_in"], aggregate["bytes_out"]), (35, 24))
+        self.assertAlmostEqual(aggregate["phases"]["inline"], 0.6)
+        self.assertEqual([page["source"] for page in report["slowest_pages"]], ["b.md", "c.md"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import deploy_manifest
+from build_manifest import hash_bytes
+from deploy_manifest import DEPLOY_MANIFEST_NAME, DeployManifest, build_deploy_manifest, diff_manifests
+from main import diff_manifest_command
+from static_sync import sync_static
+from test_helpers import TempDirTestCase
+
+class TestDeployManifest(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.index = self._write("index.html", b"<p>home</p>")
+        self.post = self._write(os.path.join("blog", "index.html"), b"<p>blog</p>")
+        self.paths = ["index.html", os.path.join("blog", "index.html")]
+
+    def test_known_hashes_are_not_read(self):
+        """Test that hashes from memory are used without hashing the files"""
+        known = {path: (11, "known") for path in self.paths}
+        with mock.patch.object(deploy_manifest, "hash_file", side_effect=AssertionError("read")):
+            manifest = build_deploy_manifest(self.root, self.paths, known)
+        self.assertEqual(set(manifest.files), {"index.html", "blog/index.html"})
+        self.assertEqual(manifest.files["blog/index.html"]["sha256"], "known")
+
+    def test_unchanged_files_reuse_previous_hashes(self):
+        """Test that files whose size and mtime match are not hashed again"""
+        previous = build_deploy_manifest(self.root, self.paths, {})
+        self.assertEqual(previous.files["index.html"]["sha256"], hash_bytes(b"<p>home</p>"))
+        with mock.patch.object(deploy_manifest, "hash_file", side_effect=AssertionError("read")):
+            manifest = build_deploy_manifest(self.root, self.paths, {}, previous)
+        self.assertEqual(manifest.files, previous.files)
+
+    def test_modified_file_is_hashed_again(self):
+        """Test that a file changed behind the build's back is re-hashed"""
+        previous = build_deploy_manifest(self.root, self.paths, {})
+        self._write("index.html", b"<p>HOME</p>")
+        os.utime(self.index, ns=(1, 1))
+        manifest = build_deploy_manifest(self.root, self.paths, {}, previous)
+        self.assertEqual(manifest.files["index.html"]["sha256"], hash_bytes(b"<p>HOME</p>"))
+
+    def test_missing_files_are_left_out(self):
+        """Test that listed paths that do not exist are skipped"""
+        manifest = build_deploy_manifest(self.root, self.paths + ["gone.html"], {})
+        self.assertNotIn("gone.html", manifest.files)
+
+    def test_diff_manifests(self):
+        """Test added, changed and removed paths, ignoring mtime-only changes"""
+        old = DeployManifest()
+        old.add("same.html", 1, "a", 1)
+        old.add("touched.html", 1, "a", 1)
+        old.add("changed.html", 1, "a", 1)
+        old.add("removed.html", 1, "a", 1)
+        new = DeployManifest()
+        new.add("same.html", 1, "a", 1)
+        new.add("touched.html", 1, "a", 2)
+        new.add("changed.html", 1, "b", 1)
+        new.add("added.html", 1, "a", 1)
+        self.assertEqual(diff_manifests(old, new), (["added.html"], ["changed.html"], ["removed.html"]))
+
+    def test_save_and_load(self):
+        """Test that a manifest round-trips through its JSON file"""
+        manifest = build_deploy_manifest(self.root, self.paths, {})
+        path = self._write(DEPLOY_MANIFEST_NAME, manifest.to_json())
+        self.assertEqual(DeployManifest.load(path).files, manifest.files)
+        self.assertEqual(DeployManifest.load(os.path.join(self.root, "missing.json")).files, {})
+
+    def test_static_copies_are_hashed_while_copying(self):
+        """Test that the static sync reports the hashes of the files it copied"""
+        source = os.path.join(self.root, "static")
+        self._write(os.path.join("static", "images", "a.png"), b"png-a")
+        result = sync_static(source, os.path.join(self.root, "out"))
+        self.assertEqual(result.hashes, {os.path.join("images", "a.png"): (5, hash_bytes(b"png-a"))})
+
+    def test_diff_manifest_command(self):
+        """Test the command's output lines"""
+        old = build_deploy_manifest(self.root, self.paths, {})
+        old_path = self._write("old.json", old.to_json())
+        self._write("index.html", b"<p>new home</p>")
+        self._write("new.html", b"<p>new</p>")
+        new = build_deploy_manifest(self.root, ["index.html", "new.html"], {}, old)
+        new_path = self._write("new.json", new.to_json())
+
+        out = io.StringIO()
+        with redirect_stdout(out), mock.patch("sys.stderr", io.StringIO()):
+            diff_manifest_command([old_path, new_path])
+        self.assertEqual(out.getvalue().splitlines(), ["+ new.html", "~ index.html", "- blog/index.html"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from front_matter import MAX_FRONT_MATTER_BYTES, parse_front_matter, read_metadata, split_front_matter
+from generate_pages import render_content
+from markdown_to_html_node import markdown_to_html_node
+from test_helpers import TempDirTestCase
+
+POST = """---
+title: "Why Glorfindel is More Impressive than Legolas"
+date: 2024-03-01
+# Shown on the tag pages
+tags: [tolkien, 'elves', lore]
+authors:
+  - Tom
+  - Bombadil
+---
+
+# Glorfindel
+
+Body with a --- line of its own below
+
+---
+"""
+
+METADATA = {
+    "title": "Why Glorfindel is More Impressive than Legolas",
+    "date": "2024-03-01",
+    "tags": ["tolkien", "elves", "lore"],
+    "authors": ["Tom", "Bombadil"],
+}
+
+class TestFrontMatter(TempDirTestCase):
+
+    def test_split_front_matter(self):
+        """Test that the header is parsed and the body starts after the closing fence"""
+        metadata, body = split_front_matter(POST)
+        self.assertEqual(metadata, METADATA)
+        self.assertTrue(body.startswith("\n# Glorfindel"))
+        self.assertTrue(body.endswith("below\n\n---\n"))
+
+    def test_no_front_matter(self):
+        """Test that a file not starting with a fence is all body"""
+        for text in ("# Title\n\n---\nx: y\n---\n", "", "---", " ---\nx: y\n---\n"):
+            self.assertEqual(split_front_matter(text), ({}, text))
+
+    def test_empty_front_matter(self):
+        """Test two fences with nothing between them"""
+        self.assertEqual(split_front_matter("---\n---\n# Title"), ({}, "# Title"))
+
+    def test_unclosed_fence_is_body(self):
+        """Test that an opening fence that is never closed is left to the markdown"""
+        for text in ("---\ntitle: x\n# Title\n", "---\n# Title\n\nBody\n"):
+            self.assertEqual(split_front_matter(text), ({}, text))
+            self.assertEqual(read_metadata(self._write("post.md", text)), {})
+        # Rendered as plain markdown, as before front matter was supported
+        title, html, _ = render_content("---\n# Title\n\nBody\n")
+        self.assertEqual(title, "Title")
+        self.assertEqual(html, markdown_to_html_node("---\n# Title\n\nBody\n").to_html())
+
+    def test_invalid_front_matter(self):
+        """Test a line that is not a key and a stray list item"""
+        for text in ("---\njust text\n---\n", "---\n- item\n---\n"):
+            with self.assertRaises(ValueError):
+                split_front_matter(text)
+
+    def test_parse_values(self):
+        """Test quoting, colons in values and empty values"""
+        metadata = parse_front_matter("url: https://example.com/a:b\nquote: 'a, b'\nempty:\nlist: []\n")
+        self.assertEqual(metadata, {"url": "https://example.com/a:b", "quote": "a, b", "empty": "", "list": []})
+
+    def test_read_metadata(self):
+        """Test that read_metadata agrees with split_front_matter, with either line ending"""
+        self.assertEqual(read_metadata(self._write("post.md", POST)), METADATA)
+        self.assertEqual(read_metadata(self._write("post.md", POST.replace("\n", "\r\n").encode())), METADATA)
+        self.assertEqual(read_metadata(self._write("post.md", "\ufeff" + POST)), METADATA)
+        self.assertEqual(read_metadata(self._write("post.md", "# Just markdown\n")), {})
+
+    def test_read_metadata_stops_at_fence(self):
+        """Test that a body that is not valid UTF-8 is never read"""
+        path = self._write("post.md", b"---\ntitle: Binary\n---\n" + b"\xff" * 100000)
+        self.assertEqual(read_metadata(path), {"title": "Binary"})
+
+    def test_read_metadata_errors(self):
+        """Test an oversized header"""
+        with self.assertRaises(ValueError):
+            read_metadata(self._write("post.md", "---\n" + "a: b\n" * MAX_FRONT_MATTER_BYTES + "---\n"))
+
+    def test_render_content(self):
+        """Test that front matter is not rendered and its title wins over the h1"""
+        title, html, _ = render_content(POST)
+        self.assertEqual(title, METADATA["title"])
+        self.assertTrue(html.startswith("<div><h1>Glorfindel</h1>"))
+        self.assertNotIn("tags", html)
+        # Without a title in the front matter, the h1 is still used
+        title, _, _ = render_content("---\ndate: 2024-03-01\n---\n# Glorfindel\n")
+        self.assertEqual(title, "Glorfindel")
+
+    def test_render_content_rejects_list_title(self):
+        """Test that a list-valued title is a ValueError naming the file, not a template error"""
+        for header in ("title: [a, b]", "title:\n  - a\n  - b", "title: ''"):
+            with self.assertRaises(ValueError) as context:
+                render_content(f"---\n{header}\n---\n# Heading\n", source_path="content/post.md")
+            self.assertIn("content/post.md", str(context.exception))
+
+if __name__ == "__main__":
+    unittest.main()
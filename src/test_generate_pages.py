@@ -0,0 +1,77 @@
+import os
+import unittest
+
+from build_context import BuildContext
+from generate_pages import collect_pages, generate_pages_recursive
+from render_cache import RenderCache
+from test_helpers import TempDirTestCase
+
+TEMPLATE = '<html><title>{{ Title }}</title><link href="/index.css"><body>{{ Content }}</body></html>'
+
+PAGES = {
+    "index.md": "# Home\n\n![logo](/images/logo.png) and a [post](/blog/first)",
+    os.path.join("blog", "first", "index.md"): "# First\n\nSome **bold** and _italic_ text",
+    os.path.join("blog", "second", "index.md"): "# Second\n\n- one\n- two\n\n```\ncode\n```",
+    os.path.join("about", "index.md"): "# About\n\n> a quote",
+}
+
+class TestGeneratePages(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        for path, text in PAGES.items():
+            self._write(os.path.join(self.content, path), text)
+        self._write(self.template, TEMPLATE)
+
+    def _read_tree(self, root):
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_collect_pages(self):
+        """Test that every markdown file is collected with an .html destination"""
+        pages = collect_pages(self.content, "out")
+        self.assertEqual(len(pages), len(PAGES))
+        for from_path, dest_path in pages:
+            relative = os.path.relpath(from_path, self.content)
+            self.assertIn(relative, PAGES)
+            self.assertEqual(dest_path, os.path.join("out", relative[:-3] + ".html"))
+
+    def test_parallel_output_matches_serial(self):
+        """Test that a parallel build writes byte-identical pages"""
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content, serial, BuildContext(self.template, "/repo/", jobs=1))
+        generate_pages_recursive(self.content, parallel, BuildContext(self.template, "/repo/", jobs=3))
+        serial_files = self._read_tree(serial)
+        self.assertEqual(len(serial_files), len(PAGES))
+        self.assertEqual(serial_files, self._read_tree(parallel))
+
+    def test_parallel_build_uses_render_cache(self):
+        """Test that cached pages are wrapped without being sent to the workers"""
+        cache = RenderCache(os.path.join(self.root, "cache"))
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content, serial, BuildContext(self.template, "/repo/", jobs=1, cache=cache))
+        self.assertEqual((cache.hits, cache.misses), (0, len(PAGES)))
+        generate_pages_recursive(self.content, parallel, BuildContext(self.template, "/repo/", jobs=3, cache=cache))
+        self.assertEqual(cache.hits, len(PAGES))
+        self.assertEqual(self._read_tree(serial), self._read_tree(parallel))
+
+    def test_parallel_reports_failed_pages(self):
+        """Test that a failing page is reported while the others are still written"""
+        self._write(os.path.join(self.content, "broken.md"), "no title here")
+        dest = os.path.join(self.root, "parallel")
+        with self.assertRaises(RuntimeError) as context:
+            generate_pages_recursive(self.content, dest, BuildContext(self.template, jobs=2))
+        self.assertIn("broken.md", str(context.exception))
+        self.assertEqual(len(self._read_tree(dest)), len(PAGES))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    A test case working in a fresh temporary directory.
+
+    setUp creates the directory as self.root and registers its removal with
+    addCleanup, so subclasses need no tearDown for it; a subclass's setUp
+    calls super().setUp() first.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def _write(self, path, data):
+        """
+        Write a file, creating its parent directories.
+
+        Args:
+            path (str): Path of the file, relative to self.root or absolute
+            data (str | bytes): The contents; text is written as UTF-8
+
+        Returns:
+            str: The full path of the file
+        """
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _read(self, path):
+        """Return the text of a file, relative to self.root or absolute."""
+        with open(os.path.join(self.root, path), encoding='utf-8') as f:
+            return f.read()
@@ -0,0 +1,81 @@
+import unittest
+
+from html_minify import HTMLMinifier
+from leafnode import LeafNode
+from markdown_to_html_node import markdown_to_html_node
+from page_template import Template
+from parentnode import ParentNode
+
+MARKDOWN = """# Title
+
+Some  **bold**   text and a [link](/blog/first)
+
+> a quote
+> over two lines
+
+```
+def f():
+    return  1
+```
+
+Inline `a  b` code
+"""
+
+class TestHTMLMinifier(unittest.TestCase):
+
+    def setUp(self):
+        self.minifier = HTMLMinifier()
+
+    def test_text_whitespace_is_collapsed(self):
+        """Test that runs of whitespace become one space, but a non-breaking space stays"""
+        node = ParentNode("p", [LeafNode(None, "a \n\t b  c")])
+        self.assertEqual(node.to_html(self.minifier), "<p>a b  c</p>")
+        self.assertEqual(self.minifier.bytes_saved, 3)
+
+    def test_pre_and_code_are_preserved(self):
+        """Test that whitespace inside pre and code subtrees is kept"""
+        node = markdown_to_html_node(MARKDOWN)
+        html = node.to_html(self.minifier)
+        self.assertIn("<pre><code>def f():\n    return  1\n</code></pre>", html)
+        self.assertIn("<code>a  b</code>", html)
+        self.assertIn("<b>bold</b> text", html)
+        # The preserved subtree does not switch minifying off for what follows
+        self.assertIn("<p>Inline ", html)
+
+    def test_attribute_quotes(self):
+        """Test that only values that are valid unquoted lose their quotes"""
+        node = LeafNode("img", "", {"src": "/a.png", "alt": "two words", "title": ""})
+        self.assertEqual(node.to_html(self.minifier), '<img src=/a.png alt="two words" title=""></img>')
+        self.assertEqual(self.minifier.bytes_saved, 2)
+
+    def test_bytes_saved_matches_output(self):
+        """Test that bytes_saved is exactly the difference to the unminified HTML"""
+        node = markdown_to_html_node(MARKDOWN)
+        html = node.to_html()
+        minified = node.to_html(self.minifier)
+        self.assertEqual(self.minifier.bytes_saved, len(html) - len(minified))
+
+    def test_minify_document(self):
+        """Test whitespace between block tags, inline tags, comments and preserved elements"""
+        html = ('<!doctype html>\n<html>\n  <head>\n    <title> A  page </title>\n  </head>\n'
+                '  <body>\n    <b>x</b>\n  <i>y</i>\n<!--  keep  -->\n<pre>\n  a   b\n</pre>\n  </body>\n</html>\n')
+        minified = self.minifier.minify_document(html)
+        self.assertEqual(minified, '<!doctype html><html><head><title> A page </title></head><body>'
+                                   '<b>x</b> <i>y</i> <!--  keep  --><pre>\n  a   b\n</pre></body></html>')
+        self.assertEqual(self.minifier.bytes_saved, len(html) - len(minified))
+
+    def test_unquote_attributes(self):
+        """Test that a value directly followed by '/' keeps its quotes"""
+        html = '<meta charset="utf-8" /><link href="/x.css"/><p title="a b">"quoted" text="kept"</p>'
+        self.assertEqual(self.minifier.unquote_attributes(html),
+                         '<meta charset=utf-8 /><link href="/x.css"/><p title="a b">"quoted" text="kept"</p>')
+
+    def test_minified_template(self):
+        """Test that the template is minified once, after the basepath is applied"""
+        template = Template('<html>\n  <link href="/index.css" />\n  <body>{{ Content }}</body>\n</html>\n',
+                            "/repo/", minify=True)
+        self.assertEqual(template.render(Content="c"), '<html><link href=/repo/index.css /><body>c</body></html>')
+        self.assertEqual(template.bytes_saved, 10)
+
+if __name__ == "__main__":
+    unittest.main()
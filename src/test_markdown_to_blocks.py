@@ -1,5 +1,6 @@
+import io
 import unittest
-from markdown_to_blocks import markdown_to_blocks
+from markdown_to_blocks import iter_blocks, markdown_to_blocks
 
 class TestMarkdownToBlocks(unittest.TestCase):
     
@@ -200,6 +201,35 @@ End of document."""
         blocks = markdown_to_blocks(md)
         expected = ["First block", "Second block", "Third block"]
         self.assertEqual(blocks, expected)
+    
+    def test_fenced_code_keeps_blank_lines(self):
+        """Test that blank lines inside a fenced code block do not split it"""
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+        blocks = markdown_to_blocks(md)
+        expected = ["Intro", "```\nfirst\n\n\nsecond\n```", "Outro"]
+        self.assertEqual(blocks, expected)
+    
+    def test_single_line_fence(self):
+        """Test that a fence closed on its own line does not swallow what follows"""
+        md = "```code```\n\nNext"
+        self.assertEqual(markdown_to_blocks(md), ["```code```", "Next"])
+    
+    def test_unclosed_fence_runs_to_the_end(self):
+        """Test that a fence that is never closed keeps the rest of the document"""
+        md = "```\ncode\n\nmore"
+        self.assertEqual(markdown_to_blocks(md), ["```\ncode\n\nmore"])
+    
+    def test_iter_blocks_reads_file_in_chunks(self):
+        """Test that a file object read in tiny chunks gives the same blocks"""
+        md = "# Title\n\nSome text\nmore text\n\n```\na\n\nb\n```\n\n- one\n- two\n"
+        self.assertEqual(list(iter_blocks(io.StringIO(md), chunk_size=3)), markdown_to_blocks(md))
+    
+    def test_iter_blocks_is_lazy(self):
+        """Test that blocks are yielded before the rest of the file is read"""
+        source = io.StringIO("First\n\n" + "x\n" * 1000)
+        blocks = iter_blocks(source, chunk_size=16)
+        self.assertEqual(next(blocks), "First")
+        self.assertLess(source.tell(), 100)
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,11 @@
+import io
+import os
+import random
 import unittest
-from markdown_to_html_node import markdown_to_html_node
+from markdown_to_html_node import DocumentOutline, markdown_to_html, markdown_to_html_node, write_markdown_html
+from generate_pages import render_content
+from build_profiler import BuildProfiler
+from url_rewrite import basepath_rewriter, rewrite_node_urls
 
 class TestMarkdownToHTMLNode(unittest.TestCase):
     
@@ -222,6 +228,151 @@ function fibonacci(n) {
         html = node.to_html()
         expected = '<div><pre><code>function fibonacci(n) {\n    if (n <= 1) return n;\n    return fibonacci(n-1) + fibonacci(n-2);\n}\n</code></pre></div>'
         self.assertEqual(html, expected)
+    
+    def test_code_block_with_blank_lines(self):
+        """Test that a fenced code block with blank lines stays one pre element"""
+        md = "```\nfirst\n\nsecond\n```"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, "<div><pre><code>first\n\nsecond\n</code></pre></div>")
+    
+    def test_write_markdown_html_from_file(self):
+        """Test that streaming a file writes the same HTML as the node tree"""
+        md = "# Title\n\nSome **bold** text\n\n> quote\n\n```\ncode\n\nmore\n```\n\n1. one\n2. two\n"
+        out = io.StringIO()
+        write_markdown_html(io.StringIO(md), out)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(md).to_html())
+
+# Blocks the differential test draws from, including near-misses of every
+# block type and inline markup next to block syntax
+DIFFERENTIAL_BLOCKS = [
+    "Plain words",
+    "Text with **bold**, _italic_, *star italic* and `code`\nover two lines",
+    "A [link](/blog/first) and an ![image](/images/a.png \"t\") and [far](https://example.com)",
+    "# Heading with **bold**",
+    "###### Six",
+    "####### Seven is a paragraph",
+    "#No space",
+    "## Heading\nwith a second line",
+    "```\ncode with **no** _inline_\n\n  indented\n```",
+    "```no newline```",
+    "``` ```",
+    "> quote with [a link](/x)\n>\n> and `code`",
+    ">no space\n> two",
+    "> quote\nnot quote",
+    "- item **one**\n-   padded item  \n- ![img](/i.png)",
+    "- item\nnot item",
+    "1. first\n2. second with _italic_\n3. third",
+    "1. first\n3. skipped",
+    "10. not from one",
+    "Trailing spaces   ",
+]
+
+class TestMarkdownToHTML(unittest.TestCase):
+    
+    def assertSameHTML(self, md, rewrite=None):
+        try:
+            node = markdown_to_html_node(md)
+        except ValueError as error:
+            # Joined blocks can be invalid; then both must fail the same way
+            with self.assertRaises(ValueError) as raised:
+                markdown_to_html(md, rewrite)
+            self.assertEqual(str(raised.exception), str(error))
+            return
+        if rewrite is not None:
+            rewrite_node_urls(node, rewrite)
+        self.assertEqual(markdown_to_html(md, rewrite), node.to_html(), md)
+    
+    def test_random_documents_match_node_tree(self):
+        """Test that the direct emitter writes the node tree's HTML for random documents"""
+        rnd = random.Random(7)
+        for _ in range(300):
+            blocks = rnd.choices(DIFFERENTIAL_BLOCKS, k=rnd.randint(0, 12))
+            separator = rnd.choice(["\n\n", "\n\n\n", "\n \n"])
+            self.assertSameHTML(separator.join(blocks))
+    
+    def test_content_pages_match_node_tree(self):
+        """Test the site's own pages, with and without a basepath"""
+        content = os.path.join(os.path.dirname(__file__), "..", "content")
+        for root, _, files in os.walk(content):
+            for name in files:
+                if name.endswith(".md"):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        md = f.read()
+                    self.assertSameHTML(md)
+                    self.assertSameHTML(md, basepath_rewriter("/repo/"))
+    
+    def test_reads_file_objects(self):
+        """Test that a file object is scanned like a string"""
+        md = "# Title\n\n" + "\n\n".join(DIFFERENTIAL_BLOCKS)
+        self.assertEqual(markdown_to_html(io.StringIO(md)), markdown_to_html_node(md).to_html())
+    
+    def test_rewrite(self):
+        """Test that only link and image URLs go through the rewrite"""
+        html = markdown_to_html("[a](/a) ![b](/b.png) `/c`", basepath_rewriter("/repo/"))
+        self.assertEqual(html, '<div><p><a href="/repo/a">a</a> <img src="/repo/b.png" alt="b"></img> <code>/c</code></p></div>')
+    
+    def test_profiled(self):
+        """Test that profiling the direct path times its phases and keeps the output"""
+        md = "# Title\n\n" + "\n\n".join(DIFFERENTIAL_BLOCKS[:8])
+        profiler = BuildProfiler()
+        page = profiler.start_page("page.md", "page.html")
+        outline = DocumentOutline()
+        self.assertEqual(markdown_to_html(md, outline=outline, profiler=profiler), markdown_to_html(md))
+        self.assertEqual(set(page["phases"]), {"markdown_to_blocks", "block_to_block_type", "inline", "to_html"})
+        self.assertEqual(outline.title, "Title")
+    
+    def test_errors_match_node_tree(self):
+        """Test that invalid markdown raises the same error on both paths"""
+        for md in ("Unmatched **bold", "A [link]() without a URL", "An ![image]() without a URL"):
+            with self.assertRaises(ValueError) as expected:
+                markdown_to_html_node(md)
+            with self.assertRaises(ValueError) as raised:
+                markdown_to_html(md)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+
+class TestDocumentOutline(unittest.TestCase):
+    
+    MARKDOWN = """```
+# not a heading
+```
+
+Intro with #hash
+
+# The **Title**
+
+## Usage
+
+# Second h1
+
+### Details"""
+    
+    def test_outline_from_both_paths(self):
+        """Test that the node tree and the direct emitter record the same headings"""
+        expected = [(1, "The **Title**"), (2, "Usage"), (1, "Second h1"), (3, "Details")]
+        for convert in (markdown_to_html_node, markdown_to_html):
+            outline = DocumentOutline()
+            convert(self.MARKDOWN, outline=outline)
+            self.assertEqual(outline.title, "The **Title**")
+            self.assertEqual(outline.headings, expected)
+    
+    def test_no_h1(self):
+        """Test that a document without an h1 block has no title"""
+        outline = DocumentOutline()
+        markdown_to_html("## Only h2\n\n#NoSpace", outline=outline)
+        self.assertIsNone(outline.title)
+        self.assertEqual(outline.headings, [(2, "Only h2")])
+    
+    def test_render_content_title(self):
+        """Test that render_content takes the title from the parse, on every path"""
+        profiler = BuildProfiler()
+        profiler.start_page("page.md", "page.html")
+        for timer in (None, profiler):
+            title, _, _ = render_content(self.MARKDOWN, timer)
+            self.assertEqual(title, "The **Title**")
+        # A '#Title' line is not a heading block, so extract_title still finds it
+        self.assertEqual(render_content("#Title\n\nBody")[0], "Title")
+        with self.assertRaises(ValueError):
+            render_content("## No title")
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+
+from output_writer import OutputWriter
+from test_helpers import TempDirTestCase
+
+class TestOutputWriter(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "blog", "index.html")
+        self.writer = OutputWriter()
+
+    def _read_output(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_new_file_is_written(self):
+        """Test that a missing file and its directory are created"""
+        self.assertTrue(self.writer.write(self.path, b"<p>hi</p>"))
+        self.assertEqual(self._read_output(), b"<p>hi</p>")
+        self.assertEqual((self.writer.written, self.writer.unchanged), (1, 0))
+
+    def test_identical_file_is_left_alone(self):
+        """Test that identical contents keep the file's inode and mtime"""
+        self.writer.write(self.path, b"<p>hi</p>")
+        os.utime(self.path, ns=(10**9, 10**9))
+        inode = os.stat(self.path).st_ino
+
+        self.assertFalse(self.writer.write(self.path, b"<p>hi</p>"))
+        stat = os.stat(self.path)
+        self.assertEqual((stat.st_ino, stat.st_mtime_ns), (inode, 10**9))
+        self.assertEqual((self.writer.written, self.writer.unchanged), (1, 1))
+
+    def test_changed_file_is_replaced(self):
+        """Test that same-size and different-size changes are both written"""
+        self.writer.write(self.path, b"<p>hi</p>")
+        self.assertTrue(self.writer.write(self.path, b"<p>ho</p>"))
+        self.assertEqual(self._read_output(), b"<p>ho</p>")
+        self.assertTrue(self.writer.write(self.path, b"<p>hello</p>"))
+        self.assertEqual(self._read_output(), b"<p>hello</p>")
+        self.assertEqual((self.writer.written, self.writer.unchanged), (3, 0))
+
+if __name__ == "__main__":
+    unittest.main()
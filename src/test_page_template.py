@@ -0,0 +1,59 @@
+import unittest
+
+from page_template import Template, rewrite_basepath
+
+class TestPageTemplate(unittest.TestCase):
+
+    def test_render_slots(self):
+        """Test that every placeholder is replaced with its value"""
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.slots, {"Title", "Content"})
+        self.assertEqual(
+            template.render(Title="Hi", Content="<p>x</p>"),
+            "<title>Hi</title><main><p>x</p></main>",
+        )
+
+    def test_repeated_and_arbitrary_slots(self):
+        """Test that any name can be used, more than once, with loose spacing"""
+        template = Template("{{Author}} wrote {{ Title }} ({{  Author  }})")
+        self.assertEqual(template.render(Author="Ann", Title="Post"), "Ann wrote Post (Ann)")
+
+    def test_values_are_not_rescanned(self):
+        """Test that placeholders inside values are left alone"""
+        template = Template("{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render(Title="{{ Content }}", Content="c"), "{{ Content }}|c")
+
+    def test_missing_value(self):
+        """Test that rendering without a value for a slot fails"""
+        template = Template("{{ Title }}")
+        with self.assertRaises(ValueError) as context:
+            template.render(Content="x")
+        self.assertEqual(str(context.exception), "No value for template slot: Title")
+
+    def test_unused_values_are_ignored(self):
+        """Test that values without a slot are ignored"""
+        self.assertEqual(Template("<p>{{ Content }}</p>").render(Title="t", Content="c"), "<p>c</p>")
+
+    def test_check_slots(self):
+        """Test that unknown placeholders are reported up front"""
+        template = Template("{{ Title }} {{ Auther }} {{ Date }}")
+        template.check_slots(["Title", "Auther", "Date"])
+        with self.assertRaises(ValueError) as context:
+            template.check_slots(["Title", "Content"])
+        self.assertEqual(str(context.exception), "Unknown template slot(s): Auther, Date")
+
+    def test_basepath_applied_to_literals(self):
+        """Test that the template's own links get the basepath at compile time"""
+        template = Template('<link href="/index.css"><img src="/a.png">{{ Content }}', "/repo/")
+        self.assertEqual(
+            template.render(Content='<a href="/x">'),
+            '<link href="/repo/index.css"><img src="/repo/a.png"><a href="/x">',
+        )
+
+    def test_rewrite_basepath(self):
+        """Test rewriting of root-relative links in a fragment"""
+        self.assertEqual(rewrite_basepath('<a href="/x">', "/repo/"), '<a href="/repo/x">')
+        self.assertEqual(rewrite_basepath('<a href="/x">', "/"), '<a href="/x">')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import gzip
+import os
+import unittest
+
+from build_manifest import remove_output
+from output_writer import OutputWriter
+from precompress import Precompressor
+from static_sync import sync_static
+from test_helpers import TempDirTestCase
+
+# Compresses well, so its .gz copy is always kept
+PAGE = b"<p>" + b"hello world " * 200 + b"</p>"
+
+class TestPrecompress(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "blog", "index.html")
+        self.compressor = Precompressor(workers=2)
+        self.writer = OutputWriter(self.compressor)
+        self.addCleanup(self.compressor.close)
+
+    def _read_gzip(self, path):
+        with gzip.open(path + ".gz", 'rb') as f:
+            return f.read()
+
+    def test_html_gets_gzip_copy(self):
+        """Test that a written page gets a .gz copy with the same contents"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        self.assertEqual(self._read_gzip(self.path), PAGE)
+        self.assertEqual(self.compressor.compressed, 1)
+        self.assertIn(self.path + ".gz", self.compressor.hashes)
+
+    def test_images_are_not_compressed(self):
+        """Test that binary assets get no .gz copy"""
+        image = os.path.join(self.root, "image.png")
+        self.writer.write(image, PAGE)
+        self.compressor.wait()
+        self.assertFalse(os.path.exists(image + ".gz"))
+
+    def test_gzip_copy_is_deterministic(self):
+        """Test that recompressing the same bytes leaves the .gz file alone"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        os.utime(self.path + ".gz", ns=(10**9, 10**9))
+        inode = os.stat(self.path + ".gz").st_ino
+
+        self.compressor.compress(self.path, PAGE)
+        self.compressor.wait()
+        stat = os.stat(self.path + ".gz")
+        self.assertEqual((stat.st_ino, stat.st_mtime_ns), (inode, 10**9))
+
+    def test_unchanged_page_keeps_gzip_copy(self):
+        """Test that an unchanged page is not compressed again"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        self.writer.write(self.path, PAGE)
+        self.writer.keep(self.path)
+        self.compressor.wait()
+        self.assertEqual((self.compressor.compressed, self.compressor.unchanged), (1, 2))
+
+    def test_skipped_page_without_copy_is_compressed(self):
+        """Test that a page skipped by the build still gets its first .gz copy"""
+        self._write(self.path, PAGE)
+        self.writer.keep(self.path)
+        self.compressor.wait()
+        self.assertEqual(self._read_gzip(self.path), PAGE)
+
+    def test_changed_settings_recompress_unchanged_page(self):
+        """Test that a kept page's .gz copy is redone, or dropped, once the settings change"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        fast = Precompressor(level=1, workers=1)
+        self.addCleanup(fast.close)
+        fast.recompress_unchanged = True
+        OutputWriter(fast).keep(self.path)
+        fast.wait()
+        with open(self.path + ".gz", 'rb') as f:
+            self.assertEqual(f.read(), gzip.compress(PAGE, compresslevel=1, mtime=0))
+
+        strict = Precompressor(min_saving=0.999, workers=1)
+        self.addCleanup(strict.close)
+        strict.recompress_unchanged = True
+        OutputWriter(strict).keep(self.path)
+        strict.wait()
+        self.assertFalse(os.path.exists(self.path + ".gz"))
+
+    def test_small_saving_is_skipped(self):
+        """Test that a file that barely compresses gets no .gz copy and loses an old one"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        self.writer.write(self.path, os.urandom(2000))
+        self.compressor.wait()
+        self.assertFalse(os.path.exists(self.path + ".gz"))
+        self.assertEqual(self.compressor.skipped, 1)
+
+    def test_outcomes_skip_unchanged_file_with_too_little_saving(self):
+        """Test that a file recorded as not worth a copy is not compressed again while unchanged"""
+        noise = os.urandom(2000)
+        self.writer.write(self.path, noise)
+        self.compressor.wait()
+        outcomes = self.compressor.take_outcomes()
+        self.assertEqual(outcomes, {self.path: False})
+
+        again = Precompressor(workers=1)
+        self.addCleanup(again.close)
+        again.previous_outcomes = outcomes
+        OutputWriter(again).keep(self.path)
+        again.wait()
+        self.assertEqual((again.compressed, again.skipped, again.unchanged), (0, 0, 1))
+        self.assertEqual(again.take_outcomes(), {self.path: False})
+
+    def test_writer_without_compressor_removes_stale_copy(self):
+        """Test that a page changed with compression off drops its old .gz copy"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        OutputWriter().write(self.path, b"<p>changed</p>")
+        self.assertFalse(os.path.exists(self.path + ".gz"))
+
+    def test_remove_output_removes_gzip_copy(self):
+        """Test that removing a stale output also removes its .gz copy"""
+        self.writer.write(self.path, PAGE)
+        self.compressor.wait()
+        remove_output(self.path, self.root)
+        self.assertFalse(os.path.exists(self.path + ".gz"))
+        self.assertFalse(os.path.exists(os.path.dirname(self.path)))
+
+    def test_static_sync_compresses_text_assets(self):
+        """Test that copied stylesheets get .gz copies and images do not"""
+        source = os.path.join(self.root, "static")
+        dest = os.path.join(self.root, "out")
+        self._write(os.path.join(source, "index.css"), PAGE)
+        self._write(os.path.join(source, "images", "a.png"), PAGE)
+        sync_static(source, dest, compressor=self.compressor)
+        self.compressor.wait()
+        self.assertEqual(self._read_gzip(os.path.join(dest, "index.css")), PAGE)
+        self.assertFalse(os.path.exists(os.path.join(dest, "images", "a.png.gz")))
+
+        # A second sync leaves the unchanged stylesheet's copy alone
+        sync_static(source, dest, compressor=self.compressor)
+        self.compressor.wait()
+        self.assertEqual((self.compressor.compressed, self.compressor.unchanged), (1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import unittest
+from unittest import mock
+
+import generate_pages
+from build_context import BuildContext
+from build_manifest import BuildManifest, hash_bytes
+from html_minify import HTMLMinifier
+from generate_pages import generate_page, generate_pages_recursive
+from render_cache import RenderCache
+from test_helpers import TempDirTestCase
+
+class TestRenderCache(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = RenderCache(os.path.join(self.root, "cache"))
+
+    def test_key_depends_on_content_and_renderer(self):
+        """Test that the key changes with the markdown and the renderer version"""
+        key = RenderCache.key(hash_bytes(b"# Title"))
+        self.assertEqual(key, RenderCache.key(hash_bytes(b"# Title")))
+        self.assertNotEqual(key, RenderCache.key(hash_bytes(b"# Title!")))
+        with mock.patch("render_cache.RENDERER_VERSION", "other"):
+            self.assertNotEqual(key, RenderCache.key(hash_bytes(b"# Title")))
+
+    def test_get_and_put(self):
+        """Test a miss, then a hit after storing, with the counters"""
+        key = RenderCache.key(hash_bytes(b"# Title"))
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Title", "<div><h1>Title</h1></div>")
+        self.assertEqual(self.cache.get(key), ("Title", "<div><h1>Title</h1></div>", {}, 0))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that a damaged entry is treated as missing"""
+        key = RenderCache.key(hash_bytes(b"x"))
+        self._write(self.cache._path(key), '{"title": "x"')
+        self.assertIsNone(self.cache.get(key))
+
+    def test_prune_evicts_least_recently_used(self):
+        """Test that pruning keeps the most recently used entries"""
+        keys = [RenderCache.key(hash_bytes(str(i).encode())) for i in range(4)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, "t", "x" * 100)
+            os.utime(self.cache._path(key), ns=(i * 10**9, i * 10**9))
+        # Using the oldest entry makes it the newest
+        self.cache.get(keys[0])
+
+        entry_size = os.path.getsize(self.cache._path(keys[0]))
+        self.cache.max_bytes = entry_size * 2
+        self.assertEqual(self.cache.prune(), 2)
+        self.assertEqual(self.cache.evicted, 2)
+        remaining = [key for key in keys if os.path.exists(self.cache._path(key))]
+        self.assertEqual(remaining, [keys[0], keys[3]])
+
+    def test_generate_page_uses_cache(self):
+        """Test that a cached page is written without parsing the markdown again"""
+        source = self._write(os.path.join(self.root, "index.md"), "# Home\n\nSome **bold** text")
+        template_path = self._write(os.path.join(self.root, "template.html"), "{{ Title }}|{{ Content }}")
+        context = BuildContext(template_path, cache=self.cache)
+        first = os.path.join(self.root, "first.html")
+        second = os.path.join(self.root, "second.html")
+
+        generate_page(source, first, context)
+        # Every parse, on the node tree or the direct path, goes through render_content
+        with mock.patch.object(generate_pages, "render_content", side_effect=AssertionError("parsed")):
+            generate_page(source, second, context)
+
+        with open(first, encoding='utf-8') as f1, open(second, encoding='utf-8') as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_cached_minified_body_counts_its_saving(self):
+        """Test that a minified body from the cache adds the bytes it saved when rendered"""
+        content = os.path.join(self.root, "content")
+        for name in ("a", "b"):
+            self._write(os.path.join(content, name, "index.md"), f"# {name}\n\nSome   spaced\n  out text")
+        template_path = self._write(os.path.join(self.root, "template.html"), "<p>\n  {{ Content }}\n</p>")
+
+        savings = []
+        for jobs in (1, 1, 2):
+            minifier = HTMLMinifier()
+            context = BuildContext(template_path, jobs=jobs, cache=self.cache, minifier=minifier)
+            generate_pages_recursive(content, os.path.join(self.root, "docs"), context)
+            savings.append(minifier.bytes_saved)
+        self.assertEqual((self.cache.hits, self.cache.misses), (4, 2))
+        self.assertGreater(savings[0], 0)
+        self.assertEqual(savings, [savings[0]] * 3)
+
+class TestTemplateOnlyRebuild(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        root = self.root
+        self.content = os.path.join(root, "content")
+        self.dest = os.path.join(root, "docs")
+        self.template_path = os.path.join(root, "template.html")
+        for name in ("a", "b", "c"):
+            self._write(os.path.join(self.content, name, "index.md"), f"# {name}\n\nSome _text_ for {name}")
+        self._write(self.template_path, "<title>{{ Title }}</title>{{ Content }}")
+        self.manifest = BuildManifest(os.path.join(root, "manifest.json"), self.dest)
+        self.cache = RenderCache(os.path.join(root, "cache"))
+        generate_pages_recursive(self.content, self.dest,
+                                 BuildContext(self.template_path, cache=self.cache, manifest=self.manifest))
+
+    def _rebuild_with_new_template(self, jobs):
+        self._write(self.template_path, "<h2>{{ Title }}</h2>{{ Content }}")
+        manifest = BuildManifest(self.manifest.path, self.dest, self.manifest.entries)
+        # Every parse, on the node tree or the direct path, goes through render_content
+        with mock.patch.object(generate_pages, "render_content", side_effect=AssertionError("parsed")):
+            generate_pages_recursive(self.content, self.dest,
+                                     BuildContext(self.template_path, jobs=jobs, cache=self.cache, manifest=manifest))
+        self.assertEqual(manifest.rebuilt, 3)
+        with open(os.path.join(self.dest, "b", "index.html"), encoding='utf-8') as f:
+            self.assertEqual(f.read(), "<h2>b</h2><div><h1>b</h1><p>Some <i>text</i> for b</p></div>")
+
+    def test_serial_template_change_only_rewraps(self):
+        """Test that a template-only change rebuilds every page without parsing"""
+        self._rebuild_with_new_template(jobs=1)
+
+    def test_parallel_template_change_only_rewraps(self):
+        """Test that a parallel build wraps cached bodies without starting workers"""
+        with mock.patch.object(generate_pages, "ProcessPoolExecutor", side_effect=AssertionError("pool")):
+            self._rebuild_with_new_template(jobs=3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -333,6 +333,27 @@ class TestSplitNodesImageLink(unittest.TestCase):
             TextNode("GitHub repo", TextType.LINK, "https://github.com/user/repo-name?tab=readme#installation"),
         ]
         self.assertListEqual(expected_link, new_nodes_link)
+    
+    def test_split_links_same_markdown_as_image(self):
+        """Test that an image with the same text and URL as a later link is kept"""
+        node = TextNode("![x](u) and [x](u)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("![x](u) and ", TextType.TEXT),
+                TextNode("x", TextType.LINK, "u"),
+            ],
+            new_nodes,
+        )
+    
+    def test_split_many_links(self):
+        """Test a link-dense paragraph is split into every link and separator"""
+        text = " | ".join(f"[item {i}](/items/{i})" for i in range(1000))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 1999)
+        self.assertEqual(new_nodes[0], TextNode("item 0", TextType.LINK, "/items/0"))
+        self.assertEqual(new_nodes[1], TextNode(" | ", TextType.TEXT))
+        self.assertEqual(new_nodes[-1], TextNode("item 999", TextType.LINK, "/items/999"))
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+
+from staged_output import StagedOutput, clone_tree, replace_file
+from static_sync import sync_static
+from test_helpers import TempDirTestCase
+
+class TestStagedOutput(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.docs = os.path.join(self.root, "docs")
+        self._write(os.path.join(self.docs, "index.html"), "old home")
+        self._write(os.path.join(self.docs, "blog", "index.html"), "old blog")
+
+    def test_clone_tree_hardlinks_files(self):
+        """Test that the clone shares inodes with the original"""
+        clone = os.path.join(self.root, "clone")
+        self.assertEqual(clone_tree(self.docs, clone), (2, 0))
+        self.assertTrue(os.path.samefile(
+            os.path.join(self.docs, "blog", "index.html"),
+            os.path.join(clone, "blog", "index.html"),
+        ))
+
+    def test_replace_file_breaks_hardlink(self):
+        """Test that replacing a linked file leaves the other link unchanged"""
+        clone = os.path.join(self.root, "clone")
+        clone_tree(self.docs, clone)
+        replace_file(os.path.join(clone, "index.html"), b"new home")
+        self.assertEqual(self._read(os.path.join(clone, "index.html")), "new home")
+        self.assertEqual(self._read(os.path.join(self.docs, "index.html")), "old home")
+
+    def test_static_sync_into_staging_keeps_live_copy(self):
+        """Test that a changed static file is replaced, not written through the link"""
+        static = os.path.join(self.root, "static")
+        self._write(os.path.join(static, "index.css"), "old css")
+        first = sync_static(static, self.docs)
+
+        output = StagedOutput(self.docs)
+        staging = output.prepare()
+        self._write(os.path.join(static, "index.css"), "new css!")
+        sync_static(static, staging, first.files)
+        self.assertEqual(self._read(os.path.join(staging, "index.css")), "new css!")
+        self.assertEqual(self._read(os.path.join(self.docs, "index.css")), "old css")
+
+    def test_commit_swaps_and_keeps_previous(self):
+        """Test that commit publishes the staged build and keeps the old one"""
+        output = StagedOutput(self.docs)
+        staging = output.prepare()
+        self.assertEqual(staging, self.docs + ".staging")
+        replace_file(os.path.join(staging, "index.html"), b"new home")
+        output.commit()
+
+        self.assertFalse(os.path.exists(staging))
+        self.assertEqual(self._read(os.path.join(self.docs, "index.html")), "new home")
+        self.assertEqual(self._read(os.path.join(self.docs, "blog", "index.html")), "old blog")
+        self.assertEqual(self._read(os.path.join(self.docs + ".previous", "index.html")), "old home")
+
+        # The next commit replaces the kept previous build
+        output.prepare()
+        output.commit()
+        self.assertEqual(self._read(os.path.join(self.docs + ".previous", "index.html")), "new home")
+
+    def test_failed_build_leaves_output_untouched(self):
+        """Test that a staged build that is never committed changes nothing"""
+        output = StagedOutput(self.docs)
+        staging = output.prepare()
+        replace_file(os.path.join(staging, "index.html"), b"half done")
+        os.remove(os.path.join(staging, "blog", "index.html"))
+        self.assertEqual(self._read(os.path.join(self.docs, "index.html")), "old home")
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "blog", "index.html")))
+
+        # A leftover staging directory is replaced by a fresh clone
+        output.prepare()
+        self.assertEqual(self._read(os.path.join(staging, "index.html")), "old home")
+
+    def test_first_build(self):
+        """Test staging when there is no output directory yet"""
+        output = StagedOutput(os.path.join(self.root, "site"))
+        staging = output.prepare()
+        self.assertEqual(os.listdir(staging), [])
+        self._write(os.path.join(staging, "index.html"), "home")
+        output.commit()
+        self.assertEqual(self._read(os.path.join(self.root, "site", "index.html")), "home")
+        self.assertFalse(os.path.exists(os.path.join(self.root, "site.previous")))
+
+if __name__ == "__main__":
+    unittest.main()
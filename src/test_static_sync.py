@@ -0,0 +1,97 @@
+import os
+import unittest
+
+from staged_output import StagedOutput
+from static_sync import sync_static
+from test_helpers import TempDirTestCase
+
+class TestStaticSync(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "docs")
+        self._write(os.path.join(self.source, "index.css"), "body {}")
+        self._write(os.path.join(self.source, "images", "a.png"), "png-a")
+        self._write(os.path.join(self.source, "images", "b.png"), "png-b")
+
+    def test_first_sync_copies_everything(self):
+        """Test that an empty destination receives every file"""
+        result = sync_static(self.source, self.dest)
+        self.assertEqual((result.copied, result.unchanged, result.removed), (3, 0, 0))
+        self.assertEqual(
+            result.files,
+            {"index.css", os.path.join("images", "a.png"), os.path.join("images", "b.png")},
+        )
+        self.assertEqual(self._read(os.path.join(self.dest, "images", "b.png")), "png-b")
+
+    def test_second_sync_copies_nothing(self):
+        """Test that unchanged files are not copied again and keep their mtime"""
+        first = sync_static(self.source, self.dest)
+        dest_css = os.path.join(self.dest, "index.css")
+        mtime = os.stat(dest_css).st_mtime_ns
+        result = sync_static(self.source, self.dest, first.files)
+        self.assertEqual((result.copied, result.unchanged, result.removed), (0, 3, 0))
+        self.assertEqual(os.stat(dest_css).st_mtime_ns, mtime)
+
+    def test_changed_file_is_copied(self):
+        """Test that a modified source file is copied"""
+        first = sync_static(self.source, self.dest)
+        self._write(os.path.join(self.source, "index.css"), "body { color: red }")
+        result = sync_static(self.source, self.dest, first.files)
+        self.assertEqual(result.copied, 1)
+        self.assertEqual(self._read(os.path.join(self.dest, "index.css")), "body { color: red }")
+
+    def test_same_size_changed_contents_is_copied(self):
+        """Test that a same-size edit with a new mtime is detected by hashing"""
+        first = sync_static(self.source, self.dest)
+        source_png = os.path.join(self.source, "images", "a.png")
+        self._write(source_png, "png-z")
+        os.utime(source_png, ns=(1, 1))
+        result = sync_static(self.source, self.dest, first.files)
+        self.assertEqual(result.copied, 1)
+        self.assertEqual(self._read(os.path.join(self.dest, "images", "a.png")), "png-z")
+
+    def test_touched_file_is_not_copied(self):
+        """Test that an mtime-only change fixes the mtime without copying"""
+        first = sync_static(self.source, self.dest)
+        source_css = os.path.join(self.source, "index.css")
+        os.utime(source_css, ns=(10**18, 10**18))
+        result = sync_static(self.source, self.dest, first.files)
+        self.assertEqual((result.copied, result.unchanged), (0, 3))
+        self.assertEqual(os.stat(os.path.join(self.dest, "index.css")).st_mtime_ns, 10**18)
+
+    def test_touched_file_in_staged_build_keeps_live_file(self):
+        """Test that a staged sync replaces a touched file instead of changing the live inode"""
+        first = sync_static(self.source, self.dest)
+        live_css = os.path.join(self.dest, "index.css")
+        live_stat = os.stat(live_css)
+        live_identity = (live_stat.st_ino, live_stat.st_mtime_ns)
+        os.utime(os.path.join(self.source, "index.css"), ns=(10**18, 10**18))
+
+        output = StagedOutput(self.dest)
+        staging = output.prepare()
+        result = sync_static(self.source, staging, first.files)
+        self.assertEqual((result.copied, result.unchanged), (0, 3))
+        live_stat = os.stat(live_css)
+        self.assertEqual((live_stat.st_ino, live_stat.st_mtime_ns), live_identity)
+
+        output.commit()
+        self.assertEqual(os.stat(live_css).st_mtime_ns, 10**18)
+        previous_stat = os.stat(os.path.join(output.previous_dir, "index.css"))
+        self.assertEqual((previous_stat.st_ino, previous_stat.st_mtime_ns), live_identity)
+
+    def test_deleted_source_is_removed(self):
+        """Test that only previously synced files whose source is gone are deleted"""
+        first = sync_static(self.source, self.dest)
+        page = os.path.join(self.dest, "index.html")
+        self._write(page, "<html></html>")
+        os.remove(os.path.join(self.source, "images", "a.png"))
+        os.remove(os.path.join(self.source, "images", "b.png"))
+        result = sync_static(self.source, self.dest, first.files)
+        self.assertEqual(result.removed, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(page))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,19 @@
+import itertools
 import unittest
 from textnode import TextNode, TextType
 from text_to_textnodes import text_to_textnodes
+from split_nodes_delimiter import split_nodes_delimiter
+from split_nodes_image_link import split_nodes_image, split_nodes_link
+
+def split_passes(text):
+    """The original chain of split passes that text_to_textnodes replaces."""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "*", TextType.ITALIC)
 
 class TestTextToTextNodes(unittest.TestCase):
     
@@ -238,5 +251,36 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(nodes, expected)
 
+class TestTextToTextNodesMatchesSplitPasses(unittest.TestCase):
+    
+    def _parse(self, function, text):
+        try:
+            return function(text)
+        except ValueError:
+            return ValueError
+    
+    def test_matches_split_passes(self):
+        """Test that the single-pass tokenizer agrees with the chained split passes"""
+        pieces = ["a", " ", "*", "**", "_", "`", "[x](u)", "![i](v)", "[", "](", "!"]
+        for length in range(5):
+            for combination in itertools.product(pieces, repeat=length):
+                text = "".join(combination)
+                self.assertEqual(
+                    self._parse(text_to_textnodes, text),
+                    self._parse(split_passes, text),
+                    f"Mismatch for {text!r}",
+                )
+    
+    def test_unmatched_delimiter_inside_other_span(self):
+        """Test that a delimiter cut in half by a code span is unmatched"""
+        with self.assertRaises(ValueError) as context:
+            text_to_textnodes("**bold `code** span`")
+        self.assertIn("Unmatched delimiter", str(context.exception))
+    
+    def test_delimiters_do_not_pair_across_links(self):
+        """Test that emphasis cannot span a link"""
+        with self.assertRaises(ValueError):
+            text_to_textnodes("*see [this](https://example.com) now*")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from generate_pages import render_content
+from page_template import Template
+from url_rewrite import basepath_rewriter, rewrite_html_urls
+
+MARKDOWN = """# Links
+
+A [post](/blog/first), an ![image](/images/a.png) and [elsewhere](https://example.com).
+
+Write `<a href="/x">` to link home.
+
+```
+<img src="/images/a.png">
+```
+"""
+
+class TestURLRewrite(unittest.TestCase):
+
+    def setUp(self):
+        self.rewrite = basepath_rewriter("/repo/")
+
+    def test_basepath_rewriter(self):
+        """Test that only root-relative URLs get the basepath"""
+        self.assertEqual(self.rewrite("/blog/first"), "/repo/blog/first")
+        self.assertIsNone(self.rewrite("//cdn.example.com/a.js"))
+        self.assertIsNone(self.rewrite("https://example.com/"))
+        self.assertIsNone(self.rewrite("images/a.png"))
+        self.assertIsNone(basepath_rewriter("/"))
+
+    def test_rewrite_html_urls_keeps_quoting(self):
+        """Test double-quoted, single-quoted and unquoted attributes"""
+        html = """<a href="/a"><img src='/b.png'><link href=/c.css rel=stylesheet>"""
+        self.assertEqual(rewrite_html_urls(html, self.rewrite),
+                         """<a href="/repo/a"><img src='/repo/b.png'><link href=/repo/c.css rel=stylesheet>""")
+
+    def test_rewrite_html_urls_ignores_text(self):
+        """Test that href/src text outside of tags is left alone"""
+        html = '<pre>&lt;a href="/x"&gt;</pre><p>src="/y"</p>'
+        self.assertEqual(rewrite_html_urls(html, self.rewrite), html)
+
+    def test_rendered_links_get_basepath(self):
+        """Test that link and image props are rewritten but code samples are not"""
+        _, html, _ = render_content(MARKDOWN, basepath="/repo/")
+        self.assertIn('<a href="/repo/blog/first">post</a>', html)
+        self.assertIn('<img src="/repo/images/a.png" alt="image">', html)
+        self.assertIn('<a href="https://example.com">', html)
+        self.assertIn('<code><a href="/x"></code>', html)
+        self.assertIn('<img src="/images/a.png">\n</code>', html)
+
+    def test_template_text_is_not_rewritten(self):
+        """Test that a template only has its attributes rewritten"""
+        template = Template('<a href="/">home</a> <code>href="/"</code>{{ Content }}', "/repo/")
+        self.assertEqual(template.render(Content=""), '<a href="/repo/">home</a> <code>href="/"</code>')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import unittest
+
+from build_manifest import BuildManifest, hash_bytes
+from build_context import BuildContext
+from deploy_manifest import DEPLOY_MANIFEST_NAME, DeployManifest
+from generate_pages import generate_pages_recursive
+from watch_site import rebuild_changes
+from watcher import ADDED, MODIFIED, REMOVED, PollingWatcher, diff_snapshots, take_snapshot
+from test_helpers import TempDirTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestSnapshots(TempDirTestCase):
+
+    def _write(self, path, text, mtime=None):
+        path = super()._write(path, text)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+    def test_diff_snapshots(self):
+        """Test added, modified and removed files are reported in path order"""
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), [(MODIFIED, "b"), (REMOVED, "c"), (ADDED, "d")])
+
+    def test_snapshot_walks_directories(self):
+        """Test that nested files and single watched files are recorded"""
+        nested = self._write(os.path.join("content", "blog", "index.md"), "# Blog", mtime=10**9)
+        template = self._write("template.html", TEMPLATE)
+        missing = os.path.join(self.root, "missing")
+        snapshot = take_snapshot([os.path.join(self.root, "content"), template, missing])
+        self.assertEqual(set(snapshot), {nested, template})
+        self.assertEqual(snapshot[nested], (10**9, len("# Blog")))
+
+    def test_poll(self):
+        """Test that poll reports each change once"""
+        page = self._write(os.path.join("content", "index.md"), "# Home", mtime=10**9)
+        watcher = PollingWatcher([os.path.join(self.root, "content")])
+        self.assertEqual(watcher.poll(), [])
+
+        self._write(os.path.join("content", "index.md"), "# Home!", mtime=10**9)
+        self.assertEqual(watcher.poll(), [(MODIFIED, page)])
+        self.assertEqual(watcher.poll(), [])
+
+        os.remove(page)
+        self.assertEqual(watcher.poll(), [(REMOVED, page)])
+
+class TestRebuildChanges(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        root = self.root
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.dest = os.path.join(root, "docs")
+        self.template_path = os.path.join(root, "template.html")
+        self.home = self._write(os.path.join(self.content, "index.md"), "# Home\n\nhello")
+        self.post = self._write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nposts")
+        self.css = self._write(os.path.join(self.static, "index.css"), "body {}")
+        self._write(self.template_path, TEMPLATE)
+
+        self.manifest = BuildManifest(os.path.join(root, "manifest.json"), self.dest)
+        self.context = BuildContext(self.template_path, manifest=self.manifest)
+        self.template = self.context.load_template()
+        generate_pages_recursive(self.content, self.dest, self.context)
+
+    def _rebuild(self, changes):
+        # The template in use afterwards, and the number of outputs
+        outputs = rebuild_changes(changes, self.context, self.content, self.static, self.dest)
+        return self.context.template, outputs
+
+    def test_markdown_edit_rebuilds_one_page(self):
+        """Test that editing a page rebuilds only that page"""
+        self._write(self.post, "# Blog\n\nnew posts")
+        blog_html = os.path.join(self.dest, "blog", "index.html")
+        home_mtime = os.stat(os.path.join(self.dest, "index.html")).st_mtime_ns
+
+        _, outputs = self._rebuild([(MODIFIED, self.post)])
+        self.assertEqual(outputs, 1)
+        self.assertIn("<p>new posts</p>", self._read(blog_html))
+        self.assertEqual(os.stat(os.path.join(self.dest, "index.html")).st_mtime_ns, home_mtime)
+
+    def test_rebuild_rewrites_deploy_manifest(self):
+        """Test that the deploy manifest lists the hashes of the rebuilt outputs"""
+        self._write(self.post, "# Blog\n\nnew posts")
+        self._rebuild([(MODIFIED, self.post), (ADDED, self.css)])
+        deploy = DeployManifest.load(os.path.join(self.dest, DEPLOY_MANIFEST_NAME))
+        for name in ("blog/index.html", "index.css"):
+            with open(os.path.join(self.dest, name), 'rb') as f:
+                self.assertEqual(deploy.files[name]["sha256"], hash_bytes(f.read()))
+        self.assertIn("index.html", deploy.files)
+
+    def test_deleted_page_is_removed(self):
+        """Test that deleting a markdown file removes its page"""
+        os.remove(self.post)
+        _, outputs = self._rebuild([(REMOVED, self.post)])
+        self.assertEqual(outputs, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        self.assertNotIn(self.post, self.manifest.entries)
+
+    def test_static_edit_copies_one_file(self):
+        """Test that static changes copy or remove just that file"""
+        _, outputs = self._rebuild([(ADDED, self.css)])
+        self.assertEqual(outputs, 1)
+        self.assertEqual(self._read(os.path.join(self.dest, "index.css")), "body {}")
+        self.assertEqual(self.manifest.static_files, {"index.css"})
+
+        os.remove(self.css)
+        self._rebuild([(REMOVED, self.css)])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertEqual(self.manifest.static_files, set())
+
+    def test_template_edit_rebuilds_every_page(self):
+        """Test that a template change reloads it and rebuilds all pages"""
+        self._write(self.template_path, "<h2>{{ Title }}</h2>{{ Content }}")
+        template, outputs = self._rebuild([(MODIFIED, self.template_path)])
+        self.assertEqual(outputs, 2)
+        self.assertIsNot(template, self.template)
+        self.assertEqual(self._read(os.path.join(self.dest, "index.html")),
+                         "<h2>Home</h2><div><h1>Home</h1><p>hello</p></div>")
+
+    def test_broken_template_keeps_watching(self):
+        """Test that an invalid template builds nothing until it is fixed"""
+        self._write(self.template_path, "{{ Title }}{{ Body }}")
+        template, outputs = self._rebuild([(MODIFIED, self.template_path)])
+        self.assertIsNone(template)
+        self.assertEqual(outputs, 0)
+
+        self._write(self.template_path, "{{ Title }}|{{ Content }}")
+        template, outputs = self._rebuild([(MODIFIED, self.template_path)])
+        self.assertIsNotNone(template)
+        self.assertEqual(outputs, 2)
+
+    def test_bad_page_is_reported(self):
+        """Test that a page that fails to parse does not stop the rebuild"""
+        self._write(self.post, "# Blog\n\nan **unclosed span")
+        self._write(self.home, "# Home\n\nchanged")
+        _, outputs = self._rebuild([(MODIFIED, self.post), (MODIFIED, self.home)])
+        self.assertEqual(outputs, 1)
+        self.assertIn("changed", self._read(os.path.join(self.dest, "index.html")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import sys
+import unittest
+
+from htmlnode import HTMLNode
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+class TestWriteHTML(unittest.TestCase):
+
+    def _tree(self):
+        return ParentNode("div", [
+            ParentNode("p", [
+                LeafNode(None, "Some "),
+                LeafNode("b", "bold"),
+                LeafNode(None, " and a "),
+                LeafNode("a", "link", {"href": "/x", "class": "c"}),
+            ]),
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")])]),
+            LeafNode("img", "", {"src": "/a.png", "alt": "A"}),
+        ], {"id": "main"})
+
+    def test_write_to_list(self):
+        """Test that fragments appended to a list join into to_html()"""
+        fragments = []
+        self._tree().write_html(fragments)
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual("".join(fragments), self._tree().to_html())
+
+    def test_write_to_stringio(self):
+        """Test writing to an io.StringIO writer"""
+        out = io.StringIO()
+        self._tree().write_html(out)
+        self.assertEqual(
+            out.getvalue(),
+            '<div id="main"><p>Some <b>bold</b> and a <a href="/x" class="c">link</a></p>'
+            '<ul><li>one</li></ul><img src="/a.png" alt="A"></img></div>',
+        )
+
+    def test_shared_writer(self):
+        """Test that several nodes can write into the same output"""
+        fragments = []
+        LeafNode("h1", "Title").write_html(fragments)
+        ParentNode("p", [LeafNode(None, "text")]).write_html(fragments)
+        self.assertEqual("".join(fragments), "<h1>Title</h1><p>text</p>")
+
+    def test_deep_tree_does_not_recurse(self):
+        """Test that a tree deeper than the recursion limit renders"""
+        depth = sys.getrecursionlimit() * 2
+        node = LeafNode("b", "deep")
+        for _ in range(depth):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * depth + "<b>deep</b>"))
+        self.assertTrue(html.endswith("</span>" * depth))
+
+    def test_nested_errors(self):
+        """Test that invalid nodes deep in the tree still raise"""
+        with self.assertRaises(ValueError) as context:
+            ParentNode("div", [ParentNode("p", None)]).to_html()
+        self.assertEqual(str(context.exception), "Parent nodes must have children")
+        with self.assertRaises(ValueError) as context:
+            ParentNode("div", [ParentNode("p", [LeafNode("b", None)])]).to_html()
+        self.assertEqual(str(context.exception), "All leaf nodes must have a value")
+
+    def test_base_node_not_implemented(self):
+        """Test that a plain HTMLNode cannot be rendered"""
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "text").to_html()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,47 +1,132 @@
+import re
+
 from textnode import TextNode, TextType
-from split_nodes_delimiter import split_nodes_delimiter
-from split_nodes_image_link import split_nodes_image, split_nodes_link
+from extract_markdown import IMAGE_PATTERN, LINK_PATTERN
+
+# A single regex finds every inline token in one left-to-right scan: images
+# (groups 1 and 2), links (groups 3 and 4) and the code/bold/italic delimiters,
+# with ** before * so it wins. Images are tried before links so that
+# "![alt](url)" is never read as a "!" followed by a link.
+_INLINE_TOKEN_PATTERN = re.compile(
+    f"{IMAGE_PATTERN.pattern}|{LINK_PATTERN.pattern}|`|\\*\\*|_|\\*"
+)
+
+# Delimiters by precedence. A lower level binds first: nothing inside a code
+# span is parsed, and * is not split inside **bold** or _italic_ text. This is
+# the order in which the old split_nodes_delimiter passes were applied.
+_DELIMITERS = {
+    "`": (0, TextType.CODE),
+    "**": (1, TextType.BOLD),
+    "_": (2, TextType.ITALIC),
+    "*": (3, TextType.ITALIC),
+}
 
 def text_to_textnodes(text):
     """
     Convert raw markdown text into a list of TextNode objects.
-    
+
     Takes a string of markdown-flavored text and splits it into TextNodes
     based on various markdown syntax including bold, italic, code, images, and links.
-    
+
+    The text is tokenized in a single scan instead of one split pass per kind
+    of syntax, and each TextNode is created once, in its final form. The
+    result is the same as applying split_nodes_image, split_nodes_link and
+    split_nodes_delimiter for `, **, _ and * in that order:
+
+    - images and links are found first, and delimiters never pair across them
+    - delimiters pair up in order, and a span of one kind hides the lower
+      precedence delimiters inside it (e.g. *, inside **bold**)
+    - a higher precedence delimiter inside an open span of a lower one, or a
+      span left open at the end of the text, is an unmatched delimiter
+    - empty text between tokens produces no node
+
     Args:
         text (str): Raw markdown text to convert
-        
+
     Returns:
         list: List of TextNode objects representing the parsed markdown
-        
+
+    Raises:
+        ValueError: If a delimiter is unmatched
+
     Example:
         text = "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
         nodes = text_to_textnodes(text)
         # Returns list of TextNodes with appropriate types and URLs
     """
-    # Start with a single TEXT node containing all the text
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Apply all the splitting functions in sequence
-    # Order matters here - we want to process in a logical sequence
-    
-    # 1. Split images first (![alt](url)) - they contain brackets that could interfere with links
-    nodes = split_nodes_image(nodes)
-    
-    # 2. Split links ([text](url))
-    nodes = split_nodes_link(nodes)
-    
-    # 3. Split code text (`text`) - do this before bold/italic to avoid conflicts with backticks
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    
-    # 4. Split bold text (**text**) - do this before italic to handle ** vs * properly
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    
-    # 5. Split italic text (*text*) - do this last for * to avoid conflicts with **
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-
-
-    return nodes
+    # Plain empty text stays a single empty TEXT node, as the split passes left it
+    if not text:
+        return [TextNode(text, TextType.TEXT)]
+
+    return [TextNode(value, text_type, url) for value, text_type, url in iter_inline_tokens(text)]
+
+def iter_inline_tokens(text):
+    """
+    Scan markdown text into its inline tokens without creating any nodes.
+
+    This is the tokenizer behind text_to_textnodes, for callers such as
+    markdown_to_html that write each token out straight away.
+
+    Args:
+        text (str): Raw markdown text to scan
+
+    Yields:
+        tuple: (text, text_type, url) for each token, in order; url is None
+            except for links and images
+
+    Raises:
+        ValueError: If a delimiter is unmatched
+    """
+    # Start of the text not yet emitted
+    cursor = 0
+    # The open delimiter span, if any: its delimiter, level and content start
+    open_delimiter = None
+    open_level = 0
+    open_end = 0
+
+    for match in _INLINE_TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        start = match.start()
+
+        if len(token) > 2:
+            # An image or a link ends the current run of text; delimiters
+            # cannot pair across it
+            if open_delimiter is not None:
+                _raise_unmatched(open_delimiter, text)
+            if start > cursor:
+                yield text[cursor:start], TextType.TEXT, None
+            if token[0] == "!":
+                yield match.group(1), TextType.IMAGE, match.group(2)
+            else:
+                yield match.group(3), TextType.LINK, match.group(4)
+            cursor = match.end()
+            continue
+
+        level, text_type = _DELIMITERS[token]
+        if open_delimiter is None:
+            # Opening delimiter: emit the plain text before it
+            if start > cursor:
+                yield text[cursor:start], TextType.TEXT, None
+            open_delimiter = token
+            open_level = level
+            open_end = match.end()
+        elif level == open_level:
+            # Closing delimiter: emit the span unless it is empty
+            if start > open_end:
+                yield text[open_end:start], text_type, None
+            open_delimiter = None
+            cursor = match.end()
+        elif level < open_level:
+            # e.g. a backtick inside *...*: the code split would have cut the
+            # italic span in half
+            _raise_unmatched(open_delimiter, text)
+        # Otherwise it is a lower precedence delimiter inside the span; it is
+        # part of the span's text
+
+    if open_delimiter is not None:
+        _raise_unmatched(open_delimiter, text)
+    if cursor < len(text):
+        yield text[cursor:], TextType.TEXT, None
+
+def _raise_unmatched(delimiter, text):
+    raise ValueError(f"Unmatched delimiter '{delimiter}' in text: {text}")
@@ -9,6 +9,9 @@ class TextType(Enum):
     LINK = "link"
 
 class TextNode():
+    # Documents create tens of thousands of these, so no per-instance __dict__
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
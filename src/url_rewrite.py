@@ -0,0 +1,93 @@
+import re
+
+# Which property of which node holds a URL (see rewrite_node_urls)
+URL_PROPS = {"img": "src", "a": "href"}
+
+# A start tag, e.g. '<link href="/index.css" rel="stylesheet" />'
+_START_TAG_PATTERN = re.compile(r"<[a-zA-Z][^>]*>")
+
+# An href or src attribute with a double-quoted, single-quoted or unquoted value
+_URL_ATTRIBUTE_PATTERN = re.compile(r"""\b(href|src)=(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""")
+
+# A value that can be written without quotes
+_UNQUOTED_VALUE_PATTERN = re.compile(r"[^\s\"'=<>`]+")
+
+def is_root_relative(url):
+    """Check whether a URL is a path on this site, e.g. '/blog/tom' but not '//cdn.example.com/x'."""
+    return url.startswith("/") and not url.startswith("//")
+
+def basepath_rewriter(basepath):
+    """
+    Return a rewrite function that prefixes root-relative URLs with the basepath.
+
+    Args:
+        basepath (str): Base path for the site (e.g., "/" or "/repo-name/")
+
+    Returns:
+        callable: For rewrite_node_urls and rewrite_html_urls, or None if
+            basepath is "/" and nothing needs rewriting
+    """
+    if basepath == "/":
+        return None
+
+    def rewrite(url):
+        if not is_root_relative(url):
+            return None
+        return basepath + url[1:]
+
+    return rewrite
+
+def rewrite_node_urls(node, rewrite):
+    """
+    Rewrite the src of every img and the href of every a node in a tree.
+
+    Only these props are touched, never text, so a URL quoted in a code
+    sample stays as written.
+
+    Args:
+        node (HTMLNode): Root of the tree, changed in place
+        rewrite (callable): Called with each URL; returns the URL to use
+            instead, or None to keep it
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(node.children)
+        prop = URL_PROPS.get(node.tag)
+        if prop is None or not node.props or prop not in node.props:
+            continue
+        url = rewrite(node.props[prop])
+        if url is not None:
+            node.props[prop] = url
+
+def rewrite_html_urls(html, rewrite):
+    """
+    Rewrite the href and src attributes of the start tags in raw HTML.
+
+    Text between tags is never changed. A rewritten value keeps its quotes,
+    and an unquoted value only gets quotes if it now needs them.
+
+    Args:
+        html (str): HTML text, e.g. a literal part of the page template
+        rewrite (callable): Called with each URL; returns the URL to use
+            instead, or None to keep it
+
+    Returns:
+        str: The rewritten HTML
+    """
+    def replace_attribute(match):
+        double, single, unquoted = match.group(2), match.group(3), match.group(4)
+        url = rewrite(next(value for value in (double, single, unquoted) if value is not None))
+        if url is None:
+            return match.group(0)
+        if single is not None:
+            return f"{match.group(1)}='{url}'"
+        if unquoted is not None and _UNQUOTED_VALUE_PATTERN.fullmatch(url):
+            return f"{match.group(1)}={url}"
+        return f'{match.group(1)}="{url}"'
+
+    def replace_tag(match):
+        return _URL_ATTRIBUTE_PATTERN.sub(replace_attribute, match.group(0))
+
+    return _START_TAG_PATTERN.sub(replace_tag, html)
@@ -0,0 +1,151 @@
+import os
+import time
+
+from build_manifest import BuildManifest
+from static_sync import sync_static_file
+from watcher import PollingWatcher, REMOVED
+from output_writer import OutputWriter
+from generate_pages import collect_pages, generate_page
+from build_site import (CONTENT_DIR, DEST_DIR, MANIFEST_PATH, STATIC_DIR, TEMPLATE_PATH, build_site,
+                        write_deploy_manifest)
+
+def page_dest_path(content_path, content_dir, dest_dir):
+    """Return where collect_pages puts the HTML page for a markdown file."""
+    return os.path.join(dest_dir, os.path.relpath(content_path, content_dir)).replace('.md', '.html')
+
+def rebuild_changes(changes, context, content_dir=CONTENT_DIR, static_dir=STATIC_DIR, dest_dir=DEST_DIR):
+    """
+    Rebuild only the outputs affected by a batch of source changes.
+    
+    - an edit to the template reloads it and rebuilds every page
+    - an added or edited markdown file rebuilds that page, a deleted one
+      removes it
+    - an added, edited or deleted static file is copied or removed on its own
+    
+    A page that fails to build is reported and skipped, so one bad edit does
+    not stop the watcher.
+    
+    When any output was written or removed, the deploy manifest in
+    dest_dir is rewritten too, as after a full build.
+    
+    Args:
+        changes (list): (kind, path) tuples from watcher.PollingWatcher
+        context (BuildContext): The build's template path, basepath, manifest
+            and render cache. Its manifest is updated in place. Its template
+            is the currently compiled one, or None if it failed to compile,
+            and is replaced when the template changes. Its writer counts
+            written and unchanged pages, and its precompressor, if any, also
+            compresses changed static files.
+        content_dir (str): Path to the content directory
+        static_dir (str): Path to the static directory
+        dest_dir (str): Path to the destination directory
+        
+    Returns:
+        int: The number of output files written or removed. A rebuilt page
+            whose HTML did not change is not counted, nor is the deploy
+            manifest.
+    """
+    manifest = context.manifest
+    writer = context.writer
+    template_path = context.template_path
+    outputs = 0
+    pages = []
+    template_changed = False
+    
+    for kind, path in changes:
+        if path == template_path:
+            template_changed = True
+        elif path.startswith(content_dir + os.sep) and path.endswith('.md'):
+            if kind == REMOVED:
+                if manifest.remove_page(path) is not None:
+                    outputs += 1
+            else:
+                pages.append((path, page_dest_path(path, content_dir, dest_dir)))
+        elif path.startswith(static_dir + os.sep):
+            relative_path = os.path.relpath(path, static_dir)
+            if sync_static_file(static_dir, dest_dir, relative_path, writer.compressor):
+                manifest.static_files.add(relative_path)
+            else:
+                manifest.static_files.discard(relative_path)
+            outputs += 1
+    
+    if template_changed:
+        manifest.forget_template_hash(template_path)
+        context.template = None
+        try:
+            context.load_template()
+            # Every page depends on the template
+            pages = collect_pages(content_dir, dest_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error loading template {template_path}: {e}")
+            pages = []
+    
+    if context.template is None and pages:
+        print(f"Not building {len(pages)} page(s) until {template_path} is fixed")
+        pages = []
+    
+    written = writer.written
+    for from_path, dest_path in pages:
+        try:
+            generate_page(from_path, dest_path, context)
+        except (OSError, ValueError) as e:
+            print(f"Error generating page from {from_path}: {e}")
+    if writer.compressor is not None:
+        writer.compressor.wait()
+        manifest.record_gzip_outcomes(writer.compressor.take_outcomes())
+    outputs += writer.written - written
+    
+    # The deploy manifest hashes every output, so any change makes it stale
+    if outputs:
+        write_deploy_manifest(dest_dir, manifest, writer)
+    return outputs
+
+def watch_site(context, interval=0.5, staged=True):
+    """
+    Build the site, then rebuild what changed whenever a source changes.
+    
+    Watches content/, static/ and template.html and runs until interrupted.
+    Each batch of changes only rebuilds the affected outputs (see
+    rebuild_changes), and the time it took is printed.
+    
+    Args:
+        context (BuildContext): The build's options. Its jobs are only used
+            for the initial build.
+        interval (float): Seconds between polls for changes
+        staged (bool): Whether the initial build is staged, see build_site.
+            Later rebuilds replace each changed file atomically in docs/.
+    """
+    # Snapshot the sources before building, so edits made during the first
+    # build are picked up straight after it
+    watcher = PollingWatcher([CONTENT_DIR, STATIC_DIR, TEMPLATE_PATH], interval)
+    
+    try:
+        build_site(context, staged)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Initial build failed: {e}")
+    
+    # A staged build recorded its pages in the staging directory, which now is docs/
+    context.manifest = BuildManifest.load(MANIFEST_PATH, DEST_DIR)
+    compressor = context.compressor
+    if compressor is not None and context.manifest.gzip_settings == compressor.settings():
+        compressor.previous_outcomes = context.manifest.gzip_outcomes()
+    context.template = None
+    try:
+        context.load_template()
+    except (OSError, ValueError) as e:
+        print(f"Error loading template {TEMPLATE_PATH}: {e}")
+    
+    print(f"Watching {CONTENT_DIR}/, {STATIC_DIR}/ and {TEMPLATE_PATH} for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            changes = watcher.wait()
+            start = time.perf_counter()
+            for kind, path in changes:
+                print(f"Detected {kind}: {path}")
+            context.writer = OutputWriter(context.compressor)
+            outputs = rebuild_changes(changes, context)
+            context.manifest.save()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"Rebuilt {outputs} output(s) for {len(changes)} change(s) in {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        print("Stopped watching")